@@ -0,0 +1,305 @@
+from board import Board
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Values stored in the packed state array
+HIDDEN = 0
+REVEALED = 1
+FLAGGED = 2
+
+# Value stored in the adjacency count array for a mine cell
+MINE = 9
+
+# Character shown for each value of the adjacency count array
+CELL_CHARS = " 12345678M"
+
+
+class ArrayBoard(Board):
+    def __init__(self, width: int, height: int, mines: int, **kwargs):
+        """
+        Initializes a new array-backed game board.
+
+        The board keeps the same interface as Board, but stores the game in two compact
+        NumPy arrays instead of nested lists of strings, which keeps very large boards
+        small in memory and fast to generate.
+
+        Args:
+            width (int): The number of columns in the game board.
+            height (int): The number of rows in the game board.
+            mines (int): The number of mines on the game board.
+            **kwargs: The options of Board, e.g. cascade, debug, seed or renderer.
+
+        Attributes:
+            The attributes of Board, except player_board and default_board: the boards are read with get_row
+            and get_cell_value, and changed with set_cell_value.
+            state (numpy.ndarray): A uint8 array holding HIDDEN, REVEALED or FLAGGED for every cell.
+            counts (numpy.ndarray): An int8 array holding the number of neighboring mines for every cell, or MINE.
+        """
+        if np is None:
+            raise ImportError(
+                "ArrayBoard requires numpy. Install it with 'pip install numpy'."
+            )
+
+        super().__init__(width, height, mines, **kwargs)
+
+    def initialize_boards(self):
+        """
+        Initializes the state array and the adjacency count array.
+        """
+        self.state = self.initialize_player_board()
+        self.initialize_mines()
+
+    def initialize_mines(self):
+        """
+        Places the mines and builds the adjacency count array around them.
+        """
+        self.counts = self.initialize_default_board()
+
+    def reset_boards(self):
+        """
+        Hides every cell and places new mines, overwriting the existing arrays.
+        """
+        self.state.fill(HIDDEN)
+        self.counts = self.initialize_default_board(self.counts)
+
+    def initialize_player_board(self):
+        """
+        Initializes the player's game board.
+
+        All cells are initially hidden.
+
+        Returns:
+            numpy.ndarray: A uint8 array of HIDDEN values.
+        """
+        return np.full((self.height, self.width), HIDDEN, dtype=np.uint8)
+
+    def initialize_default_board(self, reuse=None):
+        """
+        Initializes the default game board.
+
+        Mines are placed by the placement strategy, outside the excluded cells, as on Board.
+        The number of neighboring mines is computed for the whole board at once by adding up
+        the mine mask shifted in each of the 9 directions of a 3x3 window.
+
+        Args:
+            reuse (numpy.ndarray, optional): An adjacency count array of the same shape to overwrite
+                                             instead of allocating a new one. Defaults to None.
+
+        Returns:
+            numpy.ndarray: An int8 array of adjacency counts, with MINE on the mine cells.
+        """
+        picks = self.placement(
+            self.rng, self.width, self.height, self.mines, self.excluded
+        )
+        self.mine_indices = set(picks)
+
+        mine_mask = np.zeros(self.width * self.height, dtype=bool)
+        mine_mask[np.array(picks, dtype=np.int64)] = True
+        mine_mask = mine_mask.reshape(self.height, self.width)
+
+        padded = np.pad(mine_mask, 1).astype(np.int8)
+        if reuse is not None:
+            counts = reuse
+            counts.fill(0)
+        else:
+            counts = np.zeros((self.height, self.width), dtype=np.int8)
+        for delta_row in range(3):
+            for delta_col in range(3):
+                counts += padded[
+                    delta_row : delta_row + self.height,
+                    delta_col : delta_col + self.width,
+                ]
+        counts[mine_mask] = MINE
+        return counts
+
+    def is_mine(self, row: int, col: int) -> bool:
+        """
+        Checks if the cell at the given row and column contains a mine.
+
+        Args:
+        row (int): The row of the cell to check.
+        col (int): The column of the cell to check.
+
+        Returns:
+        bool: True if the cell contains a mine, False otherwise.
+        """
+        return int(self.counts[row, col]) == MINE
+
+    def dfs(self, row: int, col: int):
+        """
+        Performs a Depth-First Search (DFS) on the game board starting from a given cell.
+
+        Works like Board.dfs, reading the adjacency counts and updating the state array.
+
+        Args:
+        row (int): The row number of the cell where the DFS should start.
+        col (int): The column number of the cell where the DFS should start.
+
+        Note: This function modifies the state array in-place, keeps hidden_safe_cells up to date
+        and reports the cells that changed.
+        """
+        state = self.state
+        counts = self.counts
+        stack = self.dfs_stack([(row, col)])
+        changed = []
+
+        while stack:
+            r, c = stack.pop()
+            if state[r, c] == HIDDEN:
+                state[r, c] = REVEALED
+                changed.append(r * self.width + c)
+                if counts[r, c] != MINE:
+                    self.hidden_safe_cells -= 1
+                if counts[r, c] == 0:
+                    for new_row in range(max(0, r - 1), min(r + 2, self.height)):
+                        for new_col in range(max(0, c - 1), min(c + 2, self.width)):
+                            if state[new_row, new_col] == HIDDEN:
+                                stack.append((new_row, new_col))
+
+        self.cells_changed(changed)
+
+    def open_cells(self, cells):
+        """
+        Reveals many cells at once with a single masked write to the state array.
+
+        Args:
+        cells (iterable): The flat indices (row * width + col) of the cells to reveal.
+
+        Only hidden cells are revealed; flagged and already revealed cells are left untouched.
+        A cell listed more than once is revealed once.
+
+        Note: This function modifies the state array in-place, keeps hidden_safe_cells up to date
+        and reports the cells that changed.
+        """
+        indices = np.unique(np.fromiter(cells, dtype=np.int64))
+        flat_state = self.state.reshape(-1)
+        indices = indices[flat_state[indices] == HIDDEN]
+        flat_state[indices] = REVEALED
+        self.hidden_safe_cells -= int(
+            np.count_nonzero(self.counts.reshape(-1)[indices] != MINE)
+        )
+        self.cells_changed(indices.tolist())
+
+    def empty_mask(self) -> bytes:
+        """
+        Returns 1 for every cell without a mine or a number and 0 for every other cell, as Board.empty_mask does,
+        computed over the whole count array at once.
+        """
+        return (self.counts == 0).tobytes()
+
+    def check_win_scan(self) -> bool:
+        """
+        Checks if the player has won the game by scanning the whole board.
+
+        Uses the same rules as Board.check_win_scan, evaluated over the whole state array at once.
+
+        Returns:
+        bool: True if the player has won the game, False otherwise.
+        """
+        if self.mine_indices == set(self.flagged_indices):
+            return True
+
+        hidden_safe = (self.state == HIDDEN) & (self.counts != MINE)
+        return not hidden_safe.any()
+
+    def verify_counters(self):
+        """
+        Recounts hidden safe cells and correct flags over the whole state array.
+
+        Raises:
+        RuntimeError: If the recounted values differ from the running counters.
+        """
+        mine_mask = self.counts == MINE
+        hidden_safe_cells = int(np.count_nonzero((self.state == HIDDEN) & ~mine_mask))
+        flagged_correct = int(np.count_nonzero((self.state == FLAGGED) & mine_mask))
+
+        if (hidden_safe_cells, flagged_correct) != (
+            self.hidden_safe_cells,
+            self.flagged_correct,
+        ):
+            raise RuntimeError(
+                f"Win counters out of sync: counted {hidden_safe_cells} hidden safe cells and "
+                f"{flagged_correct} correct flags, tracked {self.hidden_safe_cells} and {self.flagged_correct}."
+            )
+
+    def get_cell_value(self, row: int, col: int, board="player_board") -> str:
+        """
+        Returns the value at a specific cell in a given board.
+
+        Args:
+        board (str): The name of the board ("player_board" or "default_board").
+        row (int): The row number of the cell.
+        col (int): The column number of the cell.
+
+        Returns:
+        str: The value at the specified cell in the specified board.
+        """
+        if board == "player_board":
+            state = self.state[row, col]
+            if state == HIDDEN:
+                return "*"
+            elif state == FLAGGED:
+                return "F"
+            return CELL_CHARS[self.counts[row, col]]
+        elif board == "default_board":
+            return CELL_CHARS[self.counts[row, col]]
+        else:
+            raise ValueError(
+                "Invalid board name. Must be 'player_board' or 'default_board'."
+            )
+
+    def set_cell_value(self, row: int, col: int, value: str):
+        """
+        Sets the value of a specific cell on the player's game board.
+
+        Args:
+        row (int): The row number of the cell.
+        col (int): The column number of the cell.
+        value (str): "*" to hide the cell, "F" to flag it, anything else to reveal it.
+
+        Note: This function modifies the state array in-place, keeps the win counters up to date
+        and reports the cell that changed.
+        """
+        if value == "*":
+            state = HIDDEN
+        elif value == "F":
+            state = FLAGGED
+        else:
+            state = REVEALED
+
+        previous = int(self.state[row, col])
+        if self.is_mine(row, col):
+            self.flagged_correct += (state == FLAGGED) - (previous == FLAGGED)
+        else:
+            self.hidden_safe_cells += (state == HIDDEN) - (previous == HIDDEN)
+        self.state[row, col] = state
+        self.cells_changed((row * self.width + col,))
+
+    def get_row(self, row: int, board="player_board") -> list:
+        """
+        Returns the values of a whole row in a given board.
+
+        Args:
+        row (int): The row number.
+        board (str): The name of the board ("player_board" or "default_board").
+
+        Returns:
+        list: The values of every cell in the row, from left to right.
+        """
+        values = [CELL_CHARS[count] for count in self.counts[row].tolist()]
+        if board == "player_board":
+            for col, state in enumerate(self.state[row].tolist()):
+                if state == HIDDEN:
+                    values[col] = "*"
+                elif state == FLAGGED:
+                    values[col] = "F"
+            return values
+        elif board == "default_board":
+            return values
+        else:
+            raise ValueError(
+                "Invalid board name. Must be 'player_board' or 'default_board'."
+            )
@@ -0,0 +1,350 @@
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+from time import perf_counter
+
+from array_board import ArrayBoard, np
+from board import Board
+from cascade import DfsCascade, RegionCascade
+from main import game_options
+from renderer import NullRenderer, TerminalRenderer
+
+"""
+Boards measured besides the game_options presets.
+
+Each key names a (width, height) board size, measured at every density in DENSITIES.
+"""
+scaled_sizes = {
+    "100x100": (100, 100),
+    "1000x1000": (1000, 1000),
+}
+
+DENSITIES = (0.05, 0.12, 0.2)
+
+
+def measure(run, setup=None, repeat=5, budget=2.0):
+    """
+    Times a function over several runs.
+
+    Args:
+        run (callable): The function to time. It receives the value returned by setup, if any.
+        setup (callable, optional): Builds fresh input for each run, outside of the timed section. Defaults to None.
+        repeat (int, optional): The maximum number of runs. Defaults to 5.
+        budget (float, optional): Stops repeating once this many seconds have been spent, setup included. Defaults to 2.0.
+                                  The function always runs at least once.
+
+    Returns:
+        dict: The fastest and mean run time in seconds, and the number of runs.
+    """
+    times = []
+    started = perf_counter()
+    while len(times) < repeat and (not times or perf_counter() - started < budget):
+        value = setup() if setup is not None else None
+        start = perf_counter()
+        if setup is not None:
+            run(value)
+        else:
+            run()
+        times.append(perf_counter() - start)
+    return {
+        "seconds_min": min(times),
+        "seconds_mean": sum(times) / len(times),
+        "repeats": len(times),
+    }
+
+
+def first_empty_cell(board):
+    """
+    Returns the (row, col) of the first cell without a mine or a number, or None if there is none.
+    """
+    for row in range(board.height):
+        for col, value in enumerate(board.get_row(row, "default_board")):
+            if value == " ":
+                return row, col
+    return None
+
+
+def largest_region_cell(board):
+    """
+    Returns the (row, col) of a cell in the largest empty region, found with a RegionCascade.
+    """
+    engine = RegionCascade()
+    engine.build(board)
+    for index, empty in enumerate(board.empty_mask()):
+        if empty:
+            engine.region_at(board, *divmod(index, board.width))
+    if not engine.regions:
+        return None
+    largest = max(engine.regions, key=len)
+    return divmod(largest[0], board.width)
+
+
+def benchmark_board(board_class, width, height, mines, repeat, budget, seed=0):
+    """
+    Runs every benchmark on one board configuration.
+
+    Args:
+        board_class (type): The board implementation to measure.
+        width (int): The number of columns in the game board.
+        height (int): The number of rows in the game board.
+        mines (int): The number of mines on the game board.
+        repeat (int): The maximum number of runs per benchmark.
+        budget (float): The time budget per benchmark, in seconds.
+        seed (int, optional): The seed of the boards. Defaults to 0.
+
+    Returns:
+        list: One result dictionary per benchmark.
+    """
+
+    def new_board(cascade=None):
+        return board_class(
+            width, height, mines, seed=seed, renderer=NullRenderer(), cascade=cascade
+        )
+
+    results = {}
+    results["init"] = measure(new_board, repeat=repeat, budget=budget)
+
+    board = new_board()
+    results["initialize_default_board"] = measure(
+        board.initialize_default_board, repeat=repeat, budget=budget
+    )
+
+    for engine in (DfsCascade, RegionCascade):
+        name = engine.__name__
+        for label, find_cell in (
+            ("typical", first_empty_cell),
+            ("worst", largest_region_cell),
+        ):
+            cell = find_cell(new_board())
+            if cell is None:
+                continue
+            results[f"cascade_{label}_{name}"] = measure(
+                lambda fresh: fresh.uncover(*cell),
+                setup=lambda: new_board(engine()),
+                repeat=repeat,
+                budget=budget,
+            )
+
+    board = new_board()
+    results["check_win"] = measure(board.check_win, repeat=repeat, budget=budget)
+    results["check_win_scan"] = measure(
+        board.check_win_scan, repeat=repeat, budget=budget
+    )
+
+    cells = [(row, col) for row in range(min(height, 10)) for col in range(width)][:100]
+
+    def flag_cycle():
+        for row, col in cells:
+            board.flag_mine(row, col)
+        for row, col in cells:
+            board.remove_flag(row, col)
+
+    results["flag_cycle_100"] = measure(flag_cycle, repeat=repeat, budget=budget)
+
+    with open(os.devnull, "w") as devnull:
+        board.renderer = TerminalRenderer(devnull)
+        results["draw_game_board"] = measure(
+            board.draw_game_board, repeat=repeat, budget=budget
+        )
+
+    return [
+        {
+            "benchmark": name,
+            "board": board_class.__name__,
+            "width": width,
+            "height": height,
+            "mines": mines,
+            **timing,
+        }
+        for name, timing in results.items()
+    ]
+
+
+def benchmark_startup(repeat, budget):
+    """
+    Measures the start-up time of the game, each run in a fresh interpreter.
+
+    The runs are:
+    - startup_python: an interpreter that does nothing, the floor of the other runs.
+    - startup_import_main: importing main, as the server and the simulations do.
+    - startup_headless: main.py with a preset, headless and quiet, quitting at once.
+    - startup_greeting: printing the greeting, with the banner already in its disk cache.
+
+    The banner cache lives in a temporary directory, so the results do not depend on earlier runs.
+
+    Args:
+        repeat (int): The maximum number of runs per benchmark.
+        budget (float): The time budget per benchmark, in seconds.
+
+    Returns:
+        list: One result dictionary per benchmark.
+    """
+    directory = os.path.dirname(os.path.abspath(__file__))
+    runs = {
+        "startup_python": (["-c", "pass"], ""),
+        "startup_import_main": (["-c", "import main"], ""),
+        "startup_headless": (
+            ["main.py", "--preset", "Beginner", "--headless", "--quiet"],
+            "q\ny\nn\n",
+        ),
+        "startup_greeting": (
+            ["-c", "from messages import print_greeting; print_greeting()"],
+            "",
+        ),
+    }
+
+    results = []
+    with tempfile.TemporaryDirectory() as cache_home:
+        environment = dict(os.environ, XDG_CACHE_HOME=cache_home)
+
+        def start(arguments, stdin):
+            subprocess.run(
+                [sys.executable, *arguments],
+                cwd=directory,
+                env=environment,
+                input=stdin,
+                text=True,
+                stdout=subprocess.DEVNULL,
+                check=True,
+            )
+
+        # Fill the banner cache before measuring
+        start(*runs["startup_greeting"])
+
+        for name, run in runs.items():
+            timing = measure(lambda: start(*run), repeat=repeat, budget=budget)
+            results.append(
+                {
+                    "benchmark": name,
+                    "board": "main",
+                    "width": 0,
+                    "height": 0,
+                    "mines": 0,
+                    **timing,
+                }
+            )
+    return results
+
+
+def configurations(sizes):
+    """
+    Lists the (label, width, height, mines) of the boards to measure.
+
+    Args:
+        sizes (list): The keys of scaled_sizes to include besides the presets.
+
+    Returns:
+        list: The presets first, then each scaled size at each density in DENSITIES.
+    """
+    boards = [(name, *options) for name, options in game_options.items()]
+    for size in sizes:
+        width, height = scaled_sizes[size]
+        for density in DENSITIES:
+            mines = int((width - 1) * (height - 1) * density)
+            boards.append((f"{size}@{density}", width, height, mines))
+    return boards
+
+
+def compare(results, baseline, threshold):
+    """
+    Compares results with a baseline run.
+
+    Args:
+        results (list): The results of this run.
+        baseline (list): The results of the baseline run.
+        threshold (float): The ratio of fastest run times above which a benchmark counts as a regression.
+
+    Returns:
+        list: (ratio, result) for every benchmark slower than the baseline by more than the threshold.
+    """
+
+    def key(result):
+        return (
+            result["benchmark"],
+            result["board"],
+            result["width"],
+            result["height"],
+            result["mines"],
+        )
+
+    previous = {key(result): result for result in baseline}
+    regressions = []
+    for result in results:
+        old = previous.get(key(result))
+        if old is None or old["seconds_min"] == 0:
+            continue
+        ratio = result["seconds_min"] / old["seconds_min"]
+        result["baseline_ratio"] = ratio
+        if ratio > threshold:
+            regressions.append((ratio, result))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the Minesweeper board.")
+    parser.add_argument(
+        "--sizes",
+        nargs="*",
+        choices=list(scaled_sizes),
+        default=list(scaled_sizes),
+        help="scaled-up board sizes to measure besides the presets",
+    )
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--budget", type=float, default=2.0)
+    parser.add_argument("--output", help="write the results to this JSON file")
+    parser.add_argument("--baseline", help="compare with the results in this JSON file")
+    parser.add_argument("--threshold", type=float, default=1.25)
+    parser.add_argument(
+        "--no-startup",
+        action="store_true",
+        help="do not measure the start-up time of the game",
+    )
+    args = parser.parse_args()
+
+    board_classes = [Board] + ([ArrayBoard] if np is not None else [])
+
+    results = []
+    if not args.no_startup:
+        print("start-up...", file=sys.stderr)
+        results.extend(benchmark_startup(args.repeat, args.budget))
+    for label, width, height, mines in configurations(args.sizes):
+        for board_class in board_classes:
+            print(f"{label} {board_class.__name__}...", file=sys.stderr)
+            results.extend(
+                benchmark_board(
+                    board_class, width, height, mines, args.repeat, args.budget
+                )
+            )
+
+    regressions = []
+    if args.baseline:
+        with open(args.baseline) as file:
+            regressions = compare(results, json.load(file)["results"], args.threshold)
+
+    report = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(report, file, indent=2)
+    else:
+        print(json.dumps(report, indent=2))
+
+    for ratio, result in regressions:
+        print(
+            f"Regression: {result['benchmark']} on {result['board']} "
+            f"{result['width']}x{result['height']} with {result['mines']} mines "
+            f"is {ratio:.2f}x slower than the baseline.",
+            file=sys.stderr,
+        )
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,8 +1,29 @@
-from random import sample
+from random import Random
+
+from board_metrics import measure
+from cascade import RegionCascade
+from placement import first_row_and_column, neighborhood, place_mines
+from renderer import TerminalRenderer
 
 
 class Board:
-    def __init__(self, width: int, height: int, mines: int):
+    # The list type of the DFS stack; instrumentation swaps in one that counts pushes and pops
+    dfs_stack = list
+
+    def __init__(
+        self,
+        width: int,
+        height: int,
+        mines: int,
+        cascade=None,
+        debug=False,
+        seed=None,
+        renderer=None,
+        excluded=None,
+        first_click_safe=False,
+        placement=place_mines,
+        precompute_metrics=False,
+    ):
         """
         Initializes a new game board.
 
@@ -10,24 +31,184 @@ class Board:
             width (int): The number of columns in the game board.
             height (int): The number of rows in the game board.
             mines (int): The number of mines on the game board.
+            cascade (optional): The engine used to reveal cells, e.g. DfsCascade or RegionCascade. Defaults to a new RegionCascade.
+            debug (bool, optional): If True, check_win cross-checks the win counters against a full board scan. Defaults to False.
+            seed (optional): The seed for the random number generator that places the mines. Defaults to None (unseeded).
+            renderer (Renderer, optional): Shows the board and the messages about moves. Defaults to a new TerminalRenderer.
+            excluded (set, optional): The flat indices (row * width + col) of the cells that never hold a mine.
+                                      Defaults to None, which excludes the first row and the first column as the game always has.
+                                      Pass an empty set to allow mines anywhere.
+            first_click_safe (bool, optional): If True, the first revealed cell and its neighbors never hold a mine. Defaults to False.
+            placement (callable, optional): The mine placement strategy, see placement.py. Defaults to place_mines.
+            precompute_metrics (bool, optional): If True, the metrics are measured as soon as the mines are placed,
+                                                 instead of on the first call to metrics. Defaults to False.
 
         Attributes:
             width (int): The number of columns in the game board.
             height (int): The number of rows in the game board.
             mines (int): The number of mines on the game board.
-            mine_cells (list): A list of tuples representing the coordinates of the mine cells.
-            flagged_cells (list): A list of tuples representing the coordinates of the flagged cells.
+            seed: The seed the board was generated from.
+            rng (random.Random): The random number generator that places the mines.
+            mine_indices (set): The flat indices (row * width + col) of the mine cells.
+            flagged_indices (dict): The flat indices of the flagged cells, in the order they were flagged. Values are unused.
             player_board (list): A 2D list representing the player's game board.
             default_board (list): A 2D list representing the default game board.
+            cascade: The engine used to reveal cells, built once the default board is generated.
+            debug (bool): Whether check_win cross-checks the win counters.
+            hidden_safe_cells (int): The number of cells without a mine that still show a "*".
+            flagged_correct (int): The number of flagged cells that contain a mine.
+            renderer (Renderer): Shows the board and the messages about moves.
+            excluded (set): The flat indices of the cells that never hold a mine.
+            base_excluded (set): The cells excluded when the board was created, before any first click; restored by reset.
+            first_click_safe (bool): Whether the first revealed cell and its neighbors are kept free of mines.
+            placement (callable): The mine placement strategy.
+            opened (bool): Whether a cell has been revealed yet.
+            listeners (list): Callables called as listener(board, cells) whenever cells of the player's game board change.
+            precompute_metrics (bool): Whether the metrics are measured as soon as the mines are placed.
+            cached_metrics (BoardMetrics): The metrics of the current mines, or None until they are measured.
+
+        Raises:
+            ValueError: If the board has no cell, or the mines do not fit in the cells outside of excluded.
         """
+        if width < 1 or height < 1:
+            raise ValueError(f"Cannot make a board of {width}x{height} cells.")
+        if excluded is None:
+            excluded = first_row_and_column(width, height)
+        if not 0 <= mines <= width * height - len(excluded):
+            raise ValueError(
+                f"Cannot place {mines} mines in the {width * height - len(excluded)} cells that can hold one."
+            )
+
         self.width = width
         self.height = height
         self.mines = mines
-        self.mine_cells = []
-        self.flagged_cells = []
+        self.debug = debug
+        self.seed = seed
+        self.rng = Random(seed)
+        self.renderer = renderer if renderer is not None else TerminalRenderer()
+        self.excluded = excluded
+        self.base_excluded = self.excluded
+        self.first_click_safe = first_click_safe
+        self.placement = placement
+        self.opened = False
+        self.listeners = []
+        self.mine_indices = set()
+        self.flagged_indices = {}
+        self.precompute_metrics = precompute_metrics
+        self.initialize_boards()
+        self.reset_counters()
+        self.cascade = cascade if cascade is not None else RegionCascade()
+        self.cascade.build(self)
+        self.mines_placed()
+
+    def initialize_boards(self):
+        """
+        Initializes the player's game board and the default game board.
+        """
         self.player_board = self.initialize_player_board()
+        self.initialize_mines()
+
+    def initialize_mines(self):
+        """
+        Places the mines and builds the default game board around them.
+        """
         self.default_board = self.initialize_default_board()
 
+    def reset(self, seed=None):
+        """
+        Starts a new game on this board, reusing its grids instead of allocating new ones.
+
+        The board is left as a new board built with the same options and the given seed would be.
+        Listeners are removed, since they belong to the previous game.
+
+        Args:
+            seed (optional): The seed of the new game. Defaults to None (unseeded).
+        """
+        self.seed = seed
+        self.rng = Random(seed)
+        self.excluded = self.base_excluded
+        self.opened = False
+        self.listeners.clear()
+        self.flagged_indices.clear()
+        self.reset_boards()
+        self.reset_counters()
+        self.cascade.build(self)
+        self.mines_placed()
+        self.renderer.board_reset(self)
+
+    def reset_boards(self):
+        """
+        Hides every cell and places new mines, overwriting the existing grids row by row.
+        """
+        hidden = ["*"] * self.width
+        for row in self.player_board:
+            row[:] = hidden
+        self.default_board = self.initialize_default_board(self.default_board)
+
+    def reset_counters(self):
+        """
+        Recomputes the win counters from the mines and the flags, for a board with no revealed cell.
+        """
+        self.flagged_correct = len(self.mine_indices.intersection(self.flagged_indices))
+        wrong_flags = len(self.flagged_indices) - self.flagged_correct
+        self.hidden_safe_cells = self.width * self.height - self.mines - wrong_flags
+
+    def protect_first_click(self, row: int, col: int):
+        """
+        Moves the mines away from the first revealed cell and its neighbors, if the board is first-click safe.
+
+        The mines are placed again with the same random number generator, so a seed and a first click
+        always give the same board. If the board is too dense to keep the neighbors free, only the
+        clicked cell is kept free. Flags placed before the first click are kept.
+
+        Args:
+        row (int): The row number of the cell being revealed.
+        col (int): The column number of the cell being revealed.
+        """
+        if self.opened:
+            return
+        self.opened = True
+        if not self.first_click_safe:
+            return
+
+        safe_zone = neighborhood(self.width, self.height, row, col)
+        if self.mine_indices.isdisjoint(safe_zone):
+            return
+        if self.width * self.height - len(self.excluded | safe_zone) < self.mines:
+            safe_zone = {row * self.width + col}
+            if self.mine_indices.isdisjoint(safe_zone):
+                return
+
+        self.excluded = self.excluded | safe_zone
+        self.initialize_mines()
+        self.reset_counters()
+        self.cascade.build(self)
+        self.mines_placed()
+
+    def mines_placed(self):
+        """
+        Drops the metrics of the previous mines, and measures the new ones if precompute_metrics is set.
+
+        Called whenever the mines were placed or moved.
+        """
+        self.cached_metrics = None
+        if self.precompute_metrics:
+            self.metrics()
+
+    def metrics(self):
+        """
+        Returns the difficulty metrics of the board: its 3BV, openings, isolated numbers and mine density per region.
+
+        They are measured in one pass over the default game board the first time they are asked for,
+        and kept until the mines change, so boards that are only played never pay for them.
+
+        Returns:
+        BoardMetrics: The metrics of the current mines, see board_metrics.py.
+        """
+        if self.cached_metrics is None:
+            self.cached_metrics = measure(self)
+        return self.cached_metrics
+
     def initialize_player_board(self):
         """
         Initializes the player's game board.
@@ -39,22 +220,68 @@ class Board:
         """
         return [["*" for _ in range(self.width)] for _ in range(self.height)]
 
-    def initialize_default_board(self):
+    @property
+    def mine_cells(self):
+        """
+        list: A read-only list of tuples representing the coordinates of the mine cells, sorted by row and column.
+        """
+        return [divmod(index, self.width) for index in sorted(self.mine_indices)]
+
+    @property
+    def flagged_cells(self):
+        """
+        list: A read-only list of tuples representing the coordinates of the flagged cells, in the order they were flagged.
+        """
+        return [divmod(index, self.width) for index in self.flagged_indices]
+
+    def is_flagged(self, row: int, col: int) -> bool:
+        """
+        Checks if the cell at the given row and column is flagged.
+
+        Args:
+        row (int): The row of the cell to check.
+        col (int): The column of the cell to check.
+
+        Returns:
+        bool: True if the cell is flagged, False otherwise.
+        """
+        return row * self.width + col in self.flagged_indices
+
+    def mines_remaining(self) -> int:
+        """
+        Returns the number of mines minus the number of flags placed.
+
+        Returns:
+        int: The number of mines the player still has to flag.
+        """
+        return self.mines - len(self.flagged_indices)
+
+    def initialize_default_board(self, reuse=None):
         """
         Initializes the default game board.
 
         The default game board contains the mine locations and the numbers indicating the number of mines in the neighboring cells.
+        Mines are placed by the placement strategy, outside the excluded cells.
+
+        Args:
+            reuse (list, optional): A default game board of the same size to overwrite instead of allocating a new one. Defaults to None.
 
         Returns:
             list: A 2D list representing the default game board.
         """
-        default_board = [[" " for _ in range(self.width)] for _ in range(self.height)]
-
-        all_cells = [
-            (i, j) for i in range(1, self.height) for j in range(1, self.width)
-        ]
+        if reuse is not None:
+            default_board = reuse
+            empty = [" "] * self.width
+            for row in default_board:
+                row[:] = empty
+        else:
+            default_board = [
+                [" " for _ in range(self.width)] for _ in range(self.height)
+            ]
 
-        self.mine_cells = sample(all_cells, self.mines)
+        self.mine_indices = set(
+            self.placement(self.rng, self.width, self.height, self.mines, self.excluded)
+        )
 
         for i, j in self.mine_cells:
             default_board[i][j] = "M"
@@ -67,12 +294,13 @@ class Board:
                             default_board[x][y] = str(int(default_board[x][y]) + 1)
         return default_board
 
-    def draw_game_board(self, reveal=False):
+    def draw_game_board(self, reveal=False, overlay=None):
         """
-        Prints the current state of the game board.
+        Prints the current state of the game board through the board's renderer.
 
         Args:
         reveal (bool, optional): If True, the function prints the default game board (revealing all cells). If False, the function prints the player's game board (with unrevealed cells). Defaults to False.
+        overlay (dict, optional): Mine probabilities by flat index, e.g. from ProbabilityEngine.overlay. Hidden cells with a probability are shown with a character of probability.OVERLAY_CHARS, from "." (safe) to "@" (mine), instead of "*". Defaults to None.
 
         The function first prints a row of column numbers. Then, for each row in the game board, it prints the row number, followed by the cell values in that row.
 
@@ -101,31 +329,18 @@ class Board:
         3 | 7 | 8 | 9 |
         -----------------
         """
-        # Choose the board to draw
-        board_to_draw = self.default_board if reveal else self.player_board
+        self.renderer.draw(self, reveal, overlay)
 
-        separator = " | "
-        row_template = separator.join(
-            ["{} " if i >= 9 else "{}" for i in range(self.width)]
-        )
-        row_length = len(row_template) - 2 - max(0, self.width - 9)
-
-        # Print the top row of numbers
-        print(
-            f"  {separator.rstrip()}",
-            separator.join(str(i) for i in range(1, self.width + 1)),
-            separator.strip(),
-        )
-
-        # Print the line under the top row of numbers
-        print("-" * row_length)
+    def cells_changed(self, cells):
+        """
+        Reports changed cells of the player's game board to the renderer and the listeners.
 
-        # Print the rows with numbers on the left side and the actual values from the default game board inside
-        for i in range(self.height):
-            row = board_to_draw[i]
-            formatted_row = row_template.format(*row)
-            print(f"{ i + 1 : 2} {separator.strip()}", formatted_row, separator.strip())
-            print("-" * row_length)
+        Args:
+        cells (list): The flat indices (row * width + col) of the changed cells.
+        """
+        self.renderer.cells_changed(self, cells)
+        for listener in self.listeners:
+            listener(self, cells)
 
     def is_mine(self, row: int, col: int) -> bool:
         """
@@ -144,6 +359,8 @@ class Board:
         """
         Performs a Depth-First Search (DFS) on the game board starting from a given cell.
 
+        This is the reference cascade: the engines in cascade.py must reveal exactly the same cells.
+
         Args:
         row (int): The row number of the cell where the DFS should start.
         col (int): The column number of the cell where the DFS should start.
@@ -155,7 +372,8 @@ class Board:
         The player's view of the game board is updated as cells are explored: each unexplored cell ("*") is
         replaced with its corresponding value from the actual game board.
 
-        Note: This function modifies the player_board in-place.
+        Note: This function modifies the player_board in-place, keeps hidden_safe_cells up to date
+        and reports the cells that changed.
         """
         # List of all 8 possible directions
         directions = [
@@ -170,12 +388,16 @@ class Board:
         ]
 
         # Stack for DFS
-        stack = [(row, col)]
+        stack = self.dfs_stack([(row, col)])
+        changed = []
 
         while stack:
             r, c = stack.pop()
             if self.player_board[r][c] == "*":
                 self.player_board[r][c] = self.default_board[r][c]
+                changed.append(r * self.width + c)
+                if self.default_board[r][c] != "M":
+                    self.hidden_safe_cells -= 1
                 if self.default_board[r][c] == " ":
                     # If the cell is empty, add all its neighbors to the stack
                     for delta_row, delta_col in directions:
@@ -187,6 +409,44 @@ class Board:
                         ):
                             stack.append((new_row, new_col))
 
+        self.cells_changed(changed)
+
+    def open_cells(self, cells):
+        """
+        Reveals many cells at once.
+
+        Args:
+        cells (iterable): The flat indices (row * width + col) of the cells to reveal.
+
+        Only hidden cells are revealed; flagged and already revealed cells are left untouched.
+
+        Note: This function modifies the player_board in-place, keeps hidden_safe_cells up to date
+        and reports the cells that changed.
+        """
+        width = self.width
+        player_board = self.player_board
+        default_board = self.default_board
+        changed = []
+        for index in cells:
+            r, c = divmod(index, width)
+            if player_board[r][c] == "*":
+                player_board[r][c] = default_board[r][c]
+                changed.append(index)
+                if default_board[r][c] != "M":
+                    self.hidden_safe_cells -= 1
+
+        self.cells_changed(changed)
+
+    def empty_mask(self) -> bytes:
+        """
+        Returns 1 for every cell without a mine or a number and 0 for every other cell, indexed by row * width + col.
+        """
+        return bytes(
+            value == " "
+            for row in range(self.height)
+            for value in self.get_row(row, "default_board")
+        )
+
     def flag_mine(self, row, col):
         """
         Flags a cell as containing a mine.
@@ -198,12 +458,28 @@ class Board:
         The function updates the player's game board to flag the cell at the given row and column.
         The cell is marked with an "F" to indicate that the player believes it contains a mine.
 
+        Flagging a cell that is already flagged leaves the board unchanged.
+
         Note: This function modifies the player_board in-place.
         """
-        self.player_board[row][col] = "F"
-        print("\nCell flagged.")
-        self.flagged_cells.append((row, col))
-        self.draw_game_board()
+        self.place_flag(row, col)
+        self.renderer.message("\nCell flagged.")
+
+    def place_flag(self, row: int, col: int):
+        """
+        Flags a cell as containing a mine without printing anything.
+
+        Args:
+        row (int): The row number of the cell to flag.
+        col (int): The column number of the cell to flag.
+
+        Flagging a cell that is already flagged leaves the board unchanged.
+
+        Note: This function modifies the player_board in-place.
+        """
+        if not self.is_flagged(row, col):
+            self.set_cell_value(row, col, "F")
+            self.flagged_indices[row * self.width + col] = None
 
     def remove_flag(self, row: int, col: int):
         """
@@ -218,9 +494,20 @@ class Board:
 
         Note: This function modifies the player_board in-place.
         """
-        self.player_board[row][col] = "*"
-        self.flagged_cells.remove((row, col))
-        self.draw_game_board()
+        self.clear_flag(row, col)
+
+    def clear_flag(self, row: int, col: int):
+        """
+        Removes the flag from a cell without printing anything.
+
+        Args:
+        row (int): The row number of the cell to unflag.
+        col (int): The column number of the cell to unflag.
+
+        Note: This function modifies the player_board in-place.
+        """
+        self.set_cell_value(row, col, "*")
+        del self.flagged_indices[row * self.width + col]
 
     def check_win(self) -> bool:
         """
@@ -228,23 +515,68 @@ class Board:
 
         The player wins the game if all the mine cells have been correctly flagged
         or if the only cells on the player's game board that still contain a "*" are
-        the mine cells. This is determined by comparing the mine_cells and flagged_cells
-        lists and by checking the player's game board. If the conditions are met,
-        the function returns True; otherwise, it returns False.
+        the mine cells. Both conditions are read from the counters that every move keeps
+        up to date, so the check takes constant time.
+
+        If the board was created with debug=True, the counters are first cross-checked
+        against a full scan of the board.
+
+        Returns:
+        bool: True if the player has won the game, False otherwise.
+        """
+        if self.debug:
+            self.verify_counters()
+
+        if self.flagged_correct == self.mines == len(self.flagged_indices):
+            return True
+
+        return self.hidden_safe_cells == 0
+
+    def check_win_scan(self) -> bool:
+        """
+        Checks if the player has won the game by scanning the whole board.
+
+        This is the reference implementation of check_win, which the counters are checked against.
 
         Returns:
         bool: True if the player has won the game, False otherwise.
         """
-        if set(self.mine_cells) == set(self.flagged_cells):
+        if self.mine_indices == set(self.flagged_indices):
             return True
 
         for i in range(self.height):
             for j in range(self.width):
-                if self.player_board[i][j] == "*" and (i, j) not in self.mine_cells:
+                if (
+                    self.player_board[i][j] == "*"
+                    and i * self.width + j not in self.mine_indices
+                ):
                     return False
 
         return True
 
+    def verify_counters(self):
+        """
+        Recounts hidden safe cells and correct flags by scanning the whole board.
+
+        Raises:
+        RuntimeError: If the recounted values differ from the running counters.
+        """
+        hidden_safe_cells = 0
+        for i in range(self.height):
+            for j in range(self.width):
+                if self.player_board[i][j] == "*" and not self.is_mine(i, j):
+                    hidden_safe_cells += 1
+        flagged_correct = len(self.mine_indices.intersection(self.flagged_indices))
+
+        if (hidden_safe_cells, flagged_correct) != (
+            self.hidden_safe_cells,
+            self.flagged_correct,
+        ):
+            raise RuntimeError(
+                f"Win counters out of sync: counted {hidden_safe_cells} hidden safe cells and "
+                f"{flagged_correct} correct flags, tracked {self.hidden_safe_cells} and {self.flagged_correct}."
+            )
+
     def get_cell_value(self, row: int, col: int, board="player_board") -> str:
         """
         Returns the value at a specific cell in a given board.
@@ -266,6 +598,46 @@ class Board:
                 "Invalid board name. Must be 'player_board' or 'default_board'."
             )
 
+    def set_cell_value(self, row: int, col: int, value: str):
+        """
+        Sets the value of a specific cell on the player's game board.
+
+        Args:
+        row (int): The row number of the cell.
+        col (int): The column number of the cell.
+        value (str): The value to show in the cell ("*", "F" or a revealed value).
+
+        Note: This function modifies the player_board in-place, keeps the win counters up to date
+        and reports the cell that changed.
+        """
+        previous = self.player_board[row][col]
+        if self.is_mine(row, col):
+            self.flagged_correct += (value == "F") - (previous == "F")
+        else:
+            self.hidden_safe_cells += (value == "*") - (previous == "*")
+        self.player_board[row][col] = value
+        self.cells_changed((row * self.width + col,))
+
+    def get_row(self, row: int, board="player_board") -> list:
+        """
+        Returns the values of a whole row in a given board.
+
+        Args:
+        row (int): The row number.
+        board (str): The name of the board ("player_board" or "default_board").
+
+        Returns:
+        list: The values of every cell in the row, from left to right.
+        """
+        if board == "player_board":
+            return self.player_board[row]
+        elif board == "default_board":
+            return self.default_board[row]
+        else:
+            raise ValueError(
+                "Invalid board name. Must be 'player_board' or 'default_board'."
+            )
+
     def reveal_cell(self, row, col):
         """
         Reveals the cell at the given row and column.
@@ -276,14 +648,15 @@ class Board:
 
         The function updates the player's game board to reveal the cell at the given row and column.
         If the cell contains a mine, the game is over, and the function returns False.
-        If the cell is empty, the function performs a Depth-First Search (DFS) to reveal all connected empty cells.
+        If the cell is empty, the cascade engine reveals all connected empty cells.
         If the cell is a number, the function reveals the cell and returns True.
 
         Returns:
         bool: True if the cell is a number, False if the cell is a mine.
         """
+        self.protect_first_click(row, col)
         if self.is_mine(row, col):
-            print("You hit a mine!\nGame Over.")
+            self.renderer.message("You hit a mine!\nGame Over.")
             self.draw_game_board(True)
             return False
 
@@ -291,11 +664,87 @@ class Board:
             self.get_cell_value(row, col) != "*"
             and self.get_cell_value(row, col) != "F"
         ):
-            print("\nCell already revealed.")
+            self.renderer.message("\nCell already revealed.")
             return True
 
-        self.dfs(row, col)
-        self.player_board[row][col] = self.default_board[row][col]
-        print("Safe move.")
-        self.draw_game_board()
+        self.uncover(row, col)
+        self.renderer.message("Safe move.")
+        return True
+
+    def uncover(self, row: int, col: int) -> bool:
+        """
+        Reveals the cell at the given row and column without printing anything.
+
+        Args:
+        row (int): The row number of the cell to reveal.
+        col (int): The column number of the cell to reveal.
+
+        If the cell contains a mine, nothing is changed and the function returns False.
+        Otherwise the cascade engine reveals the cell and any connected empty cells.
+
+        Returns:
+        bool: False if the cell is a mine, True otherwise.
+        """
+        self.protect_first_click(row, col)
+        if self.is_mine(row, col):
+            return False
+
+        self.cascade.reveal(self, row, col)
+        self.set_cell_value(row, col, self.get_cell_value(row, col, "default_board"))
         return True
+
+    def chord_cells(self, row: int, col: int) -> list:
+        """
+        Returns the cells a chord on the given cell reveals.
+
+        A chord on a revealed number whose neighbors hold as many flags as the number reveals all of
+        its other hidden neighbors. A chord on any other cell reveals nothing.
+
+        Args:
+        row (int): The row number of the cell.
+        col (int): The column number of the cell.
+
+        Returns:
+        list: The (row, col) of the hidden, unflagged neighbors, or an empty list if the chord does nothing.
+        """
+        value = self.get_cell_value(row, col)
+        if value not in "12345678":
+            return []
+
+        flags = 0
+        hidden = []
+        for r in range(max(0, row - 1), min(row + 2, self.height)):
+            for c in range(max(0, col - 1), min(col + 2, self.width)):
+                if self.is_flagged(r, c):
+                    flags += 1
+                elif self.get_cell_value(r, c) == "*":
+                    hidden.append((r, c))
+        return hidden if flags == int(value) else []
+
+    def uncover_many(self, cells) -> bool:
+        """
+        Reveals many cells in one pass, without printing anything.
+
+        Numbered cells are opened together with one open_cells call, and each empty region is
+        cascaded once, however many of its cells are in the batch. Flagged and revealed cells are skipped.
+
+        Args:
+        cells (iterable): The (row, col) of the cells to reveal.
+
+        Returns:
+        bool: False if any of the cells is a mine, True otherwise. The safe cells are revealed either way.
+        """
+        safe = True
+        numbered = []
+        for row, col in cells:
+            if self.get_cell_value(row, col) != "*":
+                continue
+            if self.is_mine(row, col):
+                safe = False
+            elif self.get_cell_value(row, col, "default_board") == " ":
+                self.cascade.reveal(self, row, col)
+            else:
+                numbered.append(row * self.width + col)
+
+        self.open_cells(numbered)
+        return safe
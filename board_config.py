@@ -0,0 +1,194 @@
+"""
+Custom board sizes and densities.
+
+A board configuration is a (width, height, mines) tuple, like the values of game_options in main.py.
+The functions here build and validate configurations, and pick the board implementation that suits
+a board size best.
+"""
+
+from board import Board
+
+# The largest boards, in cells, kept as nested lists. Up to here Board is the fastest to play on.
+LIST_BOARD_CELLS = 10_000
+
+# The largest boards, in cells, generated up front in NumPy arrays. Larger boards are generated
+# lazily, one chunk at a time, since building them whole would take seconds.
+ARRAY_BOARD_CELLS = 250_000
+
+# The representations that can be asked for by name, e.g. on the command line
+BOARD_TYPES = ("auto", "list", "array", "chunked")
+
+
+def select_board_class(width: int, height: int):
+    """
+    Returns the board implementation best suited to a board size.
+
+    Small boards are plain lists, medium boards NumPy arrays (or lists without NumPy), and huge boards
+    are generated lazily with ChunkedBoard, whose memory follows the area explored rather than the
+    size of the board.
+
+    Args:
+        width (int): The number of columns in the game board.
+        height (int): The number of rows in the game board.
+
+    Returns:
+        type: Board, ArrayBoard or ChunkedBoard.
+    """
+    cells = width * height
+    if cells <= LIST_BOARD_CELLS:
+        return Board
+
+    # Imported here, so that games on small boards start without loading NumPy
+    from array_board import ArrayBoard, np
+    from chunked_board import ChunkedBoard
+
+    if cells <= ARRAY_BOARD_CELLS and np is not None:
+        return ArrayBoard
+    return ChunkedBoard
+
+
+def board_class_named(name: str, width: int, height: int):
+    """
+    Returns the board implementation of one of BOARD_TYPES.
+
+    Args:
+        name (str): "list", "array", "chunked", or "auto" to let select_board_class pick.
+        width (int): The number of columns in the game board.
+        height (int): The number of rows in the game board.
+
+    Returns:
+        type: Board, ArrayBoard or ChunkedBoard.
+    """
+    if name == "auto":
+        return select_board_class(width, height)
+    elif name == "list":
+        return Board
+    elif name == "array":
+        from array_board import ArrayBoard
+
+        return ArrayBoard
+    elif name == "chunked":
+        from chunked_board import ChunkedBoard
+
+        return ChunkedBoard
+    raise ValueError(f"Invalid board type. Must be one of {', '.join(BOARD_TYPES)}.")
+
+
+def board_type_of(board_class) -> str:
+    """
+    Returns the name in BOARD_TYPES of a board implementation, the inverse of board_class_named.
+
+    Subclasses, such as the instrumented boards, are named after the implementation they extend.
+    The classes are matched by name, so that NumPy is not imported to name a Board.
+
+    Args:
+        board_class (type): Board, ArrayBoard, ChunkedBoard or a subclass of one of them.
+
+    Returns:
+        str: "list", "array" or "chunked".
+    """
+    names = {cls.__name__ for cls in board_class.__mro__}
+    if "ChunkedBoard" in names:
+        return "chunked"
+    elif "ArrayBoard" in names:
+        return "array"
+    return "list"
+
+
+def max_mines(width: int, height: int, board_class=Board) -> int:
+    """
+    Returns the largest number of mines a board of the given size can hold.
+
+    Board and ArrayBoard keep the first row and the first column free of mines; ChunkedBoard has no
+    exclusion zone.
+
+    Args:
+        width (int): The number of columns in the game board.
+        height (int): The number of rows in the game board.
+        board_class (type, optional): The board implementation. Defaults to Board.
+
+    Returns:
+        int: The number of cells that can hold a mine.
+    """
+    if board_class is not Board:
+        from chunked_board import ChunkedBoard
+
+        if issubclass(board_class, ChunkedBoard):
+            return width * height
+    return (width - 1) * (height - 1)
+
+
+def custom_options(width: int, height: int, mines=None, density=None, board_class=None):
+    """
+    Builds and validates a board configuration.
+
+    Exactly one of mines and density is given. A density is the fraction of all the cells of the
+    board that hold a mine, e.g. 0.15.
+
+    Args:
+        width (int): The number of columns in the game board.
+        height (int): The number of rows in the game board.
+        mines (int, optional): The number of mines on the game board. Defaults to None.
+        density (float, optional): The fraction of the cells that hold a mine. Defaults to None.
+        board_class (type, optional): The board implementation the configuration is for. Defaults to None,
+                                      which is the one select_board_class picks.
+
+    Raises:
+        ValueError: If the size or the number of mines is invalid. The message tells the player what is wrong.
+
+    Returns:
+        tuple: The (width, height, mines) of the board.
+    """
+    if width < 2 or height < 2:
+        raise ValueError("The board needs at least 2 rows and 2 columns.")
+    if (mines is None) == (density is None):
+        raise ValueError("Give either a number of mines or a density.")
+    if density is not None:
+        if not 0 < density < 1:
+            raise ValueError("The density should be between 0 and 1, e.g. 0.15.")
+        mines = max(1, round(density * width * height))
+
+    if board_class is None:
+        board_class = select_board_class(width, height)
+    limit = max_mines(width, height, board_class)
+    if not 1 <= mines <= limit:
+        raise ValueError(
+            f"A {width}x{height} board holds between 1 and {limit} mines, not {mines}."
+        )
+    return width, height, mines
+
+
+def parse_options(text: str):
+    """
+    Parses a board configuration in the form 'width height mines', or 'width height density'.
+
+    The size can also be written 'widthxheight', e.g. '30x16 99'. A third part with a decimal point,
+    e.g. '0.15', is a density.
+
+    Args:
+        text (str): The text entered by the player.
+
+    Raises:
+        ValueError: If the text is not a valid configuration. The message tells the player what is wrong.
+
+    Returns:
+        tuple: The (width, height, mines) of the board.
+    """
+    parts = text.lower().replace("x", " ").split()
+    if len(parts) != 3:
+        raise ValueError(
+            "Invalid input. Please enter 'width height mines', e.g. '30 16 99'."
+        )
+
+    try:
+        width, height = int(parts[0]), int(parts[1])
+        if "." in parts[2]:
+            mines, density = None, float(parts[2])
+        else:
+            mines, density = int(parts[2]), None
+    except ValueError:
+        raise ValueError(
+            "Invalid input. The width, height and mines should be numbers."
+        )
+
+    return custom_options(width, height, mines=mines, density=density)
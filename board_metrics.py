@@ -0,0 +1,190 @@
+"""
+Difficulty metrics of a generated board.
+
+All of them come from the default game board alone, so they describe the board rather than a game
+played on it, and are measured in one pass over its rows.
+"""
+
+# The number of regions along each side of the board that mine density is measured for
+REGION_GRID = 3
+
+
+class BoardMetrics:
+    """
+    The standard difficulty metrics of a board.
+
+    The 3BV of a board is the least number of clicks that reveals every safe cell: one per opening
+    plus one per isolated number.
+
+    Attributes:
+        opening_sizes (list): For every opening, the number of cells one click on it reveals: its empty
+                              cells and the numbered cells bordering it. In the order the openings are
+                              first met, row by row.
+        isolated_numbers (int): The numbered cells that border no opening and must be clicked one by one.
+        region_density (list): The share of cells holding a mine in each region of a REGION_GRID by
+                               REGION_GRID grid, as rows of floats from the top left.
+        density (float): The share of cells holding a mine over the whole board.
+    """
+
+    def __init__(
+        self, opening_sizes, isolated_numbers: int, region_density, density: float
+    ):
+        self.opening_sizes = opening_sizes
+        self.isolated_numbers = isolated_numbers
+        self.region_density = region_density
+        self.density = density
+
+    @property
+    def openings(self) -> int:
+        """
+        int: The number of openings, i.e. connected groups of empty cells.
+        """
+        return len(self.opening_sizes)
+
+    @property
+    def bbbv(self) -> int:
+        """
+        int: The 3BV of the board.
+        """
+        return len(self.opening_sizes) + self.isolated_numbers
+
+    def as_dict(self) -> dict:
+        """
+        Returns the metrics as plain values, e.g. for JSON.
+
+        Returns:
+            dict: The keys "3bv", "openings", "opening_sizes", "isolated_numbers", "region_density" and "density".
+        """
+        return {
+            "3bv": self.bbbv,
+            "openings": self.openings,
+            "opening_sizes": self.opening_sizes,
+            "isolated_numbers": self.isolated_numbers,
+            "region_density": self.region_density,
+            "density": self.density,
+        }
+
+
+def region_bounds(size: int, regions: int) -> list:
+    """
+    Splits a side of the board into regions as even as possible.
+
+    Args:
+        size (int): The number of rows or columns.
+        regions (int): The number of regions, at most size.
+
+    Returns:
+        list: The region of every row or column.
+    """
+    return [
+        region
+        for region in range(regions)
+        for _ in range(region * size // regions, (region + 1) * size // regions)
+    ]
+
+
+def measure(board, regions=REGION_GRID) -> BoardMetrics:
+    """
+    Measures the difficulty metrics of a board in one pass over the rows of its default game board.
+
+    Empty cells are labeled as they are read and joined to the empty cells above and to the left of
+    them, with a union-find forest. Each row's numbered cells are looked at once the row below is
+    labeled, so every cell is read once and only three rows of values are held at a time; lazily
+    generated boards such as ChunkedBoard can be measured without holding the whole board.
+
+    Args:
+        board (Board): The board to measure.
+        regions (int, optional): The number of regions along each side of the board for region_density,
+                                 capped by the size of the board. Defaults to REGION_GRID.
+
+    Returns:
+        BoardMetrics: The metrics of the board.
+    """
+    width, height = board.width, board.height
+    region_rows, region_cols = min(regions, height), min(regions, width)
+    region_of_row = region_bounds(height, region_rows)
+    region_of_col = region_bounds(width, region_cols)
+    region_mines = [[0] * region_cols for _ in range(region_rows)]
+    region_cells = [
+        [region_of_row.count(i) * region_of_col.count(j) for j in range(region_cols)]
+        for i in range(region_rows)
+    ]
+
+    parent = []
+    bordered = []
+    isolated = 0
+
+    def find(label):
+        while parent[label] != label:
+            parent[label] = parent[parent[label]]
+            label = parent[label]
+        return label
+
+    def union(a, b):
+        a, b = find(a), find(b)
+        if a != b:
+            parent[max(a, b)] = min(a, b)
+
+    def settle(labels, above, below):
+        # Sorts the numbered cells of a row, now that the rows around it are labeled
+        nonlocal isolated
+        for col, label in enumerate(labels):
+            if label != -1:
+                continue
+            touching = set()
+            for row_labels in (above, labels, below):
+                if row_labels is None:
+                    continue
+                for neighbor in row_labels[max(0, col - 1) : col + 2]:
+                    if neighbor >= 0:
+                        touching.add(neighbor)
+            if touching:
+                bordered.append(touching)
+            else:
+                isolated += 1
+
+    # Labels of the two rows before the current one: >= 0 for empty cells, -1 for numbers, -2 for mines
+    above = previous = None
+    for row in range(height):
+        values = board.get_row(row, "default_board")
+        region_row = region_mines[region_of_row[row]]
+        labels = []
+        for col, value in enumerate(values):
+            if value == " ":
+                label = len(parent)
+                parent.append(label)
+                if col and labels[col - 1] >= 0:
+                    union(label, labels[col - 1])
+                if previous is not None:
+                    for neighbor in previous[max(0, col - 1) : col + 2]:
+                        if neighbor >= 0:
+                            union(label, neighbor)
+            elif value == "M":
+                label = -2
+                region_row[region_of_col[col]] += 1
+            else:
+                label = -1
+            labels.append(label)
+        if previous is not None:
+            settle(previous, above, labels)
+        above, previous = previous, labels
+    settle(previous, above, None)
+
+    # Empty cells count once in their opening, numbered cells once in every opening they border
+    sizes = {}
+    for label in range(len(parent)):
+        root = find(label)
+        sizes[root] = sizes.get(root, 0) + 1
+    for touching in bordered:
+        for root in {find(label) for label in touching}:
+            sizes[root] += 1
+
+    return BoardMetrics(
+        [sizes[root] for root in sorted(sizes)],
+        isolated,
+        [
+            [mines / cells for mines, cells in zip(*counts)]
+            for counts in zip(region_mines, region_cells)
+        ],
+        board.mines / (width * height),
+    )
@@ -0,0 +1,141 @@
+import threading
+from collections import deque
+from queue import Queue
+from random import Random
+
+from board import Board
+
+
+class BoardPool:
+    def __init__(
+        self,
+        width: int,
+        height: int,
+        mines: int,
+        size=2,
+        seed=None,
+        board_class=Board,
+        background=True,
+        seeds=None,
+        **board_options,
+    ):
+        """
+        Initializes a pool of ready-to-play boards of one size.
+
+        Boards handed back with release are reset in place with Board.reset, so their grids are
+        reused instead of allocated again. A background thread keeps up to size boards generated
+        ahead of time, so acquire usually returns at once.
+
+        Every board gets its own seed, drawn from a random number generator seeded with seed, so a
+        seeded pool hands out the same sequence of boards on every run. The seeds can come from an
+        iterator instead, e.g. no_guess.no_guess_seeds, which then runs in the background thread too.
+
+        Args:
+            width (int): The number of columns in the game boards.
+            height (int): The number of rows in the game boards.
+            mines (int): The number of mines on the game boards.
+            size (int, optional): The number of boards generated ahead of time. Defaults to 2.
+            seed (optional): The seed of the sequence of board seeds. Defaults to None (unseeded).
+            board_class (type, optional): The board implementation, or a factory with the same arguments. Defaults to Board.
+            background (bool, optional): If False, boards are generated in acquire instead of in a thread. Defaults to True.
+            seeds (iterator, optional): The seeds of the boards, used instead of seed. Defaults to None.
+            **board_options: Other options passed to new boards, e.g. renderer or first_click_safe.
+
+        Attributes:
+            width (int): The number of columns in the game boards.
+            height (int): The number of rows in the game boards.
+            mines (int): The number of mines on the game boards.
+            board_class (type): The board implementation.
+            board_options (dict): The options passed to new boards.
+            rng (random.Random): Draws the seed of every board.
+            seeds (iterator): The seeds of the boards, or None to draw them from rng.
+            released (deque): Boards handed back, waiting to be reset.
+            ready (Queue): Boards generated ahead of time, or the error that stopped the background thread.
+            thread (threading.Thread): The background thread, or None.
+        """
+        self.width = width
+        self.height = height
+        self.mines = mines
+        self.board_class = board_class
+        self.board_options = board_options
+        self.rng = Random(seed)
+        self.seeds = seeds
+        self.lock = threading.Lock()
+        self.released = deque()
+        self.ready = Queue(maxsize=size)
+        self.closed = False
+        self.thread = None
+        if background:
+            self.thread = threading.Thread(target=self.fill, daemon=True)
+            self.thread.start()
+
+    def next_seed(self) -> int:
+        with self.lock:
+            if self.seeds is not None:
+                return next(self.seeds)
+            return self.rng.getrandbits(64)
+
+    def generate(self):
+        """
+        Returns a freshly generated board, resetting a released board if there is one.
+        """
+        seed = self.next_seed()
+        try:
+            board = self.released.popleft()
+        except IndexError:
+            return self.board_class(
+                self.width, self.height, self.mines, seed=seed, **self.board_options
+            )
+        board.reset(seed)
+        return board
+
+    def fill(self):
+        """
+        Keeps the ready queue full. Runs in the background thread until close is called.
+
+        If a board cannot be generated, e.g. because the configuration is invalid or the seeds ran out,
+        the error is queued for acquire to raise and the thread stops.
+        """
+        while not self.closed:
+            try:
+                board = self.generate()
+            except Exception as error:
+                self.ready.put(error)
+                return
+            self.ready.put(board)
+
+    def acquire(self):
+        """
+        Returns a new board to play on.
+
+        Raises:
+            Exception: The error that stopped the background thread from generating boards, on this and every later call.
+        """
+        if self.thread is None:
+            return self.generate()
+        board = self.ready.get()
+        if isinstance(board, Exception):
+            # Queued again, so that later calls raise too instead of waiting for a board that never comes
+            self.ready.put(board)
+            raise board
+        return board
+
+    def release(self, board):
+        """
+        Hands a board back to the pool once its game is over. It must not be used afterwards.
+        """
+        self.released.append(board)
+
+    def close(self):
+        """
+        Stops the background thread, and the seeds iterator if it is a generator. Boards already generated are dropped.
+        """
+        self.closed = True
+        if self.thread is not None:
+            while self.thread.is_alive():
+                while not self.ready.empty():
+                    self.ready.get_nowait()
+                self.thread.join(timeout=0.01)
+            self.thread = None
+        if hasattr(self.seeds, "close"):
+            self.seeds.close()
@@ -0,0 +1,151 @@
+from collections import deque
+
+
+class DfsCascade:
+    """
+    Reference cascade engine.
+
+    Reveals cells by running Board.dfs from the clicked cell, exactly as the game always has.
+    It needs no precomputation and is the engine the faster ones are checked against.
+    """
+
+    def build(self, board):
+        """
+        Prepares the engine for a newly generated board. The DFS engine has nothing to precompute.
+
+        Args:
+        board (Board): The board that was just generated.
+        """
+
+    def reveal(self, board, row: int, col: int):
+        """
+        Reveals the cell at the given row and column and cascades through empty cells.
+
+        Args:
+        board (Board): The board to reveal the cell on.
+        row (int): The row number of the clicked cell.
+        col (int): The column number of the clicked cell.
+        """
+        board.dfs(row, col)
+
+
+class RegionCascade:
+    """
+    Cascade engine backed by zero-regions, labeled as they are clicked.
+
+    The first click on an empty cell labels its connected group of empty cells, and the numbered
+    cells bordering it are stored with it. The region is then revealed in a single bulk call
+    instead of one cell at a time. Nothing is computed when a board is generated, so the engine
+    costs nothing on boards that are never clicked, e.g. in a BoardPool.
+    """
+
+    def __init__(self):
+        """
+        Initializes an engine with no board built yet.
+
+        Attributes:
+            width (int): The number of columns of the board the regions are labeled on.
+            empty (bytes): 1 for every empty cell of the board, indexed by row * width + col, or None until the first
+                           reveal.
+            region_of (dict): The region number of every empty cell labeled so far, by row * width + col.
+            regions (list): For every region, the flat indices of its empty cells followed by its numbered border.
+            partial (set): The regions revealed with Board.dfs: those already opened, and those some of whose
+                           empty cells were revealed or flagged before the region was clicked.
+        """
+        self.width = 0
+        self.empty = None
+        self.region_of = {}
+        self.regions = []
+        self.partial = set()
+
+    def build(self, board):
+        """
+        Forgets the regions of the previous board. The regions of the new one are labeled when clicked.
+
+        Args:
+        board (Board): The board that was just generated.
+        """
+        self.width = board.width
+        self.empty = None
+        self.region_of = {}
+        self.regions = []
+        self.partial = set()
+
+    def region_at(self, board, row: int, col: int):
+        """
+        Returns the region number of an empty cell, labeling its region if needed.
+
+        The region is found with a breadth-first search over empty neighbors, so labeling it is
+        linear in its size. A region with revealed or flagged empty cells is marked partial.
+
+        Args:
+        board (Board): The board the cell is on.
+        row (int): The row number of the cell.
+        col (int): The column number of the cell.
+
+        Returns:
+        int: The region number, or None if the cell is not empty.
+        """
+        if self.empty is None:
+            self.empty = board.empty_mask()
+        width, height = board.width, board.height
+        empty = self.empty
+        start = row * width + col
+        if not empty[start]:
+            return None
+        region_id = self.region_of.get(start)
+        if region_id is not None:
+            return region_id
+
+        region_of = self.region_of
+        region_id = len(self.regions)
+        region_of[start] = region_id
+        cells = [start]
+        border = set()
+        queue = deque(cells)
+
+        while queue:
+            index = queue.popleft()
+            r, c = divmod(index, width)
+            for new_row in range(max(0, r - 1), min(r + 2, height)):
+                for new_col in range(max(0, c - 1), min(c + 2, width)):
+                    neighbor = new_row * width + new_col
+                    if not empty[neighbor]:
+                        border.add(neighbor)
+                    elif neighbor not in region_of:
+                        region_of[neighbor] = region_id
+                        cells.append(neighbor)
+                        queue.append(neighbor)
+
+        if any(board.get_cell_value(*divmod(index, width)) != "*" for index in cells):
+            self.partial.add(region_id)
+        cells.extend(border)
+        self.regions.append(cells)
+        return region_id
+
+    def reveal(self, board, row: int, col: int):
+        """
+        Reveals the cell at the given row and column and cascades through empty cells.
+
+        A numbered cell is revealed on its own. An empty cell reveals its whole region at once, the
+        first time the region is clicked. A region some of whose empty cells are already revealed or
+        flagged is revealed with Board.dfs instead, exactly like the reference engine: a flag can cut
+        the region in two, and Board.dfs does not cross revealed cells. Once opened, a region is
+        partial too, since flagging and unflagging a revealed cell hides it again.
+
+        Args:
+        board (Board): The board to reveal the cell on.
+        row (int): The row number of the clicked cell.
+        col (int): The column number of the clicked cell.
+        """
+        region_id = self.region_at(board, row, col)
+        if region_id is None:
+            board.open_cells([row * self.width + col])
+            return
+
+        if region_id in self.partial:
+            board.dfs(row, col)
+            return
+
+        self.partial.add(region_id)
+        board.open_cells(self.regions[region_id])
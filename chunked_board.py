@@ -0,0 +1,602 @@
+import zlib
+from collections import OrderedDict
+from random import Random
+
+from array_board import CELL_CHARS, FLAGGED, HIDDEN, MINE, REVEALED
+from board import Board
+from cascade import DfsCascade
+from placement import neighborhood
+
+
+class Chunk:
+    """
+    The cells of one chunk of a ChunkedBoard.
+
+    Attributes:
+        width (int): The number of columns in the chunk.
+        height (int): The number of rows in the chunk.
+        counts (bytearray): The number of neighboring mines of every cell, or MINE, indexed by row * width + col.
+        state (bytearray): HIDDEN, REVEALED or FLAGGED for every cell, indexed the same way.
+    """
+
+    __slots__ = ("width", "height", "counts", "state")
+
+    def __init__(self, width: int, height: int, counts: bytearray, state: bytearray):
+        self.width = width
+        self.height = height
+        self.counts = counts
+        self.state = state
+
+
+class ChunkedBoard(Board):
+    def __init__(
+        self,
+        width: int,
+        height: int,
+        mines: int,
+        chunk_size=64,
+        max_chunks=1024,
+        saved_mines=None,
+        **kwargs,
+    ):
+        """
+        Initializes a board that is generated lazily, one square chunk at a time.
+
+        Nothing is allocated up front. The mines of a chunk are drawn from a random number generator
+        seeded with the board seed and the chunk coordinates, the first time any cell near the chunk
+        is looked at, so every chunk is the same whenever it is generated again. The total number of
+        mines is shared between chunks in proportion to their number of cells, rounded up or down at
+        random from the seed, so the board holds exactly mines mines however large it is and no cell
+        is a mine on every board.
+
+        At most max_chunks chunks are kept in full. When more are needed, the least recently used one
+        is evicted: its adjacency counts are dropped, since they can be generated again, and its state
+        is kept compressed if the player changed any of its cells. Memory therefore follows the area
+        the player has explored rather than the size of the board.
+
+        Cells are revealed with Board.dfs, which crosses chunk borders as it goes. The board has no
+        exclusion zone, but first_click_safe is supported.
+
+        A board restored from a snapshot is given the saved mines instead: each chunk takes its mines
+        from them, converted to indices inside the chunk, until the mines move at the first click or
+        the board is reset.
+
+        Args:
+            width (int): The number of columns in the game board.
+            height (int): The number of rows in the game board.
+            mines (int): The number of mines on the game board.
+            chunk_size (int, optional): The number of rows and columns in a chunk. Defaults to 64.
+            max_chunks (int, optional): The number of chunks kept in full. Defaults to 1024.
+            saved_mines (set, optional): The flat indices (row * width + col) of the mine cells of a saved board.
+                                         Defaults to None, which draws the mines of every chunk from the seed.
+            **kwargs: The options of Board, e.g. seed, first_click_safe or renderer.
+
+        Attributes:
+            The attributes of Board, except that mine_cells is built from every chunk on each access, and
+            player_board, default_board and mine_indices are not used: the boards are read with get_row and
+            get_cell_value, and changed with set_cell_value.
+            chunk_size (int): The number of rows and columns in a chunk.
+            max_chunks (int): The number of chunks kept in full.
+            chunks (OrderedDict): The chunks kept in full, by (chunk row, chunk col), least recently used first.
+            compact (dict): The compressed state of evicted chunks the player changed, by (chunk row, chunk col).
+            chunk_mines_cache (OrderedDict): The mine cells of recently used chunks, by (chunk row, chunk col).
+            safe_zone (set): The flat indices of the cells kept free of mines by first_click_safe.
+            count_offset (int): The seeded offset at which mines are spread over the chunks.
+            count_shifts (dict): The mines moved into or out of chunks by first_click_safe, by (chunk row, chunk col).
+            saved_mines (set): The flat indices of the saved mine cells the chunks are built from, or None.
+        """
+        if kwargs.get("excluded"):
+            raise ValueError("ChunkedBoard does not support excluded cells.")
+        kwargs["excluded"] = set()
+        kwargs.setdefault("cascade", DfsCascade())
+
+        self.chunk_size = chunk_size
+        self.max_chunks = max_chunks
+        self.saved_mines = saved_mines
+        super().__init__(width, height, mines, **kwargs)
+
+    def initialize_boards(self):
+        """
+        Prepares the empty chunk caches. Chunks are only generated when they are first used.
+        """
+        if self.seed is None:
+            self.seed = self.rng.getrandbits(64)
+        self.chunks = OrderedDict()
+        self.compact = {}
+        self.chunk_mines_cache = OrderedDict()
+        self.safe_zone = set()
+        self.count_offset = Random(f"{self.seed}:counts").randrange(
+            self.width * self.height
+        )
+        self.count_shifts = {}
+
+    def reset_boards(self):
+        """
+        Drops every chunk and the saved mines. The chunks of the new game are generated when they are first used.
+        """
+        self.saved_mines = None
+        self.initialize_boards()
+
+    @property
+    def mine_cells(self):
+        """
+        list: A read-only list of tuples representing the coordinates of the mine cells, built from every chunk.
+        """
+        cells = []
+        for chunk_row in range(-(-self.height // self.chunk_size)):
+            for chunk_col in range(-(-self.width // self.chunk_size)):
+                chunk_width, _ = self.chunk_shape(chunk_row, chunk_col)
+                for index in sorted(self.chunk_mines(chunk_row, chunk_col)):
+                    row, col = divmod(index, chunk_width)
+                    cells.append(
+                        (
+                            chunk_row * self.chunk_size + row,
+                            chunk_col * self.chunk_size + col,
+                        )
+                    )
+        return sorted(cells)
+
+    def chunk_shape(self, chunk_row: int, chunk_col: int):
+        """
+        Returns the (width, height) of a chunk. Chunks on the right and bottom edges may be smaller.
+        """
+        return (
+            min(self.chunk_size, self.width - chunk_col * self.chunk_size),
+            min(self.chunk_size, self.height - chunk_row * self.chunk_size),
+        )
+
+    def chunk_mine_count(self, chunk_row: int, chunk_col: int) -> int:
+        """
+        Returns the number of mines in a chunk.
+
+        Chunks are numbered row by row. A chunk gets the mines that fall between the cells before it
+        and the cells up to its end, when mines are spread evenly over the board starting at
+        count_offset, so the counts of all chunks add up to exactly the number of mines on the board.
+        Since the offset is drawn from the seed, each chunk's share is rounded up on some boards and
+        down on others. Mines moved by first_click_safe are then added or taken away.
+        """
+        size = self.chunk_size
+        chunk_width, chunk_height = self.chunk_shape(chunk_row, chunk_col)
+        start = chunk_row * size * self.width + chunk_col * size * chunk_height
+        end = start + chunk_width * chunk_height
+        cells = self.width * self.height
+        offset = self.count_offset
+        return (
+            (self.mines * end + offset) // cells
+            - (self.mines * start + offset) // cells
+            + self.count_shifts.get((chunk_row, chunk_col), 0)
+        )
+
+    def chunk_mines(self, chunk_row: int, chunk_col: int) -> frozenset:
+        """
+        Returns the mine cells of a chunk, generating them if needed.
+
+        Args:
+        chunk_row (int): The row of the chunk.
+        chunk_col (int): The column of the chunk.
+
+        Returns:
+        frozenset: The indices of the mine cells inside the chunk, as row * chunk width + col.
+        """
+        key = (chunk_row, chunk_col)
+        if key in self.chunk_mines_cache:
+            self.chunk_mines_cache.move_to_end(key)
+            return self.chunk_mines_cache[key]
+
+        chunk_width, chunk_height = self.chunk_shape(chunk_row, chunk_col)
+        top, left = chunk_row * self.chunk_size, chunk_col * self.chunk_size
+        if self.saved_mines is not None:
+            mines = frozenset(
+                r * chunk_width + c
+                for r in range(chunk_height)
+                for c in range(chunk_width)
+                if (top + r) * self.width + left + c in self.saved_mines
+            )
+            return self.cache_chunk_mines(key, mines)
+
+        excluded = set()
+        for index in self.safe_zone:
+            row, col = divmod(index, self.width)
+            if top <= row < top + chunk_height and left <= col < left + chunk_width:
+                excluded.add((row - top) * chunk_width + col - left)
+
+        rng = Random(f"{self.seed}:{chunk_row}:{chunk_col}")
+        mines = frozenset(
+            self.placement(
+                rng,
+                chunk_width,
+                chunk_height,
+                self.chunk_mine_count(chunk_row, chunk_col),
+                excluded,
+            )
+        )
+        return self.cache_chunk_mines(key, mines)
+
+    def cache_chunk_mines(self, key, mines: frozenset) -> frozenset:
+        """
+        Keeps the mine cells of a chunk in chunk_mines_cache, dropping the least recently used ones, and returns them.
+        """
+        self.chunk_mines_cache[key] = mines
+        if len(self.chunk_mines_cache) > 4 * self.max_chunks:
+            self.chunk_mines_cache.popitem(last=False)
+        return mines
+
+    def chunk(self, chunk_row: int, chunk_col: int) -> Chunk:
+        """
+        Returns a chunk in full, generating its adjacency counts and restoring its state if needed.
+
+        Args:
+        chunk_row (int): The row of the chunk.
+        chunk_col (int): The column of the chunk.
+
+        Returns:
+        Chunk: The chunk.
+        """
+        key = (chunk_row, chunk_col)
+        if key in self.chunks:
+            self.chunks.move_to_end(key)
+            return self.chunks[key]
+
+        chunk_width, chunk_height = self.chunk_shape(chunk_row, chunk_col)
+        top, left = chunk_row * self.chunk_size, chunk_col * self.chunk_size
+        counts = bytearray(chunk_width * chunk_height)
+
+        for neighbor_row in range(max(0, chunk_row - 1), chunk_row + 2):
+            for neighbor_col in range(max(0, chunk_col - 1), chunk_col + 2):
+                if (
+                    neighbor_row * self.chunk_size >= self.height
+                    or neighbor_col * self.chunk_size >= self.width
+                ):
+                    continue
+                neighbor_width, _ = self.chunk_shape(neighbor_row, neighbor_col)
+                for index in self.chunk_mines(neighbor_row, neighbor_col):
+                    row, col = divmod(index, neighbor_width)
+                    row += neighbor_row * self.chunk_size - top
+                    col += neighbor_col * self.chunk_size - left
+                    for r in range(max(0, row - 1), min(row + 2, chunk_height)):
+                        for c in range(max(0, col - 1), min(col + 2, chunk_width)):
+                            counts[r * chunk_width + c] += 1
+
+        for index in self.chunk_mines(chunk_row, chunk_col):
+            counts[index] = MINE
+
+        if key in self.compact:
+            state = bytearray(zlib.decompress(self.compact.pop(key)))
+        else:
+            state = bytearray(chunk_width * chunk_height)
+
+        chunk = Chunk(chunk_width, chunk_height, counts, state)
+        self.chunks[key] = chunk
+        if len(self.chunks) > self.max_chunks:
+            self.evict()
+        return chunk
+
+    def evict(self):
+        """
+        Evicts the least recently used chunk, keeping its state compressed if the player changed it.
+        """
+        key, chunk = self.chunks.popitem(last=False)
+        if any(chunk.state):
+            self.compact[key] = zlib.compress(bytes(chunk.state))
+
+    def locate(self, row: int, col: int):
+        """
+        Returns the chunk holding a cell and the index of the cell inside it.
+
+        Args:
+        row (int): The row number of the cell.
+        col (int): The column number of the cell.
+
+        Returns:
+        tuple: The Chunk and the index of the cell in its arrays.
+        """
+        chunk_row, r = divmod(row, self.chunk_size)
+        chunk_col, c = divmod(col, self.chunk_size)
+        chunk = self.chunk(chunk_row, chunk_col)
+        return chunk, r * chunk.width + c
+
+    def protect_first_click(self, row: int, col: int):
+        """
+        Keeps the first revealed cell and its neighbors free of mines, if the board is first-click safe.
+
+        The cells become a safe zone that chunk generation avoids. Mines that no longer fit in a chunk
+        move to the next chunks with room. The chunks around the zone and those that took mines are
+        generated again from the seed, keeping the flags placed before the first click; saved mines
+        are dropped, since they are the mines the seed gave before the first click.
+
+        Args:
+        row (int): The row number of the cell being revealed.
+        col (int): The column number of the cell being revealed.
+        """
+        if self.opened:
+            return
+        self.opened = True
+        if not self.first_click_safe:
+            return
+
+        safe_zone = neighborhood(self.width, self.height, row, col)
+        if not any(self.is_mine(*divmod(index, self.width)) for index in safe_zone):
+            return
+        cells = self.width * self.height
+        if cells - len(safe_zone) < self.mines:
+            safe_zone = {row * self.width + col}
+            if cells - 1 < self.mines or not self.is_mine(row, col):
+                return
+
+        self.safe_zone = safe_zone
+        self.saved_mines = None
+        # The zone may cross chunk borders: the mines of every chunk it touches move, and the
+        # adjacency counts of every chunk next to one of those change
+        touched = {
+            (
+                index // self.width // self.chunk_size,
+                index % self.width // self.chunk_size,
+            )
+            for index in safe_zone
+        }
+        touched |= self.shift_surplus(safe_zone)
+        for key in list(self.chunks):
+            if any(
+                abs(key[0] - chunk_row) <= 1 and abs(key[1] - chunk_col) <= 1
+                for chunk_row, chunk_col in touched
+            ):
+                chunk = self.chunks.pop(key)
+                if any(chunk.state):
+                    self.compact[key] = zlib.compress(bytes(chunk.state))
+        for key in touched:
+            self.chunk_mines_cache.pop(key, None)
+
+        flagged_correct = 0
+        for index in self.flagged_indices:
+            flagged_correct += self.is_mine(*divmod(index, self.width))
+        self.flagged_correct = flagged_correct
+        wrong_flags = len(self.flagged_indices) - flagged_correct
+        self.hidden_safe_cells = self.width * self.height - self.mines - wrong_flags
+        self.mines_placed()
+
+    def shift_surplus(self, zone) -> set:
+        """
+        Moves the mines that no longer fit in a chunk once a safe zone is excluded to the next chunks
+        with room, in chunk order, wrapping around to the first chunk.
+
+        Args:
+        zone (set): The flat indices of the cells kept free of mines.
+
+        Returns:
+        set: The (chunk row, chunk col) of the chunks that took mines.
+        """
+        excluded = {}
+        for index in zone:
+            row, col = divmod(index, self.width)
+            key = (row // self.chunk_size, col // self.chunk_size)
+            excluded[key] = excluded.get(key, 0) + 1
+
+        def room(key):
+            chunk_width, chunk_height = self.chunk_shape(*key)
+            return (
+                chunk_width * chunk_height
+                - excluded.get(key, 0)
+                - self.chunk_mine_count(*key)
+            )
+
+        chunk_cols = -(-self.width // self.chunk_size)
+        chunk_count = -(-self.height // self.chunk_size) * chunk_cols
+        receivers = set()
+        for key in excluded:
+            surplus = -room(key)
+            number = key[0] * chunk_cols + key[1]
+            while surplus > 0:
+                number = (number + 1) % chunk_count
+                other = divmod(number, chunk_cols)
+                moved = min(room(other), surplus)
+                if moved > 0:
+                    self.count_shifts[key] = self.count_shifts.get(key, 0) - moved
+                    self.count_shifts[other] = self.count_shifts.get(other, 0) + moved
+                    receivers.add(other)
+                    surplus -= moved
+        return receivers
+
+    def is_mine(self, row: int, col: int) -> bool:
+        """
+        Checks if the cell at the given row and column contains a mine.
+
+        Only the mines of the cell's chunk are generated; its adjacency counts are not needed.
+
+        Args:
+        row (int): The row of the cell to check.
+        col (int): The column of the cell to check.
+
+        Returns:
+        bool: True if the cell contains a mine, False otherwise.
+        """
+        chunk_row, r = divmod(row, self.chunk_size)
+        chunk_col, c = divmod(col, self.chunk_size)
+        chunk_width, _ = self.chunk_shape(chunk_row, chunk_col)
+        return r * chunk_width + c in self.chunk_mines(chunk_row, chunk_col)
+
+    def dfs(self, row: int, col: int):
+        """
+        Performs a Depth-First Search (DFS) on the game board starting from a given cell.
+
+        Works like Board.dfs, generating chunks as the search reaches them.
+
+        Args:
+        row (int): The row number of the cell where the DFS should start.
+        col (int): The column number of the cell where the DFS should start.
+
+        Note: This function modifies the chunk states in-place, keeps hidden_safe_cells up to date
+        and reports the cells that changed.
+        """
+        stack = self.dfs_stack([(row, col)])
+        changed = []
+
+        while stack:
+            r, c = stack.pop()
+            chunk, index = self.locate(r, c)
+            if chunk.state[index] == HIDDEN:
+                chunk.state[index] = REVEALED
+                changed.append(r * self.width + c)
+                if chunk.counts[index] != MINE:
+                    self.hidden_safe_cells -= 1
+                if chunk.counts[index] == 0:
+                    for new_row in range(max(0, r - 1), min(r + 2, self.height)):
+                        for new_col in range(max(0, c - 1), min(c + 2, self.width)):
+                            stack.append((new_row, new_col))
+
+        self.cells_changed(changed)
+
+    def open_cells(self, cells):
+        """
+        Reveals many cells at once.
+
+        Args:
+        cells (iterable): The flat indices (row * width + col) of the cells to reveal.
+
+        Only hidden cells are revealed; flagged and already revealed cells are left untouched.
+
+        Note: This function modifies the chunk states in-place, keeps hidden_safe_cells up to date
+        and reports the cells that changed.
+        """
+        changed = []
+        for flat_index in cells:
+            chunk, index = self.locate(*divmod(flat_index, self.width))
+            if chunk.state[index] == HIDDEN:
+                chunk.state[index] = REVEALED
+                changed.append(flat_index)
+                if chunk.counts[index] != MINE:
+                    self.hidden_safe_cells -= 1
+
+        self.cells_changed(changed)
+
+    def check_win_scan(self) -> bool:
+        """
+        Checks if the player has won the game by looking at every cell of every chunk.
+
+        This is the reference implementation of check_win; it generates the whole board.
+
+        Returns:
+        bool: True if the player has won the game, False otherwise.
+        """
+        hidden_safe_cells, flagged_correct = self.count_cells()
+        if flagged_correct == self.mines == len(self.flagged_indices):
+            return True
+        return hidden_safe_cells == 0
+
+    def verify_counters(self):
+        """
+        Recounts hidden safe cells and correct flags over every chunk.
+
+        Raises:
+        RuntimeError: If the recounted values differ from the running counters.
+        """
+        hidden_safe_cells, flagged_correct = self.count_cells()
+        if (hidden_safe_cells, flagged_correct) != (
+            self.hidden_safe_cells,
+            self.flagged_correct,
+        ):
+            raise RuntimeError(
+                f"Win counters out of sync: counted {hidden_safe_cells} hidden safe cells and "
+                f"{flagged_correct} correct flags, tracked {self.hidden_safe_cells} and {self.flagged_correct}."
+            )
+
+    def count_cells(self):
+        """
+        Returns the number of hidden safe cells and of correctly flagged cells, looking at every chunk.
+        """
+        hidden_safe_cells = flagged_correct = 0
+        for chunk_row in range(-(-self.height // self.chunk_size)):
+            for chunk_col in range(-(-self.width // self.chunk_size)):
+                chunk = self.chunk(chunk_row, chunk_col)
+                for count, state in zip(chunk.counts, chunk.state):
+                    if count == MINE:
+                        flagged_correct += state == FLAGGED
+                    else:
+                        hidden_safe_cells += state == HIDDEN
+        return hidden_safe_cells, flagged_correct
+
+    def get_cell_value(self, row: int, col: int, board="player_board") -> str:
+        """
+        Returns the value at a specific cell in a given board.
+
+        Args:
+        board (str): The name of the board ("player_board" or "default_board").
+        row (int): The row number of the cell.
+        col (int): The column number of the cell.
+
+        Returns:
+        str: The value at the specified cell in the specified board.
+        """
+        chunk, index = self.locate(row, col)
+        if board == "player_board":
+            state = chunk.state[index]
+            if state == HIDDEN:
+                return "*"
+            elif state == FLAGGED:
+                return "F"
+            return CELL_CHARS[chunk.counts[index]]
+        elif board == "default_board":
+            return CELL_CHARS[chunk.counts[index]]
+        else:
+            raise ValueError(
+                "Invalid board name. Must be 'player_board' or 'default_board'."
+            )
+
+    def set_cell_value(self, row: int, col: int, value: str):
+        """
+        Sets the value of a specific cell on the player's game board.
+
+        Args:
+        row (int): The row number of the cell.
+        col (int): The column number of the cell.
+        value (str): "*" to hide the cell, "F" to flag it, anything else to reveal it.
+
+        Note: This function modifies the chunk state in-place, keeps the win counters up to date
+        and reports the cell that changed.
+        """
+        if value == "*":
+            state = HIDDEN
+        elif value == "F":
+            state = FLAGGED
+        else:
+            state = REVEALED
+
+        chunk, index = self.locate(row, col)
+        previous = chunk.state[index]
+        if chunk.counts[index] == MINE:
+            self.flagged_correct += (state == FLAGGED) - (previous == FLAGGED)
+        else:
+            self.hidden_safe_cells += (state == HIDDEN) - (previous == HIDDEN)
+        chunk.state[index] = state
+        self.cells_changed((row * self.width + col,))
+
+    def get_row(self, row: int, board="player_board") -> list:
+        """
+        Returns the values of a whole row in a given board.
+
+        Args:
+        row (int): The row number.
+        board (str): The name of the board ("player_board" or "default_board").
+
+        Returns:
+        list: The values of every cell in the row, from left to right.
+        """
+        if board not in ("player_board", "default_board"):
+            raise ValueError(
+                "Invalid board name. Must be 'player_board' or 'default_board'."
+            )
+
+        chunk_row, r = divmod(row, self.chunk_size)
+        values = []
+        for chunk_col in range(-(-self.width // self.chunk_size)):
+            chunk = self.chunk(chunk_row, chunk_col)
+            start = r * chunk.width
+            counts = chunk.counts[start : start + chunk.width]
+            states = chunk.state[start : start + chunk.width]
+            for count, state in zip(counts, states):
+                if board == "default_board" or state == REVEALED:
+                    values.append(CELL_CHARS[count])
+                elif state == HIDDEN:
+                    values.append("*")
+                else:
+                    values.append("F")
+        return values
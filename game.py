@@ -1,61 +1,255 @@
+from random import Random
+
 from board import Board
-from user_input import get_user_input
+from board_config import board_type_of
+from input_sources import CHORD, InteractiveInput
+from move_log import MoveLog
+from probability import OVERLAY_CHARS
 
 remove_flag_string = "Cell is flagged. [y]es to remove [n]o to cancel: "
 
 
 class Game:
-    def __init__(self, game_selection, games_played):
+    def __init__(
+        self,
+        game_selection,
+        games_played,
+        board_class=Board,
+        renderer=None,
+        log_path=None,
+        board=None,
+        start=None,
+        **board_options,
+    ):
         """
         Initialize a new game.
 
         Args:
             game_options (dict): A dictionary containing the options for the game.
                                 The keys are the names of the options and the values are the corresponding settings.
+            board_class (type, optional): The board implementation to play on, e.g. Board or ArrayBoard. Defaults to Board.
+            renderer (Renderer, optional): Shows the board and the game messages. Defaults to the board's TerminalRenderer.
+            log_path (str, optional): A file to stream the move log to. Defaults to None (in memory only).
+            board (Board, optional): A ready board to play on, e.g. from a BoardPool, instead of building one.
+                                     It should be seeded so that the game can be replayed. Defaults to None.
+            start (bytes, optional): The packed snapshot the board was restored from, recorded in the move log
+                                     so that the game is replayed from it. Defaults to None.
+            **board_options: Other options passed to the board, e.g. seed or first_click_safe.
+                             A random seed is picked when none is given, so that every game can be replayed.
 
         Attributes:
             game_options (dict): Stores the options for the game.
             games_played (int): Stores the number of games played. Initialized to 0.
             playing (bool): A flag indicating whether the game is currently being played. Initialized to True.
+            solver (Solver): Suggests moves for the hint command. Created on the first hint.
+            probabilities (ProbabilityEngine): Computes the heatmap command. Created on the first heatmap.
+            move_log (MoveLog): Records the seed of the board and every move played.
         """
         self.game_selection = game_selection
         self.games_played = games_played
         self.playing = True
-        self.board = Board(*self.game_selection)
+        if board is not None:
+            self.board = board
+            if renderer is not None:
+                board.renderer = renderer
+        else:
+            if board_options.get("seed") is None:
+                board_options["seed"] = Random().getrandbits(64)
+            self.board = board_class(
+                *self.game_selection, renderer=renderer, **board_options
+            )
+        self.renderer = self.board.renderer
+        self.solver = None
+        self.probabilities = None
+        settings = {"first_click_safe": self.board.first_click_safe}
+        if hasattr(self.board, "chunk_size"):
+            # The chunks of a ChunkedBoard are seeded one by one, so their size changes where mines go
+            settings["chunk_size"] = self.board.chunk_size
+        self.move_log = MoveLog(
+            *self.game_selection,
+            self.board.seed,
+            path=log_path,
+            board_type=board_type_of(type(self.board)),
+            start=start,
+            **settings,
+        )
 
     def print_game_state(self):
-        print("\nGame Number:", self.games_played)
-        print("\n")
-        print("Mines Remaining:", self.board.mines - len(self.board.flagged_cells))
-        print("\n")
+        self.renderer.message(f"\nGame Number: {self.games_played}")
+        self.renderer.message("\n")
+        self.renderer.message(f"Mines Remaining: {self.board.mines_remaining()}")
+        self.renderer.message("\n")
         self.board.draw_game_board()
 
-    def play_game(self):
+    def show_hint(self):
+        """
+        Shows the move suggested by the solver.
+        """
+        if self.solver is None:
+            # Imported here, as most games never ask for a hint
+            from solver import Solver
+
+            self.solver = Solver(self.board)
+
+        hint = self.solver.hint()
+        if hint is None:
+            self.renderer.message("No hint available.")
+            self.renderer.flush()
+            return
+
+        row, col, flag, probability = hint
+        if flag:
+            self.renderer.message(f"Hint: {row + 1} {col + 1} is a mine. Flag it.")
+        elif probability == 0:
+            self.renderer.message(f"Hint: {row + 1} {col + 1} is safe.")
+        else:
+            self.renderer.message(
+                f"Hint: no safe cell is certain. {row + 1} {col + 1} has a "
+                f"{probability:.0%} chance of hiding a mine."
+            )
+        self.renderer.flush()
+
+    def show_heatmap(self):
+        """
+        Draws the board with the chance of a mine on every hidden cell, as computed by the ProbabilityEngine.
+        """
+        if self.probabilities is None:
+            from probability import ProbabilityEngine
+
+            self.probabilities = ProbabilityEngine(self.board)
+
+        legend = ", ".join(
+            f"{char} {i * 10}-{i * 10 + 10}%" for i, char in enumerate(OVERLAY_CHARS)
+        )
+        self.renderer.message(f"Chance of a mine: {legend}")
+        self.board.draw_game_board(overlay=self.probabilities.overlay())
+        self.renderer.flush()
+
+    def play_game(self, source=None):
+        """
+        Plays moves until the game is over or the player quits.
+
+        Args:
+            source (InputSource, optional): Where to read the moves from. Defaults to InteractiveInput.
+        """
+        if source is None:
+            source = InteractiveInput()
+
         while self.playing:
             self.print_game_state()
-            row, col, flag = get_user_input()
+            move = source.next_move(self.show_hint, self.show_heatmap, self.renderer)
+            if isinstance(move, list):
+                self.play_batch(move)
+                continue
+
+            row, col, flag = move
             if row is None:
                 self.playing = False
                 break
 
-            if flag:
-                self.board.flag_mine(row - 1, col - 1)
-                if self.board.check_win():
-                    print("Congratulations! You've won the game.")
-                    self.playing = False
-                    self.board.draw_game_board(True)
-
-            elif (
-                row < 1 or row > self.board.height or col < 1 or col > self.board.width
+            if (
+                not flag
+                and self.in_bounds(row, col)
+                and self.board.get_cell_value(row - 1, col - 1) == "F"
             ):
-                print("Invalid input. Please enter valid row and column numbers.")
-                continue
+                if not source.confirm(remove_flag_string):
+                    continue
+
+            self.play_move(row, col, flag)
+
+        self.move_log.close()
+
+    def in_bounds(self, row: int, col: int) -> bool:
+        """
+        Checks that one-based row and column numbers are on the board.
+        """
+        return 1 <= row <= self.board.height and 1 <= col <= self.board.width
+
+    def play_move(self, row: int, col: int, flag: bool):
+        """
+        Plays one move and records it in the move log.
+
+        Revealing a flagged cell removes the flag; play_game asks the player to confirm first.
+        Moves outside of the board are rejected and not recorded.
+
+        Args:
+            row (int): The one-based row of the move.
+            col (int): The one-based column of the move.
+            flag (bool): True to flag the cell, False to reveal it, or CHORD to chord it (see play_batch).
+        """
+        if flag == CHORD:
+            self.play_batch([(row, col, flag)])
+            return
+
+        if not self.in_bounds(row, col):
+            self.renderer.message(
+                "Invalid input. Please enter valid row and column numbers."
+            )
+            return
+
+        self.move_log.append(row, col, flag)
+
+        if flag:
+            self.board.flag_mine(row - 1, col - 1)
+            if self.board.check_win():
+                self.renderer.message("Congratulations! You've won the game.")
+                self.playing = False
+                self.board.draw_game_board(True)
 
-            elif self.board.get_cell_value(row - 1, col - 1) == "F":
-                will_remove_flag = input(remove_flag_string).lower()
+        elif self.board.get_cell_value(row - 1, col - 1) == "F":
+            self.board.remove_flag(row - 1, col - 1)
 
-                if will_remove_flag in ["y", "yes"]:
-                    self.board.remove_flag(row - 1, col - 1)
+        else:
+            self.playing = self.board.reveal_cell(row - 1, col - 1)
+            if self.playing and self.board.check_win():
+                self.renderer.message("Congratulations! You've won the game.")
+                self.playing = False
+                self.board.draw_game_board(True)
+
+    def play_batch(self, moves):
+        """
+        Plays many moves at once and records them in the move log as one batch.
+
+        The batch is all or nothing: if any move is outside of the board, none is played. Flags are
+        placed first. Then the cells to reveal, and the cells revealed by chords, are revealed in one
+        pass with Board.uncover_many, followed by a single win check. Revealing a flagged cell in a
+        batch leaves the flag in place. A chord on a revealed number whose flags match the number
+        reveals its other hidden neighbors, and does nothing otherwise.
+
+        Args:
+            moves (list): The (row, col, flag) moves, one-based, with flag True, False or CHORD.
+        """
+        if not all(self.in_bounds(row, col) for row, col, _ in moves):
+            self.renderer.message(
+                "Invalid input. Please enter valid row and column numbers."
+            )
+            return
+
+        self.move_log.append_batch(moves)
+        board = self.board
+
+        for row, col, flag in moves:
+            if flag is True:
+                board.place_flag(row - 1, col - 1)
+
+        cells = []
+        for row, col, flag in moves:
+            if flag is False:
+                cells.append((row - 1, col - 1))
+            elif flag == CHORD:
+                cells.extend(board.chord_cells(row - 1, col - 1))
+
+        if cells:
+            board.protect_first_click(*cells[0])
+            if not board.uncover_many(cells):
+                self.renderer.message("You hit a mine!\nGame Over.")
+                self.playing = False
+                board.draw_game_board(True)
+                return
 
-            else:
-                self.playing = self.board.reveal_cell(row - 1, col - 1)
+        if board.check_win():
+            self.renderer.message("Congratulations! You've won the game.")
+            self.playing = False
+            board.draw_game_board(True)
+        elif cells:
+            self.renderer.message("Safe move.")
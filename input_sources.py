@@ -0,0 +1,266 @@
+from abc import ABC, abstractmethod
+from collections import deque
+
+from messages import instructions_text
+from renderer import TerminalRenderer
+
+move_prompt = "\nEnter the row and column to reveal (and optional flag): "
+quit_prompt = "Are you sure you want to quit? [y]es or [n]o: "
+
+
+# The flag value of a chord move
+CHORD = "chord"
+
+
+def parse_move(text: str):
+    """
+    Parses a move in the form 'row col flag (optional)', or a batch of moves.
+
+    'row' and 'col' are integers, and 'flag' is an optional third part that should be 'f' or 'flag'
+    to flag the cell, or 'c' or 'chord' to reveal the hidden neighbors of a satisfied number.
+    A batch lists more than one cell, as 'r1 c1 r2 c2 ... flag (optional)', and applies the same
+    action to every cell. Whether the rows and columns are on the board is left to the game.
+
+    Args:
+        text (str): The text entered by the player.
+
+    Raises:
+        ValueError: If the text is not a move. The message tells the player what is wrong.
+
+    Returns:
+        tuple: A tuple containing the row and column as integers, and True to flag the cell, False to reveal it
+               or CHORD to chord it. A batch is returned as a list of such tuples.
+    """
+    parts = text.split()
+
+    # Check if the input has 2 or 3 parts, or is a batch
+    if len(parts) < 2:
+        raise ValueError("Invalid input. Please enter 'row col flag (optional)'.")
+
+    # Check if the last part (if it is not a number) is 'flag' or 'chord'
+    flag = False
+    if len(parts) % 2 == 1:
+        action = parts.pop().lower()
+        if action in ["f", "flag"]:
+            flag = True
+        elif action in ["c", "chord"]:
+            flag = CHORD
+        else:
+            raise ValueError(
+                "Invalid input. The third part should be 'f' for 'flag' or 'c' for 'chord'."
+            )
+
+    # Check if the other parts are integers
+    try:
+        numbers = list(map(int, parts))
+    except ValueError:
+        raise ValueError("Invalid input. 'row' and 'col' should be integers.")
+
+    if len(numbers) == 2:
+        return numbers[0], numbers[1], flag
+    return [(row, col, flag) for row, col in zip(numbers[0::2], numbers[1::2])]
+
+
+class InputSource(ABC):
+    """
+    Where a game reads its moves and answers from.
+
+    Subclasses provide read_line; the command grammar is shared by all of them. A source never sleeps
+    and never runs shell commands, so scripted games run as fast as the board allows. What a command
+    has to say, e.g. the instructions or why a line is not a move, goes to the game's renderer.
+    """
+
+    @abstractmethod
+    def read_line(self, prompt: str):
+        """
+        Returns the next line of input, or None when there is no more input.
+
+        Args:
+            prompt (str): The prompt to show, for sources read by a person.
+        """
+
+    def confirm(self, prompt: str) -> bool:
+        """
+        Asks a yes or no question, e.g. before removing a flag.
+
+        Returns:
+            bool: True if the answer is yes.
+        """
+        answer = self.read_line(prompt)
+        return answer is not None and answer.lower() in ["y", "yes"]
+
+    def next_move(self, on_hint=None, on_heatmap=None, renderer=None):
+        """
+        Reads lines until one holds a valid move.
+
+        The commands of get_user_input are handled on the way:
+        - 'help' or 'h': Prints the game instructions.
+        - 'hint': Calls on_hint, if given, to show a suggested move.
+        - 'heatmap': Calls on_heatmap, if given, to show the chance of a mine on every cell.
+        - 'quit' or 'q': Asks for confirmation and quits the game if confirmed.
+
+        Args:
+            on_hint (callable, optional): Called with no arguments when a hint is asked for. Defaults to None.
+            on_heatmap (callable, optional): Called with no arguments when a heatmap is asked for. Defaults to None.
+            renderer (Renderer, optional): Shows the instructions and the errors. Defaults to a TerminalRenderer.
+
+        Returns:
+            tuple: (row, col, flag) with one-based row and column, or (None, None, False) to quit.
+                   The source running out of input quits as well. A batch is returned as a list of moves.
+        """
+        while True:
+            text = self.read_line(move_prompt)
+            if text is None:
+                return None, None, False
+            move = self.handle(text, on_hint, on_heatmap, renderer)
+            if move is not None:
+                return move
+
+    def handle(self, text: str, on_hint=None, on_heatmap=None, renderer=None):
+        """
+        Runs a command, or parses a move.
+
+        Args:
+            text (str): The line to handle.
+            on_hint (callable, optional): Called with no arguments when a hint is asked for. Defaults to None.
+            on_heatmap (callable, optional): Called with no arguments when a heatmap is asked for. Defaults to None.
+            renderer (Renderer, optional): Shows the instructions and the errors. Defaults to a TerminalRenderer.
+
+        Returns:
+            tuple: The move, (None, None, False) to quit, or None if the line held no move.
+        """
+        if renderer is None:
+            renderer = TerminalRenderer()
+
+        command = text.strip().lower()
+        if command in ["help", "h"]:
+            renderer.message(instructions_text())
+            renderer.flush()
+            return None
+        elif command == "hint" and on_hint is not None:
+            on_hint()
+            return None
+        elif command == "heatmap" and on_heatmap is not None:
+            on_heatmap()
+            return None
+        elif command in ["quit", "q"]:
+            if self.confirm(quit_prompt):
+                renderer.message("Thanks for playing!")
+                renderer.flush()
+                return None, None, False
+            return None
+
+        try:
+            return parse_move(text)
+        except ValueError as error:
+            renderer.message(str(error))
+            renderer.flush()
+            return None
+
+
+class InteractiveInput(InputSource):
+    """
+    Reads from the player at the terminal with input().
+    """
+
+    def read_line(self, prompt: str):
+        """
+        Prompts the player for a line. Ctrl + C exits the game; the end of input returns None.
+        """
+        try:
+            return input(prompt)
+        except EOFError:
+            return None
+        except KeyboardInterrupt:
+            print("\nGame interrupted by user. Exiting the game...")
+            exit()
+
+
+class StreamInput(InputSource):
+    def __init__(self, stream):
+        """
+        Initializes a source that reads a whole stream of moves at once, e.g. piped stdin or a file.
+
+        Every line is parsed up front, so playing the moves afterwards costs no parsing at all.
+        Blank lines are skipped. A yes or no question takes the next line if it is an answer,
+        and counts as yes otherwise: scripted moves mean what they say.
+
+        Args:
+            stream (file or str): The stream to read, or its text.
+
+        Attributes:
+            entries (deque): (line, move) for every line not read yet; move is None for lines that hold no move.
+        """
+        text = stream if isinstance(stream, str) else stream.read()
+        self.entries = deque()
+        for line in text.splitlines():
+            if not line.strip():
+                continue
+            try:
+                move = parse_move(line)
+            except ValueError:
+                move = None
+            self.entries.append((line, move))
+
+    def read_line(self, prompt: str):
+        if not self.entries:
+            return None
+        return self.entries.popleft()[0]
+
+    def confirm(self, prompt: str) -> bool:
+        if self.entries:
+            answer = self.entries[0][0].strip().lower()
+            if answer in ["y", "yes", "n", "no"]:
+                self.entries.popleft()
+                return answer in ["y", "yes"]
+        return True
+
+    def next_move(self, on_hint=None, on_heatmap=None, renderer=None):
+        while self.entries:
+            text, move = self.entries.popleft()
+            if move is None:
+                move = self.handle(text, on_hint, on_heatmap, renderer)
+            if move is not None:
+                return move
+        return None, None, False
+
+
+class IteratorInput(InputSource):
+    def __init__(self, items):
+        """
+        Initializes a source that takes moves from an iterable, e.g. a generator computing them as the game goes.
+
+        Items are either lines of text, read like typed input, (row, col, flag) tuples with
+        one-based row and column, played as they are, or lists of such tuples, played as a batch.
+        Yes or no questions are answered yes.
+
+        Args:
+            items (iterable): The lines and moves to play.
+
+        Attributes:
+            items (iterator): The lines and moves not read yet.
+        """
+        self.items = iter(items)
+
+    def read_line(self, prompt: str):
+        item = next(self.items, None)
+        if item is None or isinstance(item, str):
+            return item
+        moves = item if isinstance(item, list) else [item]
+        suffix = {False: "", True: " f", CHORD: " c"}[moves[0][2]]
+        return " ".join(f"{row} {col}" for row, col, _ in moves) + suffix
+
+    def confirm(self, prompt: str) -> bool:
+        return True
+
+    def next_move(self, on_hint=None, on_heatmap=None, renderer=None):
+        for item in self.items:
+            if isinstance(item, str):
+                move = self.handle(item, on_hint, on_heatmap, renderer)
+            elif isinstance(item, list):
+                move = [tuple(cell) for cell in item]
+            else:
+                move = tuple(item)
+            if move is not None:
+                return move
+        return None, None, False
@@ -0,0 +1,296 @@
+"""
+Opt-in instrumentation of boards and games.
+
+Nothing here runs unless an Instrumentation is attached: it replaces the instrumented methods of a
+single board or game with timed wrappers, so boards and games that are not attached run the exact
+same code as before.
+"""
+
+import json
+import sys
+from functools import partial
+from time import perf_counter
+
+# Board methods timed by attach_board, by timer name
+BOARD_METHODS = {
+    "reveal_cell": "reveal_cell",
+    "dfs": "dfs",
+    "check_win": "check_win",
+    "flag_mine": "flag_mine",
+    "remove_flag": "remove_flag",
+    "initialize_default_board": "generate",
+    "draw_game_board": "draw_game_board",
+}
+
+
+class Timer:
+    """
+    Call count, total, extremes and a latency histogram of one timed operation.
+
+    The histogram counts calls by power-of-two buckets of microseconds: bucket "<N" holds the calls
+    that took less than N microseconds and at least N / 2.
+
+    Attributes:
+        calls (int): The number of calls.
+        total (float): The total time, in seconds.
+        min (float): The fastest call, in seconds.
+        max (float): The slowest call, in seconds.
+        histogram (dict): The number of calls by bucket upper bound in microseconds.
+    """
+
+    def __init__(self):
+        self.calls = 0
+        self.total = 0.0
+        self.min = float("inf")
+        self.max = 0.0
+        self.histogram = {}
+
+    def record(self, seconds: float):
+        self.calls += 1
+        self.total += seconds
+        self.min = min(self.min, seconds)
+        self.max = max(self.max, seconds)
+        bound = 1 << int(seconds * 1e6).bit_length()
+        self.histogram[bound] = self.histogram.get(bound, 0) + 1
+
+    def summary(self) -> dict:
+        return {
+            "calls": self.calls,
+            "seconds_total": self.total,
+            "seconds_mean": self.total / self.calls if self.calls else 0.0,
+            "seconds_min": self.min if self.calls else 0.0,
+            "seconds_max": self.max,
+            "histogram_us": {
+                f"<{bound}": count for bound, count in sorted(self.histogram.items())
+            },
+        }
+
+
+class TrackedStack(list):
+    """
+    A DFS stack that counts its pops and records its largest size.
+
+    A pop may hand out a cell that is already revealed; the cells the DFS actually reveals are
+    counted by attach_board as dfs_cells_revealed.
+    """
+
+    def __init__(self, instrumentation, items=()):
+        super().__init__(items)
+        self.instrumentation = instrumentation
+        self.high_water = len(self)
+
+    def append(self, item):
+        super().append(item)
+        if len(self) > self.high_water:
+            self.high_water = len(self)
+            counters = self.instrumentation.counters
+            if self.high_water > counters.get("dfs_stack_high_water", 0):
+                counters["dfs_stack_high_water"] = self.high_water
+
+    def pop(self, *args):
+        self.instrumentation.count("dfs_stack_pops")
+        return super().pop(*args)
+
+
+class Instrumentation:
+    def __init__(self):
+        """
+        Initializes empty counters and timers.
+
+        Attributes:
+            counters (dict): Event counts by name, e.g. cascade_cells_revealed.
+            timers (dict): A Timer by operation name, e.g. move or dfs.
+        """
+        self.counters = {}
+        self.timers = {}
+
+    def count(self, name: str, amount=1):
+        """
+        Adds to a counter.
+        """
+        self.counters[name] = self.counters.get(name, 0) + amount
+
+    def record(self, name: str, seconds: float):
+        """
+        Records the duration of one call of a timed operation.
+        """
+        timer = self.timers.get(name)
+        if timer is None:
+            timer = self.timers[name] = Timer()
+        timer.record(seconds)
+
+    def wrap(self, target, method: str, name=None):
+        """
+        Times every call of a method of one object, by replacing it with a wrapper on that object only.
+
+        Calls the object makes to itself go through the wrapper as well.
+
+        Args:
+            target (object): The board or game to instrument.
+            method (str): The name of the method.
+            name (str, optional): The name of the timer. Defaults to the method name.
+        """
+        function = getattr(target, method)
+        name = name or method
+
+        def timed(*args, **kwargs):
+            start = perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                self.record(name, perf_counter() - start)
+
+        setattr(target, method, timed)
+
+    def attach_board(self, board):
+        """
+        Instruments a board: times the methods of BOARD_METHODS and the reveals of its cascade engine,
+        and counts the cells that changed, the cells revealed by the cascade engine, whether it uses
+        the DFS or not, the cells revealed by the DFS, and the pops and largest size of the DFS stack.
+        """
+        for method, name in BOARD_METHODS.items():
+            self.wrap(board, method, name)
+        self.wrap(board.cascade, "reveal", "cascade")
+        board.dfs_stack = partial(TrackedStack, self)
+
+        # The counters of the reveals in progress; a cascade may run the DFS
+        revealing = []
+
+        def revealer(function, name):
+            def tracked(*args, **kwargs):
+                revealing.append(name)
+                try:
+                    return function(*args, **kwargs)
+                finally:
+                    revealing.pop()
+
+            return tracked
+
+        board.cascade.reveal = revealer(board.cascade.reveal, "cascade_cells_revealed")
+        board.dfs = revealer(board.dfs, "dfs_cells_revealed")
+
+        cells_changed = board.cells_changed
+
+        def counted(cells):
+            self.count("cells_changed", len(cells))
+            for name in revealing:
+                self.count(name, len(cells))
+            cells_changed(cells)
+
+        board.cells_changed = counted
+
+    def wrap_moves(self, game):
+        """
+        Times every move of a game as "move": every call of play_move, and every batch of moves played
+        with play_batch. A chord, which play_move plays as a batch of one, is timed once.
+
+        Args:
+            game (Game): The game to instrument.
+        """
+        depth = 0
+
+        def timing(function):
+            def timed(*args, **kwargs):
+                nonlocal depth
+                depth += 1
+                start = perf_counter()
+                try:
+                    return function(*args, **kwargs)
+                finally:
+                    depth -= 1
+                    if not depth:
+                        self.record("move", perf_counter() - start)
+
+            return timed
+
+        game.play_move = timing(game.play_move)
+        game.play_batch = timing(game.play_batch)
+
+    def attach_game(self, game):
+        """
+        Instruments a game and its board. Every move is timed as "move", see wrap_moves.
+        """
+        self.attach_board(game.board)
+        self.wrap_moves(game)
+
+    def board_class(self, board_class):
+        """
+        Returns a board factory, to use as Game's board_class, that times the construction of every
+        board as "board_init" and instruments it.
+        """
+
+        def build(*args, **kwargs):
+            start = perf_counter()
+            board = board_class(*args, **kwargs)
+            self.record("board_init", perf_counter() - start)
+            self.attach_board(board)
+            return board
+
+        return build
+
+    def stats(self) -> dict:
+        """
+        Returns the counters and a summary of every timer.
+        """
+        return {
+            "counters": dict(self.counters),
+            "timers": {name: timer.summary() for name, timer in self.timers.items()},
+        }
+
+    def export(self, path):
+        """
+        Writes stats() to a JSON file.
+        """
+        with open(path, "w") as file:
+            json.dump(self.stats(), file, indent=2)
+
+
+def profile_call(function, *args, output=None, **kwargs):
+    """
+    Runs a function under cProfile.
+
+    Args:
+        function (callable): The function to profile.
+        *args: Its positional arguments.
+        output (str, optional): A file to dump the profile to, for pstats or snakeviz. Defaults to None,
+                                which prints the 25 most expensive calls to stderr.
+        **kwargs: Its keyword arguments.
+
+    Returns:
+        The value returned by the function.
+    """
+    # Imported here, as profiling is rare and pstats is slow to import
+    import cProfile
+    import pstats
+
+    profiler = cProfile.Profile()
+    try:
+        return profiler.runcall(function, *args, **kwargs)
+    finally:
+        if output is not None:
+            profiler.dump_stats(output)
+        else:
+            stats = pstats.Stats(profiler, stream=sys.stderr)
+            stats.sort_stats("cumulative").print_stats(25)
+
+
+def profile_move(game, number: int, output=None):
+    """
+    Profiles one move of a game with profile_call.
+
+    Args:
+        game (Game): The game to profile.
+        number (int): The one-based number of the move to profile.
+        output (str, optional): A file to dump the profile to. Defaults to None (print to stderr).
+    """
+    play_move = game.play_move
+    moves = 0
+
+    def counted(*args, **kwargs):
+        nonlocal moves
+        moves += 1
+        if moves == number:
+            return profile_call(play_move, *args, output=output, **kwargs)
+        return play_move(*args, **kwargs)
+
+    game.play_move = counted
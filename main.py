@@ -1,4 +1,9 @@
+import sys
+
+from board_config import BOARD_TYPES, board_class_named
+from board_pool import BoardPool
 from game import Game
+from input_sources import InteractiveInput, StreamInput
 from messages import print_greeting, print_instructions, play_again
 from user_input import start_game
 
@@ -22,41 +27,274 @@ game_options = {
 }
 
 
-def main():
+def main(
+    source=None,
+    stats_path=None,
+    profile=None,
+    profile_output=None,
+    preset=None,
+    seed=None,
+    headless=False,
+    quiet=False,
+    board_type="auto",
+    no_guess=False,
+    diff_redraw=False,
+):
     """
     This is the main function for the game. It handles the game loop and user interactions.
 
     The function first prints a greeting and instructions for the game. Then, it enters a loop
     where it continuously starts new games until the user decides to quit.
 
+    Scripted and batch runs can skip everything interactive: with a preset the game mode menu is not
+    shown, quiet skips the greeting and the instructions (so pyfiglet is never imported), and headless
+    plays without drawing the board, printing one line per game instead.
+
     In each iteration of the loop, the function does the following:
-    1. Starts a new game based on the user's selection.
+    1. Starts a new game based on the user's selection, or on the preset.
     2. Creates a new Game instance with the selected game options.
+       Boards come from a BoardPool, which generates the next one while the current game is played.
     3. Enters a nested loop where it continuously plays the game until the game is over.
     4. After the game is over, it increments the games_played counter.
     5. Asks the user if they want to play again. If the user decides to quit, it breaks the loop.
 
     Finally, it prints a farewell message and the program ends.
+
+    Args:
+        source (InputSource, optional): Where to read the player's input from. Defaults to InteractiveInput
+                                        at a terminal, and to a StreamInput of everything piped to stdin otherwise.
+        stats_path (str, optional): Instruments every game and writes the stats to this JSON file when the
+                                    session ends. Defaults to None (no instrumentation).
+        profile (optional): "game" to run every game under cProfile, or the number of a move to profile
+                            in every game. Defaults to None.
+        profile_output (str, optional): A file to dump the profile to. Defaults to None (print to stderr).
+        preset (optional): The game mode to play, a key of game_options, or the (width, height, mines) of a
+                           custom board, see board_config.custom_options. Defaults to None, which asks the player.
+        seed (int, optional): The seed of the sequence of boards, to play the same games again. Defaults to None.
+        headless (bool, optional): If True, the board and the game messages are not shown, and the result of
+                                   every game is printed as one line. Defaults to False.
+        quiet (bool, optional): If True, the greeting, the instructions and the farewell are not printed.
+                                Defaults to False.
+        board_type (str, optional): The board implementation, one of board_config.BOARD_TYPES. Defaults to "auto",
+                                    which picks the one best suited to the board size.
+        no_guess (bool, optional): If True, every board can be solved without guessing, see no_guess.py. The game
+                                   starts with the board's opening revealed. Defaults to False.
+        diff_redraw (bool, optional): If True, the board is drawn by a DiffRenderer, which only rewrites the cells
+                                      that changed after the first frame. Needs a terminal that understands ANSI
+                                      escape sequences. Defaults to False.
     """
+    if source is None:
+        source = InteractiveInput() if sys.stdin.isatty() else StreamInput(sys.stdin)
+
+    # The modules of optional modes are imported in their branches, so that a plain game starts faster
+    instrumentation = None
+    if stats_path or profile is not None:
+        from instrumentation import Instrumentation, profile_call, profile_move
+
+        if stats_path:
+            instrumentation = Instrumentation()
+    board_options = {}
+    if headless:
+        from renderer import NullRenderer
+
+        board_options["renderer"] = NullRenderer()
+    elif diff_redraw:
+        from renderer import DiffRenderer
+
+        board_options["renderer"] = DiffRenderer()
+
     games_played = 1
 
-    print_greeting()
-    print_instructions()
+    if not quiet and not headless:
+        print_greeting()
+        print_instructions()
+
+    game_selection = preset or start_game(source)
+    if isinstance(game_selection, str):
+        game_selection = game_options[game_selection]
 
-    game_selection = start_game()
+    board_class = board_class_named(board_type, *game_selection[:2])
+    if no_guess:
+        # Imported here, as it starts a process pool and most games do not need it
+        from no_guess import no_guess_seeds, opening_cell
+
+        board_options["first_click_safe"] = True
+        board_options["seeds"] = no_guess_seeds(
+            *game_selection, seed=seed, board_class=board_class
+        )
+    if instrumentation:
+        board_class = instrumentation.board_class(board_class)
+    pool = BoardPool(
+        *game_selection,
+        seed=seed,
+        board_class=board_class,
+        **board_options,
+    )
 
     while True:
-        game = Game(game_options[game_selection], games_played)
+        board = pool.acquire()
+        game = Game(game_selection, games_played, board=board)
+        if instrumentation:
+            instrumentation.wrap_moves(game)
+        if isinstance(profile, int):
+            profile_move(game, profile, profile_output)
+        if no_guess:
+            row, col = opening_cell(board.width, board.height)
+            game.play_move(row + 1, col + 1, False)
 
         while game.playing:
             games_played += 1
-            game.play_game()
+            if profile == "game":
+                profile_call(game.play_game, source, output=profile_output)
+            else:
+                game.play_game(source)
 
-        if not play_again():
+        if headless:
+            result = "won" if board.check_win() else "not won"
+            print(
+                f"Game {game.games_played}: {result} after {len(game.move_log)} moves, seed {board.seed}"
+            )
+        pool.release(board)
+        if not play_again(source):
             break
 
-    print("Thanks for playing!")
+    pool.close()
+    if not quiet:
+        print("Thanks for playing!")
+    if instrumentation:
+        instrumentation.export(stats_path)
+
+
+def parse_args(argv=None):
+    """
+    Parses the command line of main.py.
+
+    A custom size, or --mines or --density with a preset, is turned into the (width, height, mines) of a
+    custom board and validated; invalid combinations exit with a usage error.
+
+    Args:
+        argv (list, optional): The arguments to parse. Defaults to None, which parses sys.argv.
+
+    Returns:
+        argparse.Namespace: The arguments. preset is the name of a game mode, the (width, height, mines)
+                            of a custom board, or None to ask the player.
+    """
+    import argparse
+
+    from board_config import custom_options
+
+    parser = argparse.ArgumentParser(description="Play Minesweeper in the terminal.")
+    parser.add_argument(
+        "--stats", metavar="FILE", help="write timing stats to this JSON file"
+    )
+    profile = parser.add_mutually_exclusive_group()
+    profile.add_argument(
+        "--profile-game", action="store_true", help="run each game under cProfile"
+    )
+    profile.add_argument(
+        "--profile-move",
+        type=int,
+        metavar="N",
+        help="run move N of each game under cProfile",
+    )
+    parser.add_argument(
+        "--profile-output",
+        metavar="FILE",
+        help="dump the profile to this file instead of printing it",
+    )
+    parser.add_argument(
+        "--preset",
+        choices=list(game_options),
+        help="play this game mode instead of asking",
+    )
+    parser.add_argument(
+        "--seed", type=int, help="seed the boards, to play the same games again"
+    )
+    parser.add_argument(
+        "--headless",
+        action="store_true",
+        help="do not show the board, print the result of each game",
+    )
+    parser.add_argument(
+        "--diff-redraw",
+        action="store_true",
+        help="only redraw the cells that changed, with ANSI escape sequences",
+    )
+    parser.add_argument(
+        "--quiet",
+        action="store_true",
+        help="do not print the greeting, the instructions or the farewell",
+    )
+    custom = parser.add_argument_group(
+        "custom board",
+        "play a board of any size instead of a preset, or change the mines of a preset",
+    )
+    custom.add_argument("--width", type=int, help="the number of columns")
+    custom.add_argument("--height", type=int, help="the number of rows")
+    density = custom.add_mutually_exclusive_group()
+    density.add_argument("--mines", type=int, help="the number of mines")
+    density.add_argument(
+        "--density", type=float, help="the fraction of the cells holding a mine"
+    )
+    parser.add_argument(
+        "--no-guess",
+        action="store_true",
+        help="only play boards that can be solved without guessing",
+    )
+    parser.add_argument(
+        "--board",
+        choices=BOARD_TYPES,
+        default="auto",
+        help="the board implementation; auto picks one by board size",
+    )
+    args = parser.parse_args(argv)
+
+    preset = args.preset
+    if args.width is not None or args.height is not None:
+        if args.preset:
+            parser.error("--preset cannot be combined with a custom board")
+        if args.width is None or args.height is None:
+            parser.error("a custom board needs both --width and --height")
+        try:
+            preset = custom_options(
+                args.width,
+                args.height,
+                args.mines,
+                args.density,
+                board_class_named(args.board, args.width, args.height),
+            )
+        except ValueError as error:
+            parser.error(str(error))
+    elif args.mines is not None or args.density is not None:
+        if not args.preset:
+            parser.error("--mines and --density need --preset, or --width and --height")
+        width, height, _ = game_options[args.preset]
+        try:
+            preset = custom_options(
+                width,
+                height,
+                args.mines,
+                args.density,
+                board_class_named(args.board, width, height),
+            )
+        except ValueError as error:
+            parser.error(str(error))
+
+    args.preset = preset
+    return args
 
 
 if __name__ == "__main__":
-    main()
+    args = parse_args()
+    main(
+        stats_path=args.stats,
+        preset=args.preset,
+        seed=args.seed,
+        headless=args.headless,
+        quiet=args.quiet,
+        profile="game" if args.profile_game else args.profile_move,
+        profile_output=args.profile_output,
+        board_type=args.board,
+        no_guess=args.no_guess,
+        diff_redraw=args.diff_redraw,
+    )
@@ -1,4 +1,60 @@
-from pyfiglet import figlet_format
+import os
+
+
+def cache_dir() -> str:
+    """
+    Returns the directory the game caches files in, e.g. rendered banners: $XDG_CACHE_HOME/minesweeper, or ~/.cache/minesweeper.
+    """
+    cache_home = os.environ.get("XDG_CACHE_HOME") or os.path.join(
+        os.path.expanduser("~"), ".cache"
+    )
+    return os.path.join(cache_home, "minesweeper")
+
+
+def render_banner(text: str, font="speed") -> str:
+    """
+    Renders text in large letters with pyfiglet.
+
+    pyfiglet is only imported when a banner is actually rendered, since loading it and its font
+    takes longer than starting the rest of the game. Every rendered banner is cached on disk, in one
+    file per font and text, so later runs read it back without importing pyfiglet at all.
+    Without pyfiglet, the text is returned as it is.
+
+    Args:
+        text (str): The text to render.
+        font (str, optional): The pyfiglet font. Defaults to "speed".
+
+    Returns:
+        str: The rendered banner.
+    """
+    # Imported here, as only the greeting renders banners and hashlib is slow to import
+    import hashlib
+
+    digest = hashlib.sha1(text.encode()).hexdigest()[:12]
+    path = os.path.join(cache_dir(), f"banner-{font}-{digest}.txt")
+    try:
+        with open(path, encoding="utf-8") as file:
+            return file.read()
+    except OSError:
+        pass
+
+    try:
+        from pyfiglet import figlet_format
+    except ImportError:
+        return text + "\n"
+
+    banner = figlet_format(text, font=font)
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Write to a temporary file first, so that a concurrent run never reads half a banner
+        temporary = f"{path}.{os.getpid()}.tmp"
+        with open(temporary, "w", encoding="utf-8") as file:
+            file.write(banner)
+        os.replace(temporary, path)
+    except OSError:
+        # The cache is an optimization only; a read-only home directory is fine
+        pass
+    return banner
 
 
 def print_greeting():
@@ -6,8 +62,9 @@ def print_greeting():
     Prints the welcome message for the game.
 
     It displays the available game modes, their board sizes, and the number of mines in each mode.
+    The banner is rendered by render_banner.
     """
-    print(figlet_format("    Minesweeper", font="speed"))
+    print(render_banner("    Minesweeper", font="speed"))
     print(f"{' ':<4}Game Options: \n")
     print(f"{' ':<4}{'Difficulty':<13} {'Size':<9} {'Mines':<15}")
     print(f"{' ':<4}{'-' * 30}")
@@ -16,36 +73,52 @@ def print_greeting():
     print(f"{' ':<4}{'Expert':<13} {'16x30':<10} {'99':<15}\n")
 
 
-def print_instructions():
-    """
-    Prints the instructions for the Minesweeper game.
-
-    The instructions include how to reveal a cell, how to flag a cell, how to remove a flag from a cell,
-    how to exit the game, and how to display the instructions again.
-
-    """
-    instructions = """
+instructions = """
     To play the game, enter the row and column of the cell you want to reveal.
     For example, to reveal the cell in the first row and second column, enter '1 2'.\n
     You can also flag a cell by adding 'f' after the row and column numbers.
     For example, to flag the cell in the first row and second column, enter '1 2 f'.
     To remove a flag, enter the row and column of the flagged cell and choose 'y' to remove the flag.
+    To reveal every other neighbor of a number once all its mines are flagged, add 'c' for chord, e.g. '3 4 c'.
+    To play several cells at once, list them before the optional 'f' or 'c', e.g. '1 2 1 3 2 2 f'.
+    To get a suggested move, enter hint.
+    To see the chance of a mine on every hidden cell, enter heatmap.
 
     To exit the game at any time, press 'Ctrl + C'.\n
     To show these instructions again enter help.
 
     Let's play Minesweeper!
     """
-    print(f"{' ':<4}Instructions:\n")
-    print(instructions)
 
 
-def play_again():
+def instructions_text() -> str:
+    """
+    Returns the instructions for the Minesweeper game, as print_instructions prints them.
+    """
+    return f"{' ':<4}Instructions:\n\n{instructions}"
+
+
+def print_instructions():
+    """
+    Prints the instructions for the Minesweeper game.
+
+    The instructions include how to reveal a cell, how to flag a cell, how to remove a flag from a cell,
+    how to exit the game, and how to display the instructions again.
+
+    """
+    print(instructions_text())
+
+
+def play_again(source=None):
     """
     Asks the user if they want to play again.
 
+    Args:
+        source (InputSource, optional): Where to read the answer from. Defaults to input().
+
     Returns:
         bool: True if the user wants to play again, False otherwise.
     """
-    play_again = input("Would you like to play again? [Y]es or [N]o: ")
-    return play_again.lower() == "y"
+    prompt = "Would you like to play again? [Y]es or [N]o: "
+    play_again = source.read_line(prompt) if source is not None else input(prompt)
+    return (play_again or "").lower() == "y"
@@ -0,0 +1,165 @@
+import json
+
+
+class MoveLog:
+    def __init__(
+        self,
+        width: int,
+        height: int,
+        mines: int,
+        seed,
+        path=None,
+        board_type="list",
+        start=None,
+        **settings,
+    ):
+        """
+        Initializes a log of the moves of one game.
+
+        The log holds everything needed to play the game again: the board size, the number of mines,
+        the seed, the board implementation and the board settings that change where mines go, then
+        every move in order. A game loaded from a snapshot also holds the snapshot, since its moves
+        start from the saved board rather than from a new one.
+
+        If a path is given, the log is also streamed to that file as JSON lines: a header line, then
+        one [row, col, flag] line per move, flushed as soon as it is written. The file is only ever
+        appended to, so it survives a crash up to the last move.
+
+        Args:
+            width (int): The number of columns in the game board.
+            height (int): The number of rows in the game board.
+            mines (int): The number of mines on the game board.
+            seed (int): The seed of the board.
+            path (str, optional): The file to stream the log to. Defaults to None (in memory only).
+            board_type (str, optional): The board implementation, one of board_config.BOARD_TYPES except "auto".
+                                        The implementations place mines differently. Defaults to "list".
+            start (bytes, optional): The packed snapshot the game was loaded from. It is kept in the header
+                                     as base64. Defaults to None (a new board).
+            **settings: Other board options the game was created with, e.g. first_click_safe.
+
+        Attributes:
+            header (dict): The board size, number of mines, seed, board implementation and settings,
+                           and the base64 start snapshot of a loaded game.
+            start (bytes): The packed snapshot the game was loaded from, or None.
+            moves (list): The (row, col, flag) moves, one-based as entered by the player. A batch is
+                          recorded as one list of such moves.
+            file (file): The file the log is streamed to, or None.
+        """
+        self.header = {
+            "width": width,
+            "height": height,
+            "mines": mines,
+            "seed": seed,
+            "board_type": board_type,
+            **settings,
+        }
+        if start is not None:
+            # Imported here, as only games loaded from a snapshot need it
+            import base64
+
+            self.header["start"] = base64.b64encode(start).decode()
+        self.start = start
+        self.moves = []
+        self.file = None
+        if path is not None:
+            self.file = open(path, "a")
+            self.write(self.header)
+
+    def write(self, value):
+        """
+        Appends one JSON line to the log file.
+        """
+        self.file.write(json.dumps(value) + "\n")
+        self.file.flush()
+
+    def append(self, row: int, col: int, flag: bool):
+        """
+        Records a move.
+
+        Args:
+            row (int): The one-based row of the move.
+            col (int): The one-based column of the move.
+            flag (bool): True if the move flagged the cell.
+        """
+        self.moves.append((row, col, flag))
+        if self.file is not None:
+            self.write([row, col, flag])
+
+    def append_batch(self, moves):
+        """
+        Records a batch of moves, played together as one move.
+
+        Args:
+            moves (list): The (row, col, flag) moves of the batch, one-based.
+        """
+        moves = [tuple(move) for move in moves]
+        self.moves.append(moves)
+        if self.file is not None:
+            self.write([list(move) for move in moves])
+
+    def close(self):
+        """
+        Closes the log file, if any.
+        """
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+    def board_options(self) -> dict:
+        """
+        Returns the options that rebuild the board of the logged game.
+        """
+        return {
+            key: value
+            for key, value in self.header.items()
+            if key not in ("width", "height", "mines", "board_type", "start")
+        }
+
+    def board_class(self):
+        """
+        Returns the board implementation of the logged game.
+        """
+        from board_config import board_class_named
+
+        header = self.header
+        return board_class_named(
+            header["board_type"], header["width"], header["height"]
+        )
+
+    def __len__(self):
+        return len(self.moves)
+
+
+def read_move_log(path) -> MoveLog:
+    """
+    Reads a log file written by MoveLog.
+
+    A file may hold several games one after the other; the last one is read. A partly written last
+    line, left by a crash, is ignored.
+
+    Args:
+        path (str): The log file.
+
+    Returns:
+        MoveLog: The log, in memory only.
+    """
+    log = None
+    with open(path) as file:
+        for line in file:
+            try:
+                value = json.loads(line)
+            except json.JSONDecodeError:
+                break
+            if isinstance(value, dict):
+                if "start" in value:
+                    import base64
+
+                    value["start"] = base64.b64decode(value["start"])
+                log = MoveLog(**value)
+            elif log is not None and value and isinstance(value[0], list):
+                log.moves.append([tuple(move) for move in value])
+            elif log is not None:
+                log.moves.append(tuple(value))
+    if log is None:
+        raise ValueError(f"{path} holds no move log.")
+    return log
@@ -0,0 +1,346 @@
+"""
+No-guess boards: boards that can be solved from their opening by logic alone.
+
+A no-guess board is a first-click-safe board with a given seed, opened at opening_cell. Candidate seeds
+are drawn one after the other and each candidate is verified by playing it with the Solver, revealing
+only the cells it proves safe, until the board is won or the solver is stuck. Candidates are verified
+in parallel across a process pool.
+
+Accepted seeds are kept in an on-disk cache, one file per board configuration and implementation, so a
+game can start on a verified board at once and the search only runs when the cache is empty.
+"""
+
+import argparse
+import os
+from collections import deque
+from multiprocessing import Pool
+from random import Random
+
+from board import Board
+from board_config import BOARD_TYPES, board_class_named, board_type_of
+from main import game_options
+from messages import cache_dir
+from renderer import NullRenderer
+from solver import Solver
+
+
+def opening_cell(width: int, height: int):
+    """
+    Returns the (row, col) of the cell a no-guess board is opened at: the center of the board.
+    """
+    return height // 2, width // 2
+
+
+def is_solvable(width: int, height: int, mines: int, seed, board_class=Board) -> bool:
+    """
+    Checks that a board can be won from its opening without guessing.
+
+    The board is built first-click safe and opened at opening_cell, then every cell the solver proves
+    safe is revealed until the board is won or nothing more can be proven.
+
+    Args:
+        width (int): The number of columns in the game board.
+        height (int): The number of rows in the game board.
+        mines (int): The number of mines on the game board.
+        seed: The seed of the board.
+        board_class (type, optional): The board implementation to verify with. Defaults to Board.
+
+    Returns:
+        bool: True if the solver wins the board without guessing.
+    """
+    board = board_class(
+        width, height, mines, seed=seed, first_click_safe=True, renderer=NullRenderer()
+    )
+    if not board.uncover(*opening_cell(width, height)):
+        return False
+
+    solver = Solver(board)
+    while not board.check_win():
+        safe, _ = solver.solve()
+        if not safe:
+            return False
+        for row, col in safe:
+            board.uncover(row, col)
+    return True
+
+
+def _is_solvable_args(args) -> bool:
+    """
+    Unpacks a tuple of arguments for is_solvable, so it can be mapped over a process pool.
+    """
+    return is_solvable(*args)
+
+
+class SeedSearch:
+    def __init__(
+        self,
+        width: int,
+        height: int,
+        mines: int,
+        seed=None,
+        board_class=Board,
+        processes=None,
+        batch_size=None,
+        cache=None,
+    ):
+        """
+        Initializes an iterator over the seeds of no-guess boards, searching candidates in parallel.
+
+        Candidate seeds are drawn from a random number generator seeded with seed and verified a batch at
+        a time across a process pool. The solvable seeds are served in the order they were drawn, so a
+        seeded search always serves the same boards, whatever the number of processes.
+
+        With a cache, cached seeds are served first. A batch usually accepts more seeds than are asked for
+        at once; the ones not served yet when the search is closed are added to the cache.
+
+        The process pool is started here rather than at the first seed, so that the search can be created
+        in the main thread and read from another one, as BoardPool does: forking worker processes from a
+        background thread is not safe.
+
+        Args:
+            width (int): The number of columns in the game board.
+            height (int): The number of rows in the game board.
+            mines (int): The number of mines on the game board.
+            seed (optional): The seed of the sequence of candidates. Defaults to None (unseeded).
+            board_class (type, optional): The board implementation to verify with. It must be picklable. Defaults to Board.
+            processes (int, optional): The number of worker processes. Defaults to the number of CPUs.
+                                       Use 1 to verify every candidate in the current process.
+            batch_size (int, optional): The number of candidates verified at a time. Defaults to 8 per process.
+            cache (SeedCache, optional): The cache to serve seeds from and add accepted seeds to. Defaults to None.
+
+        Attributes:
+            board_class (type): The board implementation to verify with.
+            rng (random.Random): Draws the candidate seeds.
+            batch_size (int): The number of candidates verified at a time.
+            cache (SeedCache): The cache of the configuration, or None.
+            found (deque): Accepted seeds not served yet.
+            pool (multiprocessing.Pool): The worker processes, or None to verify in the current process.
+        """
+        processes = processes or os.cpu_count() or 1
+        self.width = width
+        self.height = height
+        self.mines = mines
+        self.board_class = board_class
+        self.rng = Random(seed)
+        self.batch_size = batch_size or 8 * processes
+        self.cache = cache
+        self.found = deque()
+        self.pool = Pool(processes) if processes > 1 else None
+
+    def next_batch(self) -> list:
+        """
+        Verifies one batch of candidates.
+
+        Returns:
+            list: The seeds of the batch that give no-guess boards, in the order they were drawn.
+        """
+        candidates = [self.rng.getrandbits(64) for _ in range(self.batch_size)]
+        jobs = [
+            (self.width, self.height, self.mines, candidate, self.board_class)
+            for candidate in candidates
+        ]
+        if self.pool is not None:
+            results = self.pool.map(_is_solvable_args, jobs)
+        else:
+            results = map(_is_solvable_args, jobs)
+        return [
+            candidate for candidate, solvable in zip(candidates, results) if solvable
+        ]
+
+    def __iter__(self):
+        return self
+
+    def __next__(self) -> int:
+        if self.cache is not None and not self.found:
+            seed = self.cache.take()
+            if seed is not None:
+                return seed
+        while not self.found:
+            self.found.extend(self.next_batch())
+        return self.found.popleft()
+
+    def close(self):
+        """
+        Stops the worker processes, and adds the accepted seeds that were not served to the cache.
+        """
+        if self.cache is not None and self.found:
+            try:
+                self.cache.add(self.found)
+            except OSError:
+                pass
+            self.found.clear()
+        if self.pool is not None:
+            self.pool.terminate()
+            self.pool = None
+
+
+def solvable_seeds(width: int, height: int, mines: int, **options) -> SeedSearch:
+    """
+    Returns an iterator over the seeds of newly searched no-guess boards, without using the cache.
+
+    Args:
+        width (int): The number of columns in the game board.
+        height (int): The number of rows in the game board.
+        mines (int): The number of mines on the game board.
+        **options: The options of SeedSearch, e.g. seed or processes.
+
+    Returns:
+        SeedSearch: The seeds. Close it to stop its worker processes.
+    """
+    return SeedSearch(width, height, mines, **options)
+
+
+class SeedCache:
+    def __init__(
+        self, width: int, height: int, mines: int, board_class=Board, directory=None
+    ):
+        """
+        Initializes the on-disk cache of no-guess seeds of one board configuration.
+
+        The seeds are stored one per line in a text file named after the configuration and the board
+        implementation, since the implementations place different mines from the same seed. Seeds are
+        taken from the front of the file, so every cached board is served once.
+
+        Args:
+            width (int): The number of columns in the game board.
+            height (int): The number of rows in the game board.
+            mines (int): The number of mines on the game board.
+            board_class (type, optional): The board implementation the seeds were verified with. Defaults to Board.
+            directory (str, optional): The directory of the cache files. Defaults to messages.cache_dir().
+
+        Attributes:
+            path (str): The file holding the seeds.
+        """
+        directory = directory or cache_dir()
+        board_type = board_type_of(board_class)
+        self.path = os.path.join(
+            directory, f"no-guess-{board_type}-{width}x{height}-{mines}.txt"
+        )
+
+    def load(self) -> list:
+        """
+        Returns the cached seeds, oldest first.
+        """
+        try:
+            with open(self.path) as file:
+                return [int(line) for line in file if line.strip()]
+        except (OSError, ValueError):
+            return []
+
+    def store(self, seeds):
+        """
+        Replaces the cached seeds. The file is replaced at once, so a concurrent reader never sees half of it.
+        """
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        temporary = f"{self.path}.{os.getpid()}.tmp"
+        with open(temporary, "w") as file:
+            file.writelines(f"{seed}\n" for seed in seeds)
+        os.replace(temporary, self.path)
+
+    def add(self, seeds):
+        """
+        Appends seeds to the cache.
+        """
+        self.store(self.load() + list(seeds))
+
+    def take(self):
+        """
+        Removes and returns the oldest cached seed, or None if the cache is empty.
+        """
+        seeds = self.load()
+        if not seeds:
+            return None
+        try:
+            self.store(seeds[1:])
+        except OSError:
+            # A read-only cache still serves its boards, only not once each
+            pass
+        return seeds[0]
+
+    def __len__(self) -> int:
+        return len(self.load())
+
+
+def fill_cache(
+    width: int, height: int, mines: int, count: int, board_class=Board, **options
+) -> int:
+    """
+    Searches no-guess boards until the cache of their configuration holds at least count seeds.
+
+    Args:
+        width (int): The number of columns in the game board.
+        height (int): The number of rows in the game board.
+        mines (int): The number of mines on the game board.
+        count (int): The number of seeds the cache should hold.
+        board_class (type, optional): The board implementation to verify with. Defaults to Board.
+        **options: The options of SeedSearch, e.g. seed or processes.
+
+    Returns:
+        int: The number of seeds added.
+    """
+    cache = SeedCache(width, height, mines, board_class)
+    before = len(cache)
+    if before >= count:
+        return 0
+
+    search = SeedSearch(width, height, mines, board_class=board_class, **options)
+    try:
+        while len(cache) < count:
+            cache.add(search.next_batch())
+    finally:
+        search.close()
+    return len(cache) - before
+
+
+def no_guess_seeds(
+    width: int, height: int, mines: int, cache=True, **options
+) -> SeedSearch:
+    """
+    Returns an iterator over the seeds of no-guess boards of one configuration, for as long as they are asked for.
+
+    Cached seeds are served first, then new ones are searched; see SeedSearch. Each seed gives a board
+    built with first_click_safe=True that must be opened at opening_cell; see BoardPool's seeds.
+
+    A seeded search does not use the cache, so that the same seed always gives the same boards.
+
+    Args:
+        width (int): The number of columns in the game board.
+        height (int): The number of rows in the game board.
+        mines (int): The number of mines on the game board.
+        cache (bool, optional): If False, the on-disk cache is not used. Defaults to True.
+        **options: The options of SeedSearch, e.g. seed, board_class or processes.
+
+    Returns:
+        SeedSearch: The seeds. Close it to stop its worker processes.
+    """
+    seed_cache = None
+    if cache and options.get("seed") is None:
+        seed_cache = SeedCache(width, height, mines, options.get("board_class", Board))
+    return SeedSearch(width, height, mines, cache=seed_cache, **options)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Fill the cache of no-guess Minesweeper boards."
+    )
+    parser.add_argument("--preset", choices=list(game_options), default="Expert")
+    parser.add_argument("--count", type=int, default=100)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--processes", type=int, default=None)
+    parser.add_argument(
+        "--board",
+        choices=[name for name in BOARD_TYPES if name != "auto"],
+        default="list",
+    )
+    args = parser.parse_args()
+
+    board_class = board_class_named(args.board, *game_options[args.preset][:2])
+    added = fill_cache(
+        *game_options[args.preset],
+        args.count,
+        board_class,
+        seed=args.seed,
+        processes=args.processes,
+    )
+    cache = SeedCache(*game_options[args.preset], board_class)
+    print(f"Added {added} boards; {len(cache)} cached in {cache.path}")
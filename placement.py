@@ -0,0 +1,107 @@
+"""
+Mine placement strategies.
+
+A placement strategy is called as strategy(rng, width, height, mines, excluded) and returns the flat
+indices (row * width + col) of the mine cells, chosen uniformly among the cells not in excluded.
+None of them builds a list of coordinate tuples for the whole board.
+"""
+
+
+def first_row_and_column(width: int, height: int) -> set:
+    """
+    Returns the exclusion zone the game has always used: no mine in the first row or the first column.
+
+    Args:
+        width (int): The number of columns in the game board.
+        height (int): The number of rows in the game board.
+
+    Returns:
+        set: The flat indices of the cells in row 0 and column 0.
+    """
+    return set(range(width)) | set(range(0, width * height, width))
+
+
+def neighborhood(width: int, height: int, row: int, col: int, radius=1) -> set:
+    """
+    Returns the square of cells around a cell, clipped to the board.
+
+    Used to keep the first click and its neighbors free of mines.
+
+    Args:
+        width (int): The number of columns in the game board.
+        height (int): The number of rows in the game board.
+        row (int): The row of the center cell.
+        col (int): The column of the center cell.
+        radius (int, optional): How many cells the square extends on each side of the center. Defaults to 1.
+
+    Returns:
+        set: The flat indices of the cells in the square.
+    """
+    return {
+        r * width + c
+        for r in range(max(0, row - radius), min(row + radius + 1, height))
+        for c in range(max(0, col - radius), min(col + radius + 1, width))
+    }
+
+
+def sample_sparse(rng, width: int, height: int, mines: int, excluded=frozenset()):
+    """
+    Picks mine cells by drawing random flat indices and rejecting repeats and excluded cells.
+
+    Memory grows with the number of mines only, which suits boards where mines are a small
+    fraction of the cells.
+
+    Returns:
+        list: The flat indices of the mine cells.
+    """
+    size = width * height
+    picks = set()
+    while len(picks) < mines:
+        index = rng.randrange(size)
+        if index not in excluded:
+            picks.add(index)
+    return list(picks)
+
+
+def sample_dense(rng, width: int, height: int, mines: int, excluded=frozenset()):
+    """
+    Picks mine cells with a partial Fisher-Yates shuffle of the candidate cells.
+
+    Only the first mines positions are shuffled, so the work is one pass to list the candidates
+    plus one swap per mine, however dense the board is.
+
+    Returns:
+        list: The flat indices of the mine cells.
+    """
+    candidates = [index for index in range(width * height) if index not in excluded]
+    for i in range(mines):
+        j = rng.randrange(i, len(candidates))
+        candidates[i], candidates[j] = candidates[j], candidates[i]
+    return candidates[:mines]
+
+
+def place_mines(rng, width: int, height: int, mines: int, excluded=frozenset()):
+    """
+    Picks mine cells with sample_sparse when mines fill at most a quarter of the candidate cells,
+    and with sample_dense otherwise.
+
+    Args:
+        rng (random.Random): The random number generator to draw from.
+        width (int): The number of columns in the game board.
+        height (int): The number of rows in the game board.
+        mines (int): The number of mines to place.
+        excluded (set, optional): The flat indices of the cells that must not hold a mine. Defaults to none.
+
+    Raises:
+        ValueError: If there are fewer candidate cells than mines.
+
+    Returns:
+        list: The flat indices of the mine cells.
+    """
+    candidates = width * height - len(excluded)
+    if mines > candidates:
+        raise ValueError(f"Cannot place {mines} mines in {candidates} candidate cells.")
+
+    if mines * 4 <= candidates:
+        return sample_sparse(rng, width, height, mines, excluded)
+    return sample_dense(rng, width, height, mines, excluded)
@@ -0,0 +1,500 @@
+"""
+Exact mine probabilities for the hidden cells of a player's game board.
+
+The frontier (hidden cells next to a revealed number) is split into independent components. The mine
+layouts of each component are counted by number of mines with a dynamic program over its cells, and
+the components are combined with the interior (every other hidden cell), weighting each total number
+of frontier mines by the number of ways to place the remaining mines in the interior.
+
+Flags are taken as mines: the mines left to place are mines - len(flagged_cells).
+"""
+
+from math import exp, log
+
+# The characters of the probability overlay, from least to most likely to hold a mine
+OVERLAY_CHARS = ".,:;+=xX#@"
+
+
+def overlay_char(probability: float) -> str:
+    """
+    Returns the character the overlay shows for a probability: "." for a safe cell, "@" for a mine.
+    """
+    return OVERLAY_CHARS[min(len(OVERLAY_CHARS) - 1, int(probability * 10))]
+
+
+def poly_add(total: list, poly: list, shift=0):
+    """
+    Adds poly, multiplied by x ** shift, to total in place. Polynomials are lists of coefficients.
+    """
+    if len(total) < len(poly) + shift:
+        total.extend([0] * (len(poly) + shift - len(total)))
+    for k, coefficient in enumerate(poly):
+        total[k + shift] += coefficient
+
+
+def poly_multiply(a: list, b: list) -> list:
+    """
+    Returns the product of two polynomials.
+    """
+    product = [0] * (len(a) + len(b) - 1)
+    for i, x in enumerate(a):
+        if x:
+            for j, y in enumerate(b):
+                product[i + j] += x * y
+    return product
+
+
+class Component:
+    def __init__(self, constraints):
+        """
+        Counts the mine layouts of one frontier component.
+
+        The cells are ordered by a breadth-first walk of the component, so that few numbers are ever
+        half-assigned at a time. A forward pass counts, for every cell and every combination of mines
+        still needed by the half-assigned numbers, the layouts of the cells before it; the same
+        combinations reached in different ways are merged, which is what keeps the count from growing
+        exponentially. A backward pass counts the layouts of the cells after it, and the two give the
+        number of layouts with a mine on each cell.
+
+        Every count is a polynomial in the number of mines: coefficient k counts the layouts with k mines.
+
+        Args:
+            constraints (dict): The mines still needed around each revealed number, by flat index,
+                                and the unknown cells around it: {number: (needed, cells)}.
+
+        Attributes:
+            constraints (dict): The constraints of the component, as given.
+            cells (list): The unknown cells of the component, in the order they are assigned.
+            layouts (list): The number of layouts by number of mines. All zeros if the numbers contradict each other.
+            mine_layouts (dict): For every cell, the number of layouts with a mine on it, by number of mines.
+        """
+        self.constraints = constraints
+        self.cells = self.order_cells()
+        self.layouts, self.mine_layouts = self.count()
+
+    def order_cells(self) -> list:
+        """
+        Returns the unknown cells in breadth-first order, walking from cell to cell through shared numbers.
+        """
+        numbers_of = {}
+        for number, (_, cells) in self.constraints.items():
+            for cell in cells:
+                numbers_of.setdefault(cell, []).append(number)
+
+        order = []
+        seen = set()
+        for start in sorted(numbers_of):
+            if start in seen:
+                continue
+            seen.add(start)
+            queue = [start]
+            for cell in queue:
+                order.append(cell)
+                for number in numbers_of[cell]:
+                    for neighbor in sorted(self.constraints[number][1]):
+                        if neighbor not in seen:
+                            seen.add(neighbor)
+                            queue.append(neighbor)
+        return order
+
+    def count(self):
+        """
+        Runs the forward and backward passes.
+
+        Returns:
+            tuple: The layouts and mine_layouts attributes.
+        """
+        cells = self.cells
+        position = {cell: i for i, cell in enumerate(cells)}
+        numbers = list(self.constraints)
+        needed = [self.constraints[number][0] for number in numbers]
+        first = [len(cells)] * len(numbers)
+        last = [-1] * len(numbers)
+        numbers_at = [[] for _ in cells]
+        for k, number in enumerate(numbers):
+            for cell in self.constraints[number][1]:
+                i = position[cell]
+                numbers_at[i].append(k)
+                first[k] = min(first[k], i)
+                last[k] = max(last[k], i)
+
+        # The half-assigned numbers before each cell, whose needed mines make up the state
+        active = [[]]
+        for i in range(len(cells)):
+            opened = [k for k in numbers_at[i] if first[k] == i and last[k] > i]
+            closed = {k for k in numbers_at[i] if last[k] == i}
+            active.append(sorted([k for k in active[i] if k not in closed] + opened))
+        # The unknown cells of each number after each cell, to prune states that cannot be completed
+        after = [[] for _ in cells]
+        for k in range(len(numbers)):
+            positions = sorted(
+                position[cell] for cell in self.constraints[numbers[k]][1]
+            )
+            for left, i in enumerate(reversed(positions)):
+                after[i].append((k, left))
+
+        def step(i, state, mine):
+            """
+            Returns the state after assigning mine to cell i, or None if a number can no longer be satisfied.
+            """
+            remaining = dict(zip(active[i], state))
+            for k, left in after[i]:
+                value = remaining.get(k, needed[k]) - mine
+                if not 0 <= value <= left:
+                    return None
+                remaining[k] = value
+            return tuple(remaining.get(k, needed[k]) for k in active[i + 1])
+
+        forward = [{(): [1]}]
+        for i in range(len(cells)):
+            states = {}
+            for state, poly in forward[i].items():
+                for mine in (0, 1):
+                    following = step(i, state, mine)
+                    if following is not None:
+                        poly_add(states.setdefault(following, []), poly, mine)
+            forward.append(states)
+
+        layouts = forward[-1].get((), [0])
+        mine_layouts = {}
+        backward = {(): [1]}
+        for i in range(len(cells) - 1, -1, -1):
+            states = {}
+            mine_poly = [0]
+            for state, poly in forward[i].items():
+                total = states.setdefault(state, [])
+                for mine in (0, 1):
+                    following = step(i, state, mine)
+                    if following is None or following not in backward:
+                        continue
+                    poly_add(total, backward[following], mine)
+                    if mine:
+                        poly_add(mine_poly, poly_multiply(poly, backward[following]), 1)
+            backward = {state: poly for state, poly in states.items() if poly}
+            mine_layouts[cells[i]] = mine_poly
+        return layouts, mine_layouts
+
+
+class ProbabilityEngine:
+    def __init__(self, board):
+        """
+        Initializes an engine that computes the chance of a mine for every hidden cell of a board.
+
+        Like the Solver, the engine only reads the player's game board and listens to the board for
+        changed cells. Components are cached, and a change only recounts the components it touches:
+        the component of a number whose neighbors changed, and any component it now merges with.
+
+        Args:
+            board (Board): The board to compute probabilities for.
+
+        Attributes:
+            board (Board): The board to compute probabilities for.
+            components (dict): The cached components, by frozenset of their numbers.
+            component_of (dict): The key of the cached component of each number in it.
+            dirty (set): The revealed numbers whose constraints changed since the last computation.
+            result (tuple): The last computed (frontier probabilities, interior probability), or None if outdated.
+        """
+        self.board = board
+        self.components = {}
+        self.component_of = {}
+        self.dirty = set()
+        self.result = None
+
+        for row in range(board.height):
+            for col, value in enumerate(board.get_row(row)):
+                if value not in "*F":
+                    self.dirty.add(row * board.width + col)
+
+        board.listeners.append(self.cells_changed)
+
+    def detach(self):
+        """
+        Stops listening to the board.
+        """
+        self.board.listeners.remove(self.cells_changed)
+
+    def neighbors(self, index: int):
+        """
+        Returns the flat indices of the up to 8 cells around a cell.
+        """
+        width, height = self.board.width, self.board.height
+        row, col = divmod(index, width)
+        return [
+            r * width + c
+            for r in range(max(0, row - 1), min(row + 2, height))
+            for c in range(max(0, col - 1), min(col + 2, width))
+            if r != row or c != col
+        ]
+
+    def value(self, index: int) -> str:
+        """
+        Returns the value of a cell on the player's game board.
+        """
+        return self.board.get_cell_value(*divmod(index, self.board.width))
+
+    def cells_changed(self, board, cells):
+        """
+        Marks the numbers around changed cells, and the changed cells themselves, as dirty. Called by the board.
+
+        Args:
+        board (Board): The board whose cells changed.
+        cells (list): The flat indices of the changed cells.
+        """
+        self.result = None
+        for index in cells:
+            self.dirty.add(index)
+            self.dirty.update(self.neighbors(index))
+
+    def constraint(self, index: int):
+        """
+        Returns what a revealed cell says about its neighbors, or None if it is hidden or flagged.
+
+        Returns:
+        tuple: The mines still needed among its hidden neighbors, and those neighbors as a frozenset.
+        """
+        value = self.value(index)
+        if value in "*F":
+            return None
+        needed = 0 if value == " " else int(value)
+        cells = []
+        for neighbor in self.neighbors(index):
+            neighbor_value = self.value(neighbor)
+            if neighbor_value == "F":
+                needed -= 1
+            elif neighbor_value == "*":
+                cells.append(neighbor)
+        return needed, frozenset(cells)
+
+    def update(self):
+        """
+        Recounts the components touched by the dirty numbers.
+
+        The dirty numbers are grouped into components by walking from number to number through shared
+        hidden cells. A walk that reaches a cached component drops it and takes in all of its numbers,
+        so components that merge or split are recounted whole, and untouched components are kept.
+        """
+        if not self.dirty:
+            return
+
+        queue = list(self.dirty)
+        seen = set(queue)
+        self.dirty.clear()
+        constraints = {}
+        numbers_of = {}
+        for index in queue:
+            key = self.component_of.get(index)
+            if key is not None:
+                self.drop(key)
+                for number in key:
+                    if number not in seen:
+                        seen.add(number)
+                        queue.append(number)
+
+            constraint = self.constraint(index)
+            if constraint is None or not constraint[1]:
+                continue
+            constraints[index] = constraint
+            for cell in constraint[1]:
+                numbers_of.setdefault(cell, []).append(index)
+                for number in self.neighbors(cell):
+                    if number not in seen:
+                        seen.add(number)
+                        queue.append(number)
+
+        # Split the numbers found into connected components
+        grouped = set()
+        for start in constraints:
+            if start in grouped:
+                continue
+            grouped.add(start)
+            stack = [start]
+            component = {}
+            while stack:
+                number = stack.pop()
+                component[number] = constraints[number]
+                for cell in constraints[number][1]:
+                    for other in numbers_of[cell]:
+                        if other not in grouped:
+                            grouped.add(other)
+                            stack.append(other)
+            key = frozenset(component)
+            self.components[key] = Component(component)
+            for number in key:
+                self.component_of[number] = key
+
+    def drop(self, key):
+        """
+        Removes a cached component.
+        """
+        if self.components.pop(key, None) is not None:
+            for number in key:
+                self.component_of.pop(number, None)
+
+    def solve(self):
+        """
+        Computes the chance of a mine for every hidden cell that is not flagged.
+
+        Returns:
+        tuple: A dictionary of the probability of each frontier cell, by flat index, and the probability
+               shared by every interior cell, or None if there is no interior cell.
+               Cells of components whose numbers contradict the flags are left out.
+        """
+        if self.result is not None:
+            return self.result
+        self.update()
+
+        board = self.board
+        remaining = board.mines - len(board.flagged_indices)
+        components = [
+            component
+            for component in self.components.values()
+            if any(component.layouts)
+        ]
+        # The cells showing a "*": hidden safe cells and mines not flagged
+        hidden = board.hidden_safe_cells + board.mines - board.flagged_correct
+        frontier_cells = sum(
+            len(component.cells) for component in self.components.values()
+        )
+        interior = hidden - frontier_cells
+
+        # Scale every count to floats in [0, 1]; the scale of a component cancels out in its probabilities
+        scaled = []
+        for component in components:
+            scale = max(component.layouts)
+            scaled.append(
+                (
+                    [count / scale for count in component.layouts],
+                    {
+                        cell: [count / scale for count in poly]
+                        for cell, poly in component.mine_layouts.items()
+                    },
+                )
+            )
+
+        # Layouts of all the components but one, by number of mines, from prefix and suffix products
+        prefix = [[1.0]]
+        for layouts, _ in scaled:
+            prefix.append(poly_multiply(prefix[-1], layouts))
+        suffix = [[1.0]]
+        for layouts, _ in reversed(scaled):
+            suffix.append(poly_multiply(suffix[-1], layouts))
+        suffix.reverse()
+
+        weights = self.interior_weights(interior, remaining, len(prefix[-1]))
+        total = sum(count * weight for count, weight in zip(prefix[-1], weights))
+        if total == 0:
+            self.result = ({}, None)
+            return self.result
+
+        probabilities = {}
+        for i, (_, mine_layouts) in enumerate(scaled):
+            # The weight of j mines in this component, summed over the layouts of the others
+            others = poly_multiply(prefix[i], suffix[i + 1])
+            component_weights = [
+                sum(
+                    count * weight
+                    for count, weight in zip(others, weights[j : j + len(others)])
+                )
+                for j in range(len(weights) - len(others) + 1)
+            ]
+            for cell, poly in mine_layouts.items():
+                probabilities[cell] = (
+                    sum(
+                        count * weight for count, weight in zip(poly, component_weights)
+                    )
+                    / total
+                )
+
+        interior_probability = None
+        if interior > 0:
+            expected = sum(
+                count * weight * (remaining - k)
+                for k, (count, weight) in enumerate(zip(prefix[-1], weights))
+            )
+            interior_probability = expected / total / interior
+
+        self.result = (probabilities, interior_probability)
+        return self.result
+
+    def interior_weights(self, interior: int, remaining: int, size: int) -> list:
+        """
+        Returns, for k frontier mines, the relative number of ways to place the other mines in the interior.
+
+        The weight of k is comb(interior, remaining - k), scaled so that the largest weight is 1, and
+        computed from the ratio of consecutive binomial coefficients so that huge boards do not overflow.
+
+        Args:
+            interior (int): The number of interior cells.
+            remaining (int): The number of mines left to place.
+            size (int): The number of weights, one per possible number of frontier mines.
+
+        Returns:
+            list: The weight of each number of frontier mines, 0.0 when it is impossible.
+        """
+        logs = [None] * size
+        for k in range(size):
+            if not 0 <= remaining - k <= interior:
+                continue
+            if k > 0 and logs[k - 1] is not None:
+                # comb(interior, remaining - k) / comb(interior, remaining - k + 1)
+                logs[k] = (
+                    logs[k - 1] + log(remaining - k + 1) - log(interior - remaining + k)
+                )
+            else:
+                logs[k] = 0.0
+
+        top = max((value for value in logs if value is not None), default=None)
+        if top is None:
+            return [0.0] * size
+        return [0.0 if value is None else exp(value - top) for value in logs]
+
+    def probability(self, row: int, col: int):
+        """
+        Returns the chance that a cell holds a mine.
+
+        Returns:
+        float: The probability, 0.0 for a revealed cell and 1.0 for a flagged one, or None if unknown.
+        """
+        value = self.board.get_cell_value(row, col)
+        if value == "F":
+            return 1.0
+        if value != "*":
+            return 0.0
+        probabilities, interior = self.solve()
+        return probabilities.get(row * self.board.width + col, interior)
+
+    def overlay(self) -> dict:
+        """
+        Returns the probability of every hidden cell that is not flagged, by flat index, for Board.draw_game_board.
+        """
+        probabilities, interior = self.solve()
+        overlay = {}
+        board = self.board
+        for row in range(board.height):
+            for col, value in enumerate(board.get_row(row)):
+                index = row * board.width + col
+                if value == "*":
+                    probability = probabilities.get(index, interior)
+                    if probability is not None:
+                        overlay[index] = probability
+        return overlay
+
+    def safest(self):
+        """
+        Returns the hidden cell least likely to hold a mine, for bots.
+
+        Returns:
+        tuple: (row, col, probability), or None if there is no hidden cell with a known probability.
+        """
+        probabilities, interior = self.solve()
+        best = min(probabilities.items(), key=lambda item: item[1], default=None)
+        if interior is not None and (best is None or interior < best[1]):
+            board = self.board
+            for row in range(board.height):
+                for col, value in enumerate(board.get_row(row)):
+                    index = row * board.width + col
+                    if value == "*" and index not in probabilities:
+                        return row, col, interior
+        if best is None:
+            return None
+        return (*divmod(best[0], self.board.width), best[1])
@@ -0,0 +1,346 @@
+import sys
+from abc import ABC, abstractmethod
+
+from probability import overlay_char
+
+
+class Renderer(ABC):
+    """
+    Interface for everything that shows a game to the player.
+
+    The board and the game never print directly: they hand the board to draw and the
+    messages to show to a renderer, so the same game logic can drive a terminal, a
+    network session or nothing at all. Subclasses must provide draw and message.
+    """
+
+    @abstractmethod
+    def draw(self, board, reveal=False, overlay=None):
+        """
+        Shows the current state of a board.
+
+        Args:
+        board (Board): The board to show.
+        reveal (bool, optional): If True, shows the default game board instead of the player's. Defaults to False.
+        overlay (dict, optional): Mine probabilities to show on hidden cells, by flat index. Defaults to None.
+        """
+
+    @abstractmethod
+    def message(self, text: str):
+        """
+        Shows a line of text to the player.
+
+        Args:
+        text (str): The text to show.
+        """
+
+    def flush(self):
+        """
+        Shows any message the renderer is holding back until the next frame.
+        """
+
+    def cells_changed(self, board, cells):
+        """
+        Called by the board whenever cells of the player's game board change.
+
+        Renderers that redraw the whole board ignore it.
+
+        Args:
+        board (Board): The board whose cells changed.
+        cells (iterable): The flat indices (row * width + col) of the changed cells.
+        """
+
+    def board_reset(self, board):
+        """
+        Called by the board when it starts a new game in place, see Board.reset.
+
+        Args:
+        board (Board): The board that was reset.
+        """
+
+
+class TerminalRenderer(Renderer):
+    def __init__(self, stream=None):
+        """
+        Initializes a renderer that writes boards as text to a terminal.
+
+        Args:
+            stream (optional): The file-like object to write to. Defaults to sys.stdout at the time of writing.
+
+        Attributes:
+            stream: The file-like object to write to, or None for sys.stdout.
+            layouts (dict): The cached header, separator, row template and cell columns for each board size.
+        """
+        self.stream = stream
+        self.layouts = {}
+
+    def write(self, text: str):
+        """
+        Writes text to the stream in a single call.
+
+        Args:
+        text (str): The text to write.
+        """
+        (self.stream or sys.stdout).write(text)
+
+    def layout(self, width: int, height: int):
+        """
+        Returns the header line, separator line, row template and cell columns for a board size.
+
+        Every column is as wide as its number, and row numbers are right-aligned to the widest one,
+        so boards with hundreds or thousands of rows and columns stay aligned.
+        They only depend on the size, so they are built once and cached.
+
+        Args:
+        width (int): The number of columns in the game board.
+        height (int): The number of rows in the game board.
+
+        Returns:
+        tuple: The header line, the separator line, the row template (formatted with the row number,
+               then the cell values) and the offset of every cell from the start of its line.
+        """
+        label_width = max(2, len(str(height)))
+        key = (width, label_width)
+        if key not in self.layouts:
+            separator = " | "
+            numbers = [str(i) for i in range(1, width + 1)]
+            header = " " * (label_width + 1) + "| " + separator.join(numbers) + " |"
+            cells = separator.join("{}" + " " * (len(number) - 1) for number in numbers)
+            row_template = "{:>%d}" % label_width + separator + cells + " |"
+
+            columns = []
+            column = label_width + len(separator)
+            for number in numbers:
+                columns.append(column)
+                column += len(number) + len(separator)
+
+            self.layouts[key] = (header, "-" * len(header), row_template, columns)
+        return self.layouts[key]
+
+    def draw(self, board, reveal=False, overlay=None):
+        """
+        Writes the board as a frame of text, built in one buffer and written at once.
+
+        Args:
+        board (Board): The board to show.
+        reveal (bool, optional): If True, shows the default game board instead of the player's. Defaults to False.
+        overlay (dict, optional): Mine probabilities to show on hidden cells, by flat index. Defaults to None.
+        """
+        self.write(self.frame(board, reveal, overlay))
+
+    def frame(self, board, reveal=False, overlay=None) -> str:
+        """
+        Builds the text of a whole board.
+
+        The layout is the one documented on Board.draw_game_board.
+
+        Args:
+        board (Board): The board to show.
+        reveal (bool, optional): If True, shows the default game board instead of the player's. Defaults to False.
+        overlay (dict, optional): Mine probabilities to show on hidden cells, by flat index, with the
+                                  characters of probability.overlay_char. Defaults to None.
+
+        Returns:
+        str: The lines of the board, each ending with a newline.
+        """
+        header, separator, row_template, _ = self.layout(board.width, board.height)
+        board_to_draw = "default_board" if reveal else "player_board"
+
+        lines = [header, separator]
+        for i in range(board.height):
+            values = board.get_row(i, board_to_draw)
+            if overlay:
+                # get_row may return the board's own row
+                values = list(values)
+                start = i * board.width
+                for col, value in enumerate(values):
+                    if value == "*" and start + col in overlay:
+                        values[col] = overlay_char(overlay[start + col])
+            lines.append(row_template.format(i + 1, *values))
+            lines.append(separator)
+        lines.append("")
+
+        return "\n".join(lines)
+
+    def message(self, text: str):
+        """
+        Writes a line of text.
+
+        Args:
+        text (str): The text to write.
+        """
+        self.write(text + "\n")
+
+
+class DiffRenderer(TerminalRenderer):
+    # Lines kept free under the board for messages and input prompts
+    status_lines = 10
+
+    def __init__(self, stream=None, terminal_size=None):
+        """
+        Initializes a renderer that only redraws the cells that changed since the last frame.
+
+        The first frame is painted in full. After that, every cell the board reports through
+        cells_changed is rewritten in place with ANSI cursor positioning, so the bytes written per
+        move grow with the number of changed cells rather than with the size of the board.
+        The board is painted in full again when it is revealed at the end of a game, when a new
+        board is drawn, or when the terminal is resized.
+
+        Messages are queued and written in a status area under the board, which is cleared at every
+        frame. The board and the status area must fit in the terminal; if they do not, every frame
+        is painted in full like TerminalRenderer.
+
+        Args:
+            stream (optional): The file-like object to write to. Defaults to sys.stdout at the time of writing.
+            terminal_size (tuple, optional): The (columns, lines) of the terminal. Defaults to None,
+                                             which asks the terminal before every frame.
+
+        Attributes:
+            terminal_size (tuple): The fixed (columns, lines) of the terminal, or None.
+            board (Board): The board currently on screen, or None if the screen must be painted in full.
+            screen_size (tuple): The terminal size when the screen was last painted in full.
+            dirty (set): The flat indices of the cells that changed since the last frame.
+            pending (list): Messages waiting to be written with the next frame.
+        """
+        super().__init__(stream)
+        self.terminal_size = terminal_size
+        self.board = None
+        self.screen_size = None
+        self.dirty = set()
+        self.pending = []
+
+    def get_terminal_size(self):
+        """
+        Returns the (columns, lines) of the terminal.
+        """
+        if self.terminal_size is not None:
+            return self.terminal_size
+        # Imported here, as only diff redraws need the terminal size and shutil is slow to import
+        import shutil
+
+        return tuple(shutil.get_terminal_size())
+
+    def cell_position(self, board, index: int):
+        """
+        Returns the 1-based screen line and column of a cell.
+
+        Args:
+        board (Board): The board on screen.
+        index (int): The flat index (row * width + col) of the cell.
+
+        Returns:
+        tuple: The line and column of the cell on the screen.
+        """
+        row, col = divmod(index, board.width)
+        columns = self.layout(board.width, board.height)[3]
+        return 3 + 2 * row, columns[col] + 1
+
+    def fitting_size(self, width: int, height: int):
+        """
+        Returns the smallest terminal size that holds a board and the status area, so that frames are diffs.
+
+        Args:
+        width (int): The number of columns in the game board.
+        height (int): The number of rows in the game board.
+
+        Returns:
+        tuple: The (columns, lines) of the terminal.
+        """
+        header = self.layout(width, height)[0]
+        return len(header), 3 + 2 * height + self.status_lines
+
+    def status_position(self, board) -> int:
+        """
+        Returns the 1-based screen line where the status area starts.
+        """
+        return 3 + 2 * board.height
+
+    def draw(self, board, reveal=False, overlay=None):
+        """
+        Writes the changes since the last frame, or the whole board when it must be painted in full.
+
+        Queued messages are written in the status area under the board. If the board does not fit
+        in the terminal, they are written before the board instead, as TerminalRenderer would.
+
+        Args:
+        board (Board): The board to show.
+        reveal (bool, optional): If True, paints the default game board in full. Defaults to False.
+        overlay (dict, optional): Mine probabilities to paint in full on hidden cells. Defaults to None.
+        """
+        size = self.get_terminal_size()
+        pending = [text + "\n" for text in self.pending]
+        self.pending.clear()
+
+        if self.status_position(board) + self.status_lines > size[1]:
+            parts = pending + [self.frame(board, reveal, overlay)]
+            self.board = None
+        elif (
+            reveal
+            or overlay is not None
+            or board is not self.board
+            or size != self.screen_size
+        ):
+            parts = ["\x1b[2J\x1b[H", self.frame(board, reveal, overlay)] + pending
+            # A revealed board or an overlay is painted over at the next frame
+            self.board = None if reveal or overlay is not None else board
+            self.screen_size = size
+        else:
+            parts = []
+            for index in sorted(self.dirty):
+                line, column = self.cell_position(board, index)
+                row, col = divmod(index, board.width)
+                parts.append(f"\x1b[{line};{column}H{board.get_cell_value(row, col)}")
+            parts.append(f"\x1b[{self.status_position(board)};1H\x1b[J")
+            parts.extend(pending)
+
+        self.dirty.clear()
+        self.write("".join(parts))
+
+    def message(self, text: str):
+        """
+        Queues a line of text, to be written with the next frame.
+
+        Args:
+        text (str): The text to show.
+        """
+        self.pending.append(text)
+
+    def flush(self):
+        """
+        Writes the queued messages at once, without drawing a frame.
+        """
+        self.write("".join(text + "\n" for text in self.pending))
+        self.pending.clear()
+
+    def cells_changed(self, board, cells):
+        """
+        Records the cells to rewrite at the next frame.
+
+        Args:
+        board (Board): The board whose cells changed.
+        cells (iterable): The flat indices (row * width + col) of the changed cells.
+        """
+        if board is self.board:
+            self.dirty.update(cells)
+
+    def board_reset(self, board):
+        """
+        Paints the board in full at the next frame, since every cell may have changed.
+
+        Args:
+        board (Board): The board that was reset.
+        """
+        if board is self.board:
+            self.board = None
+            self.dirty.clear()
+
+
+class NullRenderer(Renderer):
+    """
+    Renderer that shows nothing, for benchmarks and batch play.
+    """
+
+    def draw(self, board, reveal=False, overlay=None):
+        pass
+
+    def message(self, text: str):
+        pass
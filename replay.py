@@ -0,0 +1,133 @@
+import argparse
+
+from game import Game
+from move_log import read_move_log
+from renderer import NullRenderer, TerminalRenderer
+from snapshot import Snapshot, pack_board
+
+
+class Replay:
+    def __init__(self, log, board_class=None, checkpoint_interval=100):
+        """
+        Initializes a replay of a logged game.
+
+        Games are played again with Game.play_move and Game.play_batch on a NullRenderer, so a replay goes through the same
+        code as the original game without any drawing or input() call.
+
+        Every checkpoint_interval moves, a snapshot of the board is kept in memory. Seeking to a move
+        starts from the latest checkpoint before it rather than from the first move. The log of a game
+        loaded from a snapshot starts from that snapshot.
+
+        Args:
+            log (MoveLog): The log of the game to replay.
+            board_class (type, optional): The board implementation to replay on. Defaults to None, which is
+                                          the implementation recorded in the log.
+            checkpoint_interval (int, optional): The number of moves between checkpoints. Defaults to 100.
+
+        Raises:
+            ValueError: If the log has no seed, e.g. for a game loaded from a snapshot without one.
+
+        Attributes:
+            log (MoveLog): The log of the game to replay.
+            board_class (type): The board implementation to replay on.
+            checkpoint_interval (int): The number of moves between checkpoints.
+            checkpoints (dict): The packed snapshot of the board after each checkpointed move, by move number.
+        """
+        if log.header["seed"] is None:
+            raise ValueError(
+                "The log has no seed, so its mines cannot be rebuilt and it cannot be replayed."
+            )
+        self.log = log
+        self.board_class = board_class if board_class is not None else log.board_class()
+        self.checkpoint_interval = checkpoint_interval
+        self.checkpoints = {}
+
+    def new_game(self, snapshot=None) -> Game:
+        """
+        Builds the game of the log before its first move, or as saved in a checkpoint.
+        """
+        if snapshot is None and self.log.start is not None:
+            snapshot = Snapshot(self.log.start)
+        header = self.log.header
+        board_options = self.log.board_options()
+        if snapshot is not None:
+            board_options.update(snapshot.board_options(self.board_class))
+        game = Game(
+            (header["width"], header["height"], header["mines"]),
+            0,
+            board_class=self.board_class,
+            renderer=NullRenderer(),
+            **board_options,
+        )
+        if snapshot is not None:
+            snapshot.apply(game.board)
+        return game
+
+    def game_at(self, move: int) -> Game:
+        """
+        Returns the game as it was after a number of moves.
+
+        Args:
+            move (int): The number of moves to play, from 0 to the length of the log.
+
+        Returns:
+            Game: A new game, after the moves were played. Its renderer is a NullRenderer.
+        """
+        move = max(0, min(move, len(self.log)))
+        start = max(
+            (number for number in self.checkpoints if number <= move), default=0
+        )
+        game = self.new_game(Snapshot(self.checkpoints[start]) if start else None)
+
+        for number in range(start, move):
+            move = self.log.moves[number]
+            if isinstance(move, list):
+                game.play_batch(move)
+            else:
+                game.play_move(*move)
+            if (number + 1) % self.checkpoint_interval == 0:
+                self.checkpoint(number + 1, game)
+        return game
+
+    def checkpoint(self, number: int, game: Game):
+        """
+        Keeps a snapshot of the game after a move.
+
+        No checkpoint is kept while a first-click-safe board is unopened: its mines still move at the
+        first click, using random draws a snapshot does not hold. None is kept once the game is over
+        either, since a snapshot holds the board but not the end of the game; seeking past the end
+        plays the last move again from an earlier checkpoint.
+        """
+        board = game.board
+        if not game.playing:
+            return
+        if board.opened or not board.first_click_safe:
+            self.checkpoints.setdefault(number, pack_board(board))
+
+    def run(self) -> Game:
+        """
+        Plays every move of the log.
+
+        Returns:
+            Game: The game after the last move.
+        """
+        return self.game_at(len(self.log))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Replay a logged Minesweeper game.")
+    parser.add_argument("log", help="a move log file written by Game")
+    parser.add_argument("--move", type=int, help="stop after this many moves")
+    args = parser.parse_args()
+
+    replay = Replay(read_move_log(args.log))
+    move = len(replay.log) if args.move is None else args.move
+    game = replay.game_at(move)
+    board = game.board
+    print(f"Move {min(move, len(replay.log))} of {len(replay.log)}.")
+    if board.check_win():
+        print("The game was won.")
+    elif not game.playing:
+        print("The game was lost.")
+    board.renderer = TerminalRenderer()
+    board.draw_game_board()
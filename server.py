@@ -0,0 +1,333 @@
+import argparse
+import asyncio
+import itertools
+
+from board import Board
+from board_config import parse_options
+from game import Game
+from input_sources import parse_move
+from main import game_options
+from renderer import DiffRenderer
+from user_input import game_modes
+
+# The largest custom board a player may ask for, in cells, so that one session cannot exhaust the server
+MAX_CUSTOM_CELLS = 10_000
+
+help_text = """Commands:
+  row col      reveal a cell, or remove the flag from a flagged cell
+  row col f    flag a cell
+  row col c    reveal the other neighbors of a number whose flags are all placed
+  r1 c1 r2 c2 ... [f|c]
+               apply the same action to many cells at once
+  hint         show a suggested move
+  heatmap      show the chance of a mine on every hidden cell
+  new [b|i|e]  start a new game, optionally choosing the mode
+  new c width height mines
+               start a new game on a custom board
+  help         show these commands
+  quit         leave the server"""
+
+
+class OutputBuffer:
+    """
+    A file-like object that collects what a renderer writes until the server sends it.
+    """
+
+    def __init__(self):
+        self.parts = []
+
+    def write(self, text: str):
+        self.parts.append(text)
+
+    def take(self) -> bytes:
+        """
+        Returns everything written since the last call, encoded for the socket.
+        """
+        data = "".join(self.parts).encode()
+        self.parts.clear()
+        return data
+
+
+class Session:
+    # Commands that run a solver, which may take a while on a large board
+    slow_commands = ("hint", "heatmap")
+
+    def __init__(
+        self, session_id: int, game_selection: str, board_class, terminal_size=None
+    ):
+        """
+        Initializes the state of one connected player.
+
+        Args:
+            session_id (int): The number of the session on the server.
+            game_selection (str): The name of the game mode to start with, a key of game_options.
+            board_class (type): The board implementation to play on.
+            terminal_size (tuple, optional): The (columns, lines) assumed for the player's terminal. Defaults to None,
+                                             which assumes a terminal just large enough for each board.
+
+        Attributes:
+            id (int): The number of the session on the server.
+            game_selection: The name of the current game mode, or the (width, height, mines) of a custom board.
+            board_class (type): The board implementation to play on.
+            output (OutputBuffer): Collects the frames and messages to send.
+            terminal_size (tuple): The (columns, lines) assumed for the player's terminal, or None to fit each board.
+            renderer (DiffRenderer): Draws every game of the session into output.
+            games_played (int): The number of the current game.
+            game (Game): The current game.
+        """
+        self.id = session_id
+        self.game_selection = game_selection
+        self.board_class = board_class
+        self.terminal_size = terminal_size
+        self.output = OutputBuffer()
+        self.renderer = DiffRenderer(self.output, terminal_size)
+        self.games_played = 0
+        self.game = None
+        self.new_game()
+
+    def new_game(self, game_selection=None):
+        """
+        Starts a new game, in the same mode unless another is given.
+
+        Args:
+            game_selection (optional): The name of a game mode, or the (width, height, mines) of a custom board.
+                                       Defaults to None (the same mode).
+        """
+        if game_selection is not None:
+            self.game_selection = game_selection
+        options = self.game_selection
+        if isinstance(options, str):
+            options = game_options[options]
+        self.games_played += 1
+        if self.terminal_size is None:
+            self.renderer.terminal_size = self.renderer.fitting_size(*options[:2])
+        self.game = Game(
+            options,
+            self.games_played,
+            board_class=self.board_class,
+            renderer=self.renderer,
+        )
+        self.game.print_game_state()
+
+    def handle(self, text: str) -> bool:
+        """
+        Runs one command, with the grammar of get_user_input plus the new and quit commands.
+
+        Revealing a flagged cell removes the flag without asking for confirmation.
+
+        Args:
+            text (str): The line sent by the player.
+
+        Returns:
+            bool: False if the player quit, True otherwise.
+        """
+        command = text.strip().lower()
+        words = command.split()
+        renderer = self.renderer
+
+        if command in ["quit", "q"]:
+            renderer.message("Thanks for playing!")
+            renderer.flush()
+            return False
+        elif command in ["help", "h"]:
+            renderer.message(help_text)
+            renderer.flush()
+        elif words and words[0] == "new":
+            mode = game_modes.get(words[1][:1]) if len(words) > 1 else None
+            if mode == "Quit":
+                mode = None
+            elif mode == "Custom":
+                try:
+                    mode = parse_options(" ".join(words[2:]))
+                    if mode[0] * mode[1] > MAX_CUSTOM_CELLS:
+                        raise ValueError(
+                            f"Custom boards hold at most {MAX_CUSTOM_CELLS} cells."
+                        )
+                except ValueError as error:
+                    renderer.message(str(error))
+                    renderer.flush()
+                    return True
+            self.new_game(mode)
+        elif not self.game.playing:
+            renderer.message("The game is over. Enter new to play again.")
+            renderer.flush()
+        elif command == "hint":
+            self.game.show_hint()
+        elif command == "heatmap":
+            self.game.show_heatmap()
+        else:
+            try:
+                move = parse_move(command)
+            except ValueError as error:
+                renderer.message(str(error))
+                renderer.flush()
+                return True
+
+            if isinstance(move, list):
+                self.game.play_batch(move)
+            else:
+                self.game.play_move(*move)
+            if self.game.playing:
+                self.game.print_game_state()
+            else:
+                renderer.message("Enter new to play again.")
+                renderer.flush()
+        return True
+
+
+class GameServer:
+    def __init__(
+        self,
+        host="127.0.0.1",
+        port=0,
+        game_selection="Beginner",
+        board_class=Board,
+        idle_timeout=300.0,
+        write_timeout=10.0,
+        max_sessions=1000,
+        terminal_size=None,
+    ):
+        """
+        Initializes a server that hosts many games in one process, over plain TCP.
+
+        Each connection gets its own Session. Players send one command per line, with the grammar of
+        get_user_input, and receive the frames of a DiffRenderer: the board once in full, then only
+        the cells that changed, as ANSI escape sequences a terminal client such as telnet or nc shows as-is.
+
+        A session is evicted when its player sends nothing for idle_timeout seconds. Commands are read
+        one at a time and the next one is only read once the output of the last one was taken by the
+        socket, so a client that does not read cannot make the server buffer without bound; if it does not
+        read for write_timeout seconds, its session is evicted.
+
+        Args:
+            host (str, optional): The address to listen on. Defaults to "127.0.0.1".
+            port (int, optional): The port to listen on. Defaults to 0, which picks a free port.
+            game_selection (str, optional): The game mode of new sessions. Defaults to "Beginner".
+            board_class (type, optional): The board implementation to play on. Defaults to Board.
+            idle_timeout (float, optional): Seconds without a command before a session is evicted. Defaults to 300.
+            write_timeout (float, optional): Seconds a client may take to read its output. Defaults to 10.
+            max_sessions (int, optional): The number of sessions hosted at once. Defaults to 1000.
+            terminal_size (tuple, optional): The (columns, lines) assumed for client terminals. Defaults to None,
+                                             which assumes a terminal just large enough for each board, so
+                                             that every move is sent as a diff.
+
+        Attributes:
+            The arguments, and:
+            sessions (dict): The open sessions, by id.
+            server (asyncio.Server): The listening server, once started.
+        """
+        self.host = host
+        self.port = port
+        self.game_selection = game_selection
+        self.board_class = board_class
+        self.idle_timeout = idle_timeout
+        self.write_timeout = write_timeout
+        self.max_sessions = max_sessions
+        self.terminal_size = terminal_size
+        self.sessions = {}
+        self.server = None
+        self.session_ids = itertools.count(1)
+
+    async def start(self):
+        """
+        Starts listening. The port actually used is stored in port.
+        """
+        self.server = await asyncio.start_server(
+            self.serve_client, self.host, self.port, limit=1024
+        )
+        self.port = self.server.sockets[0].getsockname()[1]
+
+    async def close(self):
+        """
+        Stops listening and waits for the server to close.
+        """
+        self.server.close()
+        await self.server.wait_closed()
+
+    async def send(self, writer, session):
+        """
+        Sends the pending output of a session and waits until the socket has taken it.
+
+        Raises:
+            asyncio.TimeoutError: If the client does not read it within write_timeout.
+        """
+        data = session.output.take()
+        if data:
+            writer.write(data)
+            await asyncio.wait_for(writer.drain(), self.write_timeout)
+
+    async def serve_client(self, reader, writer):
+        """
+        Runs the session of one connection, until the player quits, disconnects, idles or stops reading.
+        """
+        if len(self.sessions) >= self.max_sessions:
+            writer.write(b"The server is full. Try again later.\n")
+            writer.close()
+            return
+
+        writer.transport.set_write_buffer_limits(high=64 * 1024)
+        session = Session(
+            next(self.session_ids),
+            self.game_selection,
+            self.board_class,
+            self.terminal_size,
+        )
+        self.sessions[session.id] = session
+
+        try:
+            await self.send(writer, session)
+            while True:
+                try:
+                    line = await asyncio.wait_for(reader.readline(), self.idle_timeout)
+                except asyncio.TimeoutError:
+                    session.renderer.message("Session closed after being idle.")
+                    session.renderer.flush()
+                    await self.send(writer, session)
+                    break
+                if not line:
+                    break
+
+                text = line.decode(errors="replace")
+                if text.strip().lower() in session.slow_commands:
+                    # Run in a thread, so that the other sessions are served in the meantime
+                    keep_playing = await asyncio.get_running_loop().run_in_executor(
+                        None, session.handle, text
+                    )
+                else:
+                    keep_playing = session.handle(text)
+                await self.send(writer, session)
+                if not keep_playing:
+                    break
+
+        except (asyncio.TimeoutError, ConnectionError, ValueError):
+            # Slow readers, dropped connections and overlong lines end the session
+            pass
+        finally:
+            del self.sessions[session.id]
+            writer.close()
+
+
+async def serve(host, port, **options):
+    server = GameServer(host, port, **options)
+    await server.start()
+    print(f"Serving Minesweeper on {server.host}:{server.port}")
+    async with server.server:
+        await server.server.serve_forever()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Host Minesweeper games over TCP.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8023)
+    parser.add_argument("--preset", choices=list(game_options), default="Beginner")
+    parser.add_argument("--idle-timeout", type=float, default=300.0)
+    args = parser.parse_args()
+
+    asyncio.run(
+        serve(
+            args.host,
+            args.port,
+            game_selection=args.preset,
+            idle_timeout=args.idle_timeout,
+        )
+    )
@@ -0,0 +1,383 @@
+import argparse
+import json
+from multiprocessing import Pool
+from random import Random
+from time import perf_counter
+
+from board import Board
+from main import game_options
+from probability import ProbabilityEngine
+from renderer import NullRenderer
+from solver import Solver
+
+
+def random_moves(board, rng):
+    """
+    Move source that reveals the hidden cells of a board in a random order.
+
+    Args:
+        board (Board): The board being played.
+        rng (random.Random): The random number generator to shuffle the cells with.
+
+    Yields:
+        tuple: (row, col, flag) for the next hidden cell, with flag always False.
+    """
+    cells = list(range(board.width * board.height))
+    rng.shuffle(cells)
+    for index in cells:
+        row, col = divmod(index, board.width)
+        if board.get_cell_value(row, col) == "*":
+            yield row, col, False
+
+
+def solver_moves(board, rng):
+    """
+    Move source that plays the solver's hints: proven safe cells first, then the least likely mine.
+
+    Proven mines are not flagged, since flags are not needed to win.
+
+    Args:
+        board (Board): The board being played.
+        rng (random.Random): Unused; the solver is deterministic.
+
+    Yields:
+        tuple: (row, col, flag) for the next cell to reveal, with flag always False.
+    """
+    solver = Solver(board)
+    while True:
+        safe, _ = solver.solve()
+        if safe:
+            for row, col in safe:
+                yield row, col, False
+            continue
+        hint = solver.guess()
+        if hint is None:
+            return
+        row, col, _, _ = hint
+        yield row, col, False
+
+
+def probability_moves(board, rng):
+    """
+    Move source that always reveals the hidden cell least likely to hold a mine, from the ProbabilityEngine.
+
+    Unlike solver_moves, its guesses take the whole board into account, including the mines left
+    for the cells away from the frontier.
+
+    Args:
+        board (Board): The board being played.
+        rng (random.Random): Unused; the engine is deterministic.
+
+    Yields:
+        tuple: (row, col, flag) for the next cell to reveal, with flag always False.
+    """
+    engine = ProbabilityEngine(board)
+    while True:
+        move = engine.safest()
+        if move is None:
+            return
+        row, col, _ = move
+        yield row, col, False
+
+
+# The move sources that can be picked by name, e.g. on the command line
+move_sources = {
+    "random": random_moves,
+    "solver": solver_moves,
+    "probability": probability_moves,
+}
+
+
+def play_headless(
+    width: int,
+    height: int,
+    mines: int,
+    seed=None,
+    move_source=random_moves,
+    board_class=Board,
+    board=None,
+    metrics=False,
+):
+    """
+    Plays a single game without any input or output.
+
+    Args:
+        width (int): The number of columns in the game board.
+        height (int): The number of rows in the game board.
+        mines (int): The number of mines on the game board.
+        seed (optional): The seed for both the board and the move source. Defaults to None (unseeded).
+        move_source (callable, optional): Called as move_source(board, rng) and returns an iterable of
+                                          zero-based (row, col, flag) moves. It is read lazily, so it can
+                                          look at the board between moves. Defaults to random_moves.
+        board_class (type, optional): The board implementation to play on. Defaults to Board.
+        board (Board, optional): A board of the right size to reset with Board.reset and play on,
+                                 instead of building a new one. Defaults to None.
+        metrics (bool, optional): If True, the outcome also holds the metrics of the board, measured once
+                                  the game is over and not counted in "seconds". Defaults to False.
+
+    The game ends when a mine is revealed, when the board is won, or when the move source runs out of moves.
+
+    Returns:
+        dict: The outcome of the game with the keys "seed", "won", "lost", "moves", "cells_cascaded" and "seconds",
+              plus "metrics" with the dictionary of BoardMetrics.as_dict if metrics is set.
+    """
+    start = perf_counter()
+    if board is not None:
+        board.reset(seed)
+    else:
+        board = board_class(width, height, mines, seed=seed, renderer=NullRenderer())
+    rng = Random(seed)
+
+    won = lost = False
+    moves = cells_cascaded = 0
+
+    for row, col, flag in move_source(board, rng):
+        moves += 1
+        if flag:
+            board.place_flag(row, col)
+        elif board.is_flagged(row, col):
+            board.clear_flag(row, col)
+        else:
+            hidden_safe_cells = board.hidden_safe_cells
+            if not board.uncover(row, col):
+                lost = True
+                break
+            cells_cascaded += hidden_safe_cells - board.hidden_safe_cells
+
+        if board.check_win():
+            won = True
+            break
+
+    result = {
+        "seed": seed,
+        "won": won,
+        "lost": lost,
+        "moves": moves,
+        "cells_cascaded": cells_cascaded,
+        "seconds": perf_counter() - start,
+    }
+    if metrics:
+        result["metrics"] = board.metrics().as_dict()
+    return result
+
+
+# Boards reused across the games played by one process, by (board_class, width, height, mines)
+_boards = {}
+
+
+def _worker_board(board_class, width: int, height: int, mines: int):
+    """
+    Returns the board this process reuses for a configuration, building it the first time.
+    """
+    key = (board_class, width, height, mines)
+    if key not in _boards:
+        _boards[key] = board_class(width, height, mines, renderer=NullRenderer())
+    return _boards[key]
+
+
+def _play_headless_args(args):
+    """
+    Unpacks a tuple of arguments for play_headless, so it can be mapped over a process pool.
+
+    Each process builds one board per configuration and resets it in place for every game.
+    """
+    width, height, mines, seed, move_source, board_class, metrics = args
+    board = _worker_board(board_class, width, height, mines)
+    return play_headless(
+        width, height, mines, seed, move_source, board_class, board, metrics
+    )
+
+
+def _measure_args(args):
+    """
+    Generates the board of one seed and measures it, without playing, so it can be mapped over a process pool.
+    """
+    width, height, mines, seed, board_class = args
+    board = _worker_board(board_class, width, height, mines)
+    board.reset(seed)
+    return {"seed": seed, **board.metrics().as_dict()}
+
+
+def summarize(results):
+    """
+    Aggregates the outcomes of many games.
+
+    Args:
+        results (list): Dictionaries returned by play_headless.
+
+    Returns:
+        dict: The number of games, wins and losses, the win rate, and the mean moves, cells cascaded and seconds
+              per game. Games that ended because the move source ran out are neither wins nor losses.
+    """
+    games = len(results)
+    totals = {
+        key: sum(result[key] for result in results)
+        for key in ("won", "lost", "moves", "cells_cascaded", "seconds")
+    }
+    divisor = games or 1
+    stats = {
+        "games": games,
+        "wins": totals["won"],
+        "losses": totals["lost"],
+        "win_rate": totals["won"] / divisor,
+        "mean_moves": totals["moves"] / divisor,
+        "mean_cells_cascaded": totals["cells_cascaded"] / divisor,
+        "mean_seconds": totals["seconds"] / divisor,
+    }
+    if results and "metrics" in results[0]:
+        stats.update(summarize_metrics(result["metrics"] for result in results))
+    return stats
+
+
+def summarize_metrics(profiles):
+    """
+    Aggregates the metrics of many boards.
+
+    Args:
+        profiles (iterable): Dictionaries from BoardMetrics.as_dict, e.g. yielded by profile_boards.
+                             It is read once, so it may be a generator over millions of boards.
+
+    Returns:
+        dict: The mean, smallest and largest 3BV, the mean number of openings and isolated numbers,
+              and the mean size of the largest opening.
+    """
+    boards = bbbv = openings = isolated_numbers = largest_opening = 0
+    lowest = highest = None
+    for profile in profiles:
+        boards += 1
+        bbbv += profile["3bv"]
+        openings += profile["openings"]
+        isolated_numbers += profile["isolated_numbers"]
+        largest_opening += max(profile["opening_sizes"], default=0)
+        if lowest is None or profile["3bv"] < lowest:
+            lowest = profile["3bv"]
+        if highest is None or profile["3bv"] > highest:
+            highest = profile["3bv"]
+    divisor = boards or 1
+    return {
+        "boards": boards,
+        "mean_3bv": bbbv / divisor,
+        "min_3bv": lowest,
+        "max_3bv": highest,
+        "mean_openings": openings / divisor,
+        "mean_isolated_numbers": isolated_numbers / divisor,
+        "mean_largest_opening": largest_opening / divisor,
+    }
+
+
+def run_batch(
+    games: int,
+    preset="Beginner",
+    seed=0,
+    move_source=random_moves,
+    board_class=Board,
+    processes=None,
+    chunksize=64,
+    metrics=False,
+):
+    """
+    Plays many headless games across a pool of worker processes.
+
+    Args:
+        games (int): The number of games to play.
+        preset (str or tuple, optional): A key of game_options, or a (width, height, mines) tuple. Defaults to "Beginner".
+        seed (int, optional): The seed of the first game. Game i is played with seed + i. Defaults to 0.
+        move_source (callable, optional): The move source passed to play_headless. It must be picklable,
+                                          e.g. a module-level function. Defaults to random_moves.
+        board_class (type, optional): The board implementation to play on. Defaults to Board.
+        processes (int, optional): The number of worker processes. Defaults to the number of CPUs.
+                                   Use 1 to play every game in the current process.
+        chunksize (int, optional): The number of games sent to a worker at a time. Defaults to 64.
+        metrics (bool, optional): If True, the boards are measured too and their metrics summarized. Defaults to False.
+
+    Returns:
+        dict: The statistics from summarize, plus "seconds" for the wall-clock time of the whole batch.
+    """
+    width, height, mines = game_options[preset] if isinstance(preset, str) else preset
+    jobs = [
+        (width, height, mines, seed + i, move_source, board_class, metrics)
+        for i in range(games)
+    ]
+
+    start = perf_counter()
+    if processes == 1:
+        results = [_play_headless_args(job) for job in jobs]
+    else:
+        with Pool(processes) as pool:
+            results = list(
+                pool.imap_unordered(_play_headless_args, jobs, chunksize=chunksize)
+            )
+
+    stats = summarize(results)
+    stats["seconds"] = perf_counter() - start
+    return stats
+
+
+def profile_boards(
+    count: int,
+    preset="Beginner",
+    seed=0,
+    board_class=Board,
+    processes=None,
+    chunksize=256,
+):
+    """
+    Generates and measures many boards across a pool of worker processes, without playing them.
+
+    Each process reuses one board, reset for every seed, so no board is allocated per profile.
+
+    Args:
+        count (int): The number of boards to measure.
+        preset (str or tuple, optional): A key of game_options, or a (width, height, mines) tuple. Defaults to "Beginner".
+        seed (int, optional): The seed of the first board. Board i is generated with seed + i. Defaults to 0.
+        board_class (type, optional): The board implementation to generate. Defaults to Board.
+        processes (int, optional): The number of worker processes. Defaults to the number of CPUs.
+                                   Use 1 to measure every board in the current process.
+        chunksize (int, optional): The number of boards sent to a worker at a time. Defaults to 256.
+
+    Yields:
+        dict: The dictionary of BoardMetrics.as_dict for each board, plus its "seed", in seed order.
+    """
+    width, height, mines = game_options[preset] if isinstance(preset, str) else preset
+    jobs = ((width, height, mines, seed + i, board_class) for i in range(count))
+
+    if processes == 1:
+        yield from map(_measure_args, jobs)
+        return
+    with Pool(processes) as pool:
+        yield from pool.imap(_measure_args, jobs, chunksize=chunksize)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Play Minesweeper games headlessly.")
+    parser.add_argument("--preset", choices=list(game_options), default="Beginner")
+    parser.add_argument("--games", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--processes", type=int, default=None)
+    parser.add_argument("--moves", choices=list(move_sources), default="random")
+    parser.add_argument(
+        "--metrics", action="store_true", help="also summarize the board metrics"
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="only generate and measure the boards, without playing them",
+    )
+    args = parser.parse_args()
+
+    if args.profile:
+        start = perf_counter()
+        stats = summarize_metrics(
+            profile_boards(args.games, args.preset, args.seed, processes=args.processes)
+        )
+        stats["seconds"] = perf_counter() - start
+    else:
+        stats = run_batch(
+            args.games,
+            args.preset,
+            args.seed,
+            move_sources[args.moves],
+            processes=args.processes,
+            metrics=args.metrics,
+        )
+    print(json.dumps(stats, indent=2))
@@ -0,0 +1,411 @@
+"""
+Saving and loading games in a compact binary format.
+
+A snapshot file holds, in order:
+
+- A header: the magic bytes b"MSWP", the format version, the header size, flags, the board width,
+  height and number of mines, the number of games played, the board seed and, from version 2, the
+  chunk size of a ChunkedBoard (0 for other boards). Readers skip header bytes they do not know, so
+  later versions can add fields at the end of the header.
+- The mine bitmap: one bit per cell, cell i being bit i % 8 of byte i // 8.
+- The state array: two bits per cell (HIDDEN, REVEALED or FLAGGED), cell i being bits
+  2 * (i % 4) and up of byte i // 4.
+
+Cells are numbered by flat index, row * width + col. A Beginner board takes 40 + 11 + 21 bytes.
+"""
+
+import mmap
+import struct
+
+from array_board import CELL_CHARS, FLAGGED, HIDDEN, MINE, REVEALED
+from board import Board
+from chunked_board import ChunkedBoard
+from game import Game
+from placement import place_mines
+
+MAGIC = b"MSWP"
+VERSION = 2
+
+HEADER = struct.Struct("<4sHHIIIIIQ")
+# Fields added to the end of the header by version 2
+CHUNK_HEADER = struct.Struct("<I")
+
+HAS_SEED = 1
+OPENED = 2
+FIRST_CLICK_SAFE = 4
+
+STATE_CODES = bytes.maketrans(b"*F 12345678M", b"\0\2" + b"\1" * 10)
+
+
+def pack_board(board, games_played=0) -> bytes:
+    """
+    Packs a board into the snapshot format.
+
+    Args:
+        board (Board): The board to pack.
+        games_played (int, optional): The number of games played, stored for Game. Defaults to 0.
+
+    Returns:
+        bytes: The snapshot.
+    """
+    cells = board.width * board.height
+
+    flags = 0
+    seed = 0
+    if isinstance(board.seed, int) and 0 <= board.seed < 2**64:
+        flags |= HAS_SEED
+        seed = board.seed
+    if board.opened:
+        flags |= OPENED
+    if board.first_click_safe:
+        flags |= FIRST_CLICK_SAFE
+
+    header = HEADER.pack(
+        MAGIC,
+        VERSION,
+        HEADER.size + CHUNK_HEADER.size,
+        flags,
+        board.width,
+        board.height,
+        board.mines,
+        games_played,
+        seed,
+    ) + CHUNK_HEADER.pack(getattr(board, "chunk_size", 0))
+
+    mines = bytearray((cells + 7) // 8)
+    for row, col in board.mine_cells:
+        index = row * board.width + col
+        mines[index >> 3] |= 1 << (index & 7)
+
+    codes = b"".join(
+        "".join(board.get_row(row)).encode().translate(STATE_CODES)
+        for row in range(board.height)
+    )
+    codes += bytes(-len(codes) % 4)
+    states = bytes(
+        a | b << 2 | c << 4 | d << 6
+        for a, b, c, d in zip(codes[0::4], codes[1::4], codes[2::4], codes[3::4])
+    )
+
+    return header + mines + states
+
+
+def save(board, path, games_played=0):
+    """
+    Writes a snapshot of a board to a file.
+
+    Args:
+        board (Board): The board to save.
+        path (str): The file to write.
+        games_played (int, optional): The number of games played, stored for Game. Defaults to 0.
+    """
+    with open(path, "wb") as file:
+        file.write(pack_board(board, games_played))
+
+
+def save_game(game, path):
+    """
+    Writes a snapshot of a game to a file.
+
+    Args:
+        game (Game): The game to save.
+        path (str): The file to write.
+    """
+    save(game.board, path, game.games_played)
+
+
+class Snapshot:
+    def __init__(self, data):
+        """
+        Reads a snapshot without unpacking it.
+
+        Only the header is parsed. Cells are read from the underlying buffer when they are asked for,
+        so a snapshot opened through mmap costs the same however large the board is.
+
+        Args:
+            data (bytes-like): The snapshot, e.g. bytes or an mmap.
+
+        Raises:
+            ValueError: If the data is not a snapshot, is truncated, or was written by a newer version.
+
+        Attributes:
+            data (bytes-like): The snapshot.
+            version (int): The format version of the snapshot.
+            width (int): The number of columns in the game board.
+            height (int): The number of rows in the game board.
+            mines (int): The number of mines on the game board.
+            games_played (int): The number of games played.
+            seed (int): The seed of the board, or None if it was not stored.
+            chunk_size (int): The chunk size of a saved ChunkedBoard, or None for other boards and version 1 snapshots.
+            opened (bool): Whether a cell had been revealed.
+            first_click_safe (bool): Whether the board was first-click safe.
+        """
+        if len(data) < HEADER.size:
+            raise ValueError("Not a Minesweeper snapshot: the file is too short.")
+        (
+            magic,
+            self.version,
+            header_size,
+            flags,
+            self.width,
+            self.height,
+            self.mines,
+            self.games_played,
+            seed,
+        ) = HEADER.unpack_from(data)
+        if magic != MAGIC:
+            raise ValueError("Not a Minesweeper snapshot: bad magic bytes.")
+        if self.version > VERSION:
+            raise ValueError(
+                f"Snapshot version {self.version} is newer than the supported version {VERSION}."
+            )
+
+        self.chunk_size = None
+        if header_size >= HEADER.size + CHUNK_HEADER.size:
+            (self.chunk_size,) = CHUNK_HEADER.unpack_from(data, HEADER.size)
+            self.chunk_size = self.chunk_size or None
+
+        cells = self.width * self.height
+        self.mines_offset = header_size
+        self.states_offset = self.mines_offset + (cells + 7) // 8
+        if len(data) < self.states_offset + (cells + 3) // 4:
+            raise ValueError("Snapshot is truncated.")
+
+        self.data = data
+        self.seed = seed if flags & HAS_SEED else None
+        self.opened = bool(flags & OPENED)
+        self.first_click_safe = bool(flags & FIRST_CLICK_SAFE)
+
+    def close(self):
+        """
+        Closes the underlying buffer if it is a mapping. The snapshot cannot be read afterwards.
+        """
+        if hasattr(self.data, "close"):
+            self.data.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def is_mine(self, row: int, col: int) -> bool:
+        """
+        Checks if the cell at the given row and column contains a mine.
+        """
+        index = row * self.width + col
+        return bool(self.data[self.mines_offset + (index >> 3)] >> (index & 7) & 1)
+
+    def state(self, row: int, col: int) -> int:
+        """
+        Returns HIDDEN, REVEALED or FLAGGED for the cell at the given row and column.
+        """
+        index = row * self.width + col
+        return self.data[self.states_offset + (index >> 2)] >> 2 * (index & 3) & 3
+
+    def get_cell_value(self, row: int, col: int, board="player_board") -> str:
+        """
+        Returns the value at a specific cell in a given board, as Board.get_cell_value does.
+
+        Adjacency counts are worked out from the mine bitmap for the cell asked for only.
+
+        Args:
+        row (int): The row number of the cell.
+        col (int): The column number of the cell.
+        board (str): The name of the board ("player_board" or "default_board").
+
+        Returns:
+        str: The value at the specified cell in the specified board.
+        """
+        if board == "player_board":
+            state = self.state(row, col)
+            if state == HIDDEN:
+                return "*"
+            elif state == FLAGGED:
+                return "F"
+        elif board != "default_board":
+            raise ValueError(
+                "Invalid board name. Must be 'player_board' or 'default_board'."
+            )
+
+        if self.is_mine(row, col):
+            return CELL_CHARS[MINE]
+        count = sum(
+            self.is_mine(r, c)
+            for r in range(max(0, row - 1), min(row + 2, self.height))
+            for c in range(max(0, col - 1), min(col + 2, self.width))
+        )
+        return CELL_CHARS[count]
+
+    def mine_indices(self):
+        """
+        Returns the flat indices of the mine cells, skipping empty bytes of the bitmap.
+        """
+        indices = []
+        start = self.mines_offset
+        for offset, byte in enumerate(self.data[start : self.states_offset]):
+            if byte:
+                for bit in range(8):
+                    if byte >> bit & 1:
+                        indices.append(offset * 8 + bit)
+        return indices
+
+    def state_indices(self):
+        """
+        Returns the flat indices of the revealed cells and of the flagged cells, skipping hidden ones.
+        """
+        revealed = []
+        flagged = []
+        cells = self.width * self.height
+        start = self.states_offset
+        packed = self.data[start : start + (cells + 3) // 4]
+        for offset, byte in enumerate(packed):
+            if byte:
+                for slot in range(4):
+                    state = byte >> 2 * slot & 3
+                    if state == REVEALED:
+                        revealed.append(offset * 4 + slot)
+                    elif state == FLAGGED:
+                        flagged.append(offset * 4 + slot)
+        return revealed, flagged
+
+    @property
+    def from_seed(self) -> bool:
+        """
+        bool: Whether the board can be rebuilt from its seed alone, i.e. it has one and was saved before its first click.
+        """
+        return not self.opened and self.seed is not None
+
+    def board_options(self, board_class=Board, from_seed=None):
+        """
+        Returns the board options that rebuild the snapshot's mines, for Board or Game.
+
+        A board saved before its first click is rebuilt from its seed alone, so that its random
+        number generator is where it was and the first click moves the mines as it would have on the
+        saved board. Other boards are given the saved mines. A ChunkedBoard places mines chunk by
+        chunk, so it is given the saved mines as a set, which each chunk converts to its own indices,
+        and the saved chunk size, so that its first click moves the same chunks as on the saved board.
+
+        Args:
+            board_class (type, optional): The board implementation the options are for. Defaults to Board.
+            from_seed (bool, optional): Whether to rebuild the mines from the seed alone. Defaults to None,
+                                        which uses the from_seed property.
+        """
+        if from_seed is None:
+            from_seed = self.from_seed
+        options = {"seed": self.seed, "first_click_safe": self.first_click_safe}
+        if issubclass(board_class, ChunkedBoard) and self.chunk_size is not None:
+            options["chunk_size"] = self.chunk_size
+        if from_seed:
+            return options
+
+        mine_indices = self.mine_indices()
+        if issubclass(board_class, ChunkedBoard):
+            options["saved_mines"] = set(mine_indices)
+        else:
+            options["placement"] = (
+                lambda rng, width, height, mines, excluded: mine_indices
+            )
+        return options
+
+    def apply(self, board):
+        """
+        Restores the revealed and flagged cells of the snapshot onto a board built with board_options.
+
+        The board's placement goes back to place_mines afterwards, so a board saved before its first
+        click is still made first-click safe when it is played. The board's cascade is built again,
+        so that it knows which regions are already partly revealed.
+        """
+        revealed, flagged = self.state_indices()
+        board.open_cells(revealed)
+        for index in flagged:
+            board.place_flag(*divmod(index, self.width))
+        board.opened = self.opened
+        board.placement = place_mines
+        board.cascade.build(board)
+
+
+def open_snapshot(path) -> Snapshot:
+    """
+    Opens a snapshot file through mmap, in constant time.
+
+    Args:
+        path (str): The snapshot file.
+
+    Returns:
+        Snapshot: A lazy view of the file. The mapping stays open until the view is closed,
+                  e.g. by using it in a with statement.
+    """
+    with open(path, "rb") as file:
+        data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+    return Snapshot(data)
+
+
+def _build_board(snapshot, board_class, board_options):
+    """
+    Builds a board with the mines, revealed cells and flags of a snapshot.
+
+    A board rebuilt from its seed is built again from the saved mines if the seed gives other mines,
+    e.g. on a board implementation that places mines differently from the saved one.
+    """
+    size = (snapshot.width, snapshot.height, snapshot.mines)
+    options = snapshot.board_options(board_class)
+    board = board_class(*size, **{**options, **board_options})
+    if snapshot.from_seed:
+        mine_indices = sorted(row * board.width + col for row, col in board.mine_cells)
+        if mine_indices != snapshot.mine_indices():
+            options = snapshot.board_options(board_class, from_seed=False)
+            board = board_class(*size, **{**options, **board_options})
+    snapshot.apply(board)
+    return board
+
+
+def load(path, board_class=Board, **board_options):
+    """
+    Rebuilds a board from a snapshot file.
+
+    Args:
+        path (str): The snapshot file.
+        board_class (type, optional): The board implementation to build. Defaults to Board.
+        **board_options: Other options passed to the board, e.g. renderer or cascade. They take precedence
+                         over the saved ones, e.g. a chunk_size given here over the saved chunk size.
+
+    Returns:
+        Board: The board, with the saved mines, revealed cells and flags.
+    """
+    with open_snapshot(path) as snapshot:
+        return _build_board(snapshot, board_class, board_options)
+
+
+def load_game(
+    path, board_class=Board, renderer=None, log_path=None, **board_options
+):
+    """
+    Rebuilds a game from a snapshot file.
+
+    The game's move log starts from the snapshot, so it replays the moves played after loading. A
+    snapshot without a seed gives a game whose move log has no seed either, since no seed rebuilds
+    its mines; such a log cannot be replayed.
+
+    Args:
+        path (str): The snapshot file.
+        board_class (type, optional): The board implementation to play on. Defaults to Board.
+        renderer (Renderer, optional): Shows the board and the game messages. Defaults to the board's TerminalRenderer.
+        log_path (str, optional): A file to stream the move log to. Defaults to None (in memory only).
+        **board_options: Other options passed to the board.
+
+    Returns:
+        Game: The game, ready for play_game.
+    """
+    with open_snapshot(path) as snapshot:
+        board = _build_board(snapshot, board_class, board_options)
+        games_played = snapshot.games_played
+        start = bytes(snapshot.data)
+    return Game(
+        (board.width, board.height, board.mines),
+        games_played,
+        renderer=renderer,
+        log_path=log_path,
+        board=board,
+        start=start,
+    )
@@ -0,0 +1,366 @@
+from probability import Component
+
+
+class Solver:
+    def __init__(self, board, max_component=None):
+        """
+        Initializes a solver that deduces safe cells and mines from what the player can see.
+
+        The solver only reads the player's game board through Board.get_cell_value. Flags are
+        treated as hidden cells, since the player may have placed them wrongly.
+
+        It listens to the board for changed cells and only re-examines the revealed cells around
+        them, so asking for a hint after a move costs time in proportion to the move, not to the board.
+
+        Args:
+            board (Board): The board to solve.
+            max_component (int, optional): The largest number of unknown cells a frontier component may
+                                           have for exact enumeration. Larger ones are left to the simpler rules.
+                                           Defaults to None, which enumerates every component.
+
+        Attributes:
+            board (Board): The board to solve.
+            max_component (int): The largest frontier component enumerated exactly, or None for no limit.
+            safe (set): The flat indices (row * width + col) of the cells proven to be safe.
+            mines (set): The flat indices of the cells proven to hold a mine.
+            frontier (set): The revealed cells that still have unknown neighbors.
+            pending (set): The revealed cells to check again with the single-cell and subset rules.
+            unenumerated (set): The revealed cells whose frontier component changed since it was last enumerated.
+            probabilities (dict): The chance of a mine for frontier cells, from the last enumeration of their component.
+        """
+        self.board = board
+        self.max_component = max_component
+        self.safe = set()
+        self.mines = set()
+        self.frontier = set()
+        self.pending = set()
+        self.unenumerated = set()
+        self.probabilities = {}
+
+        for row in range(board.height):
+            for col, value in enumerate(board.get_row(row)):
+                if value not in "*F":
+                    self.pending.add(row * board.width + col)
+
+        board.listeners.append(self.cells_changed)
+
+    def detach(self):
+        """
+        Stops listening to the board.
+        """
+        self.board.listeners.remove(self.cells_changed)
+
+    def neighbors(self, index: int):
+        """
+        Returns the flat indices of the up to 8 cells around a cell.
+        """
+        width, height = self.board.width, self.board.height
+        row, col = divmod(index, width)
+        return [
+            r * width + c
+            for r in range(max(0, row - 1), min(row + 2, height))
+            for c in range(max(0, col - 1), min(col + 2, width))
+            if r != row or c != col
+        ]
+
+    def value(self, index: int) -> str:
+        """
+        Returns the value of a cell on the player's game board.
+        """
+        return self.board.get_cell_value(*divmod(index, self.board.width))
+
+    def cells_changed(self, board, cells):
+        """
+        Queues the revealed cells around changed cells for checking. Called by the board.
+
+        Args:
+        board (Board): The board whose cells changed.
+        cells (list): The flat indices of the changed cells.
+        """
+        for index in cells:
+            if self.value(index) in "*F":
+                continue
+            self.safe.discard(index)
+            self.probabilities.pop(index, None)
+            self.pending.add(index)
+            for neighbor in self.neighbors(index):
+                if neighbor in self.frontier:
+                    self.pending.add(neighbor)
+
+    def constraint(self, index: int):
+        """
+        Returns what a revealed cell says about its neighbors.
+
+        Args:
+        index (int): The flat index of a revealed cell.
+
+        Returns:
+        tuple: The unknown neighbors (hidden and not yet deduced) and the number of mines among them.
+        """
+        value = self.value(index)
+        remaining = 0 if value == " " else int(value)
+        unknown = []
+        for neighbor in self.neighbors(index):
+            if neighbor in self.mines:
+                remaining -= 1
+            elif neighbor not in self.safe and self.value(neighbor) in "*F":
+                unknown.append(neighbor)
+        return unknown, remaining
+
+    def mark(self, cells, mine: bool):
+        """
+        Records cells as proven mines or proven safe, and queues the revealed cells around them.
+        """
+        for index in cells:
+            (self.mines if mine else self.safe).add(index)
+            self.probabilities.pop(index, None)
+            for neighbor in self.neighbors(index):
+                if neighbor in self.frontier:
+                    self.pending.add(neighbor)
+
+    def propagate(self):
+        """
+        Applies the single-cell rule, then the subset rule, to the queued cells until nothing new is found.
+
+        Single-cell rule: if a number has no mines left to find, its unknown neighbors are safe;
+        if it has as many mines left as unknown neighbors, they are all mines.
+
+        Subset rule: if the unknown neighbors of one number are all neighbors of a second number,
+        the second number's extra unknown neighbors hold the difference of their remaining mines.
+
+        Returns:
+        bool: True if any new cell was proven safe or a mine.
+        """
+        found = False
+        while self.pending:
+            index = self.pending.pop()
+            unknown, remaining = self.constraint(index)
+            if not unknown:
+                self.frontier.discard(index)
+                continue
+            self.frontier.add(index)
+            self.unenumerated.add(index)
+
+            if remaining == 0 or remaining == len(unknown):
+                self.mark(unknown, mine=remaining > 0)
+                found = True
+                continue
+
+            if self.apply_subset_rule(index, set(unknown), remaining):
+                found = True
+        return found
+
+    def apply_subset_rule(self, index: int, unknown: set, remaining: int) -> bool:
+        """
+        Compares a revealed cell with the revealed cells up to two steps away, which are the only ones
+        that can share unknown neighbors with it, and stops at the first deduction.
+
+        Args:
+        index (int): The flat index of the revealed cell.
+        unknown (set): Its unknown neighbors.
+        remaining (int): The number of mines among them.
+
+        Returns:
+        bool: True if a cell was proven safe or a mine. The revealed cell is then queued again.
+        """
+        width, height = self.board.width, self.board.height
+        row, col = divmod(index, width)
+        for r in range(max(0, row - 2), min(row + 3, height)):
+            for c in range(max(0, col - 2), min(col + 3, width)):
+                other = r * width + c
+                if other == index or other not in self.frontier:
+                    continue
+                other_unknown, other_remaining = self.constraint(other)
+                other_unknown = set(other_unknown)
+                for small, small_remaining, big, big_remaining in (
+                    (unknown, remaining, other_unknown, other_remaining),
+                    (other_unknown, other_remaining, unknown, remaining),
+                ):
+                    if not small or not small < big:
+                        continue
+                    extra = big - small
+                    extra_remaining = big_remaining - small_remaining
+                    if extra_remaining == 0 or extra_remaining == len(extra):
+                        self.mark(extra, mine=extra_remaining > 0)
+                        self.pending.add(index)
+                        return True
+        return False
+
+    def components(self, constraints):
+        """
+        Groups the frontier into independent components around some revealed cells.
+
+        Two revealed cells are in the same component when they share an unknown neighbor.
+
+        Args:
+        constraints (iterable): The revealed cells whose components are wanted.
+
+        Returns:
+        list: For each component, a list of (unknown cells, remaining mines) constraints.
+        """
+        seen = set()
+        components = []
+        for start in constraints:
+            if start in seen or start not in self.frontier:
+                continue
+            seen.add(start)
+            stack = [start]
+            component = []
+            while stack:
+                index = stack.pop()
+                unknown, remaining = self.constraint(index)
+                if not unknown:
+                    continue
+                component.append((unknown, remaining))
+                for cell in unknown:
+                    for neighbor in self.neighbors(cell):
+                        if neighbor in self.frontier and neighbor not in seen:
+                            seen.add(neighbor)
+                            stack.append(neighbor)
+            if component:
+                components.append(component)
+        return components
+
+    def enumerate_component(self, component):
+        """
+        Counts every mine layout of a frontier component that satisfies all of its numbers.
+
+        The layouts are counted with the dynamic programming of probability.Component rather than
+        one by one, so a long frontier costs time in proportion to its length, not to its layouts.
+
+        Args:
+        component (list): The (unknown cells, remaining mines) constraints of the component.
+
+        Returns:
+        tuple: The number of layouts, and for each unknown cell the number of layouts with a mine on it.
+               (0, {}) if the component has more than max_component unknown cells.
+        """
+        if self.max_component is not None:
+            cells = set()
+            for unknown, _ in component:
+                cells.update(unknown)
+            if len(cells) > self.max_component:
+                return 0, {}
+
+        counted = Component(
+            {
+                k: (remaining, frozenset(unknown))
+                for k, (unknown, remaining) in enumerate(component)
+            }
+        )
+        return sum(counted.layouts), {
+            cell: sum(poly) for cell, poly in counted.mine_layouts.items()
+        }
+
+    def enumerate(self):
+        """
+        Enumerates the frontier components that changed since they were last enumerated.
+
+        Cells that hold a mine in every layout are proven mines, cells that hold one in no layout
+        are proven safe, and the others get the fraction of layouts with a mine as their probability.
+
+        Returns:
+        bool: True if any new cell was proven safe or a mine.
+        """
+        found = False
+        changed, self.unenumerated = self.unenumerated, set()
+        for component in self.components(changed):
+            total, mine_counts = self.enumerate_component(component)
+            if not total:
+                continue
+            for cell, count in mine_counts.items():
+                if count == 0 or count == total:
+                    self.mark([cell], mine=count == total)
+                    found = True
+                else:
+                    self.probabilities[cell] = count / total
+        return found
+
+    def solve(self):
+        """
+        Brings the deductions up to date with the player's game board.
+
+        The cheap rules run first; components are only enumerated when the rules find nothing new.
+
+        Returns:
+        tuple: The (row, col) of every hidden cell proven safe, and of every cell proven to hold a mine.
+        """
+        self.propagate()
+        while not self.hidden_safe() and (self.enumerate() or self.pending):
+            self.propagate()
+
+        width = self.board.width
+        safe = sorted(divmod(index, width) for index in self.hidden_safe())
+        mines = sorted(divmod(index, width) for index in self.mines)
+        return safe, mines
+
+    def hidden_safe(self):
+        """
+        Returns the flat indices of the cells proven safe that are still hidden.
+        """
+        return [index for index in self.safe if self.value(index) in "*F"]
+
+    def hint(self):
+        """
+        Suggests the next move.
+
+        Returns:
+        tuple: (row, col, flag, probability). A proven safe cell to reveal has probability 0.0,
+               a proven mine that is not flagged yet has flag True and probability 1.0. Otherwise the
+               hidden cell least likely to hold a mine is suggested, with its estimated probability.
+               None if every cell is known.
+        """
+        safe, mines = self.solve()
+        if safe:
+            return (*safe[0], False, 0.0)
+        for row, col in mines:
+            if self.value(row * self.board.width + col) != "F":
+                return row, col, True, 1.0
+        return self.guess()
+
+    def guess(self):
+        """
+        Picks the hidden cell least likely to hold a mine, when no cell is proven safe.
+
+        Frontier cells use the probability from the enumeration of their component, or the worst ratio of
+        remaining mines to unknown cells among their numbers. Every other hidden cell gets an even share
+        of the mines not expected on the frontier.
+
+        Returns:
+        tuple: (row, col, False, probability), or None if there is no unknown hidden cell.
+        """
+        estimates = {}
+        for index in self.frontier:
+            unknown, remaining = self.constraint(index)
+            for cell in unknown:
+                ratio = remaining / len(unknown)
+                estimates[cell] = max(estimates.get(cell, 0.0), ratio)
+        estimates.update(
+            (cell, probability)
+            for cell, probability in self.probabilities.items()
+            if cell in estimates
+        )
+
+        board = self.board
+        wrong_flags = len(board.flagged_indices) - board.flagged_correct
+        hidden = board.hidden_safe_cells + board.mines + wrong_flags
+        interior = hidden - len(estimates) - len(self.mines) - len(self.hidden_safe())
+        interior_mines = board.mines - len(self.mines) - sum(estimates.values())
+
+        best = min(estimates.items(), key=lambda item: item[1], default=None)
+        if interior > 0:
+            probability = min(1.0, max(0.0, interior_mines / interior))
+            if best is None or probability < best[1]:
+                for index in range(board.width * board.height):
+                    if (
+                        index not in estimates
+                        and index not in self.mines
+                        and index not in self.safe
+                        and self.value(index) in "*F"
+                    ):
+                        best = (index, probability)
+                        break
+
+        if best is None:
+            return None
+        return (*divmod(best[0], board.width), False, best[1])
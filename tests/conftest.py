@@ -0,0 +1,29 @@
+import os
+import sys
+
+import pytest
+
+# The modules live at the top of the repository, next to main.py
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def board_classes():
+    """
+    Returns every board implementation that can run here; ArrayBoard needs numpy.
+    """
+    from array_board import ArrayBoard, np
+    from board import Board
+    from chunked_board import ChunkedBoard
+
+    classes = [Board, ChunkedBoard]
+    if np is not None:
+        classes.append(ArrayBoard)
+    return classes
+
+
+@pytest.fixture(params=board_classes(), ids=lambda board_class: board_class.__name__)
+def board_class(request):
+    """
+    Runs a test once on every board implementation.
+    """
+    return request.param
@@ -0,0 +1,104 @@
+import json
+
+import pytest
+
+import array_board
+from benchmarks import benchmark_board, benchmark_startup, compare, configurations, main
+from board import Board
+
+RESULT_KEYS = {
+    "benchmark",
+    "board",
+    "width",
+    "height",
+    "mines",
+    "seconds_min",
+    "seconds_mean",
+    "repeats",
+}
+
+
+def check_results(results):
+    for result in results:
+        assert set(result) == RESULT_KEYS
+        assert result["repeats"] == 1
+        assert 0 <= result["seconds_min"] <= result["seconds_mean"]
+
+
+@pytest.mark.parametrize(
+    "board_class",
+    [Board] + ([array_board.ArrayBoard] if array_board.np is not None else []),
+)
+def test_benchmark_board_runs_every_benchmark(board_class):
+    results = benchmark_board(board_class, 9, 9, 10, repeat=1, budget=0)
+    check_results(results)
+    names = [result["benchmark"] for result in results]
+    assert len(names) == len(set(names))
+    assert {
+        "init",
+        "initialize_default_board",
+        "cascade_typical_DfsCascade",
+        "cascade_worst_RegionCascade",
+        "check_win",
+        "check_win_scan",
+        "flag_cycle_100",
+        "draw_game_board",
+    } <= set(names)
+    assert all(result["board"] == board_class.__name__ for result in results)
+    assert all((result["width"], result["height"]) == (9, 9) for result in results)
+
+
+def test_benchmark_startup_runs_every_benchmark():
+    results = benchmark_startup(repeat=1, budget=0)
+    check_results(results)
+    assert [result["benchmark"] for result in results] == [
+        "startup_python",
+        "startup_import_main",
+        "startup_headless",
+        "startup_greeting",
+    ]
+
+
+def test_configurations_and_compare():
+    boards = configurations(["100x100"])
+    assert boards[:3] == [
+        ("Beginner", 9, 9, 10),
+        ("Intermediate", 16, 16, 40),
+        ("Expert", 16, 30, 99),
+    ]
+    assert [label for label, *_ in boards[3:]] == [
+        "100x100@0.05",
+        "100x100@0.12",
+        "100x100@0.2",
+    ]
+
+    results = benchmark_board(Board, 9, 9, 10, repeat=1, budget=0)
+    baseline = [
+        dict(result, seconds_min=result["seconds_min"] / 4) for result in results
+    ]
+    regressions = compare(results, baseline, threshold=1.25)
+    assert len(regressions) == len(results)
+    assert all(ratio == pytest.approx(4) for ratio, _ in regressions)
+    assert compare(results, results, threshold=1.25) == []
+
+
+def test_main_writes_a_report(tmp_path, monkeypatch):
+    output = tmp_path / "report.json"
+    monkeypatch.setattr(
+        "sys.argv",
+        [
+            "benchmarks.py",
+            "--sizes",
+            "--repeat",
+            "1",
+            "--budget",
+            "0",
+            "--no-startup",
+            "--output",
+            str(output),
+        ],
+    )
+    assert main() == 0
+    report = json.loads(output.read_text())
+    check_results(report["results"])
+    assert {result["width"] for result in report["results"]} == {9, 16}
@@ -0,0 +1,122 @@
+from random import Random
+
+import pytest
+
+from chunked_board import ChunkedBoard
+from renderer import NullRenderer
+
+
+def new_board(board_class, seed, **options):
+    if board_class is ChunkedBoard:
+        options.setdefault("chunk_size", 8)
+    return board_class(20, 12, 30, seed=seed, renderer=NullRenderer(), **options)
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_win_counters_follow_every_move(board_class, seed):
+    board = new_board(board_class, seed, first_click_safe=seed % 2 == 0)
+    rng = Random(seed)
+    for _ in range(150):
+        row, col = rng.randrange(board.height), rng.randrange(board.width)
+        action = rng.random()
+        if action < 0.3:
+            if board.is_flagged(row, col):
+                board.clear_flag(row, col)
+            elif board.get_cell_value(row, col) == "*":
+                board.place_flag(row, col)
+        elif not board.is_flagged(row, col) and not board.is_mine(row, col):
+            board.uncover(row, col)
+        board.verify_counters()
+        assert board.check_win() == board.check_win_scan()
+
+
+def test_revealing_every_safe_cell_wins(board_class):
+    board = new_board(board_class, 1)
+    for row in range(board.height):
+        for col in range(board.width):
+            assert not board.check_win()
+            if not board.is_mine(row, col):
+                board.uncover(row, col)
+            if board.hidden_safe_cells == 0:
+                break
+    assert board.check_win()
+    assert board.check_win_scan()
+
+
+def test_flagging_exactly_the_mines_wins(board_class):
+    board = new_board(board_class, 2)
+    mines = board.mine_cells
+    for row, col in mines[:-1]:
+        board.place_flag(row, col)
+    assert not board.check_win()
+
+    # A wrong flag spoils the win until it is removed
+    safe = next(
+        (row, col)
+        for row in range(board.height)
+        for col in range(board.width)
+        if not board.is_mine(row, col)
+    )
+    board.place_flag(*mines[-1])
+    board.place_flag(*safe)
+    assert not board.check_win()
+    board.clear_flag(*safe)
+    assert board.check_win()
+    board.verify_counters()
+
+
+def test_reset_restores_the_counters(board_class):
+    board = new_board(board_class, 3)
+    board.place_flag(*board.mine_cells[0])
+    board.reset(4)
+    board.verify_counters()
+    assert board.hidden_safe_cells == board.width * board.height - board.mines
+    assert board.flagged_correct == 0
+
+
+def test_set_cell_value_is_kept(board_class):
+    board = new_board(board_class, 3)
+    row, col = next(
+        (row, col)
+        for row in range(board.height)
+        for col in range(board.width)
+        if not board.is_mine(row, col)
+    )
+    board.set_cell_value(row, col, board.get_cell_value(row, col, "default_board"))
+    assert board.get_cell_value(row, col) == board.get_row(row, "default_board")[col]
+    assert board.get_row(row)[col] == board.get_cell_value(row, col)
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_first_click_in_a_one_cell_chunk_is_safe(seed):
+    # The bottom-right chunk of a 65x65 board holds only the corner cell
+    board = ChunkedBoard(
+        65, 65, 800, seed=seed, first_click_safe=True, renderer=NullRenderer()
+    )
+    board.uncover(64, 64)
+    for row in (63, 64):
+        for col in (63, 64):
+            assert not board.is_mine(row, col)
+    assert len(board.mine_cells) == board.mines
+    board.verify_counters()
+
+
+def test_no_chunked_cell_is_always_a_mine():
+    corner = [
+        ChunkedBoard(65, 65, 800, seed=seed, renderer=NullRenderer()).is_mine(64, 64)
+        for seed in range(100)
+    ]
+    assert any(corner) and not all(corner)
+
+
+@pytest.mark.parametrize("seed", [5, 8, 9])
+def test_first_click_moves_mines_out_of_a_full_chunk(seed):
+    # On these seeds the one-cell corner chunk holds a mine that must move
+    board = ChunkedBoard(
+        5, 5, 5, seed=seed, chunk_size=4, first_click_safe=True, renderer=NullRenderer()
+    )
+    board.uncover(4, 4)
+    assert any(board.count_shifts.values())
+    assert not board.is_mine(4, 4)
+    assert len(board.mine_cells) == board.mines
+    board.verify_counters()
@@ -0,0 +1,65 @@
+import pytest
+
+from board import Board
+from board_config import (
+    board_class_named,
+    board_type_of,
+    custom_options,
+    parse_options,
+    select_board_class,
+)
+from chunked_board import ChunkedBoard
+
+
+@pytest.mark.parametrize(
+    "text, options",
+    [
+        ("30 16 99", (30, 16, 99)),
+        ("30x16 99", (30, 16, 99)),
+        ("  10 10   0.15 ", (10, 10, 15)),
+        ("10 10 0.001", (10, 10, 1)),
+    ],
+)
+def test_parse_options(text, options):
+    assert parse_options(text) == options
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "",
+        "30 16",
+        "30 16 99 1",
+        "a b c",
+        "30 16 x",
+        "1 16 5",
+        "9 9 0",
+        "9 9 65",
+        "9 9 1.0",
+    ],
+)
+def test_parse_options_rejects(text):
+    with pytest.raises(ValueError):
+        parse_options(text)
+
+
+def test_custom_options_needs_mines_or_density():
+    with pytest.raises(ValueError):
+        custom_options(9, 9)
+    with pytest.raises(ValueError):
+        custom_options(9, 9, mines=10, density=0.1)
+
+
+def test_chunked_boards_hold_mines_in_every_cell():
+    assert custom_options(9, 9, 81, board_class=ChunkedBoard) == (9, 9, 81)
+    with pytest.raises(ValueError):
+        custom_options(9, 9, 81, board_class=Board)
+
+
+def test_board_class_follows_the_size():
+    assert select_board_class(30, 16) is Board
+    assert select_board_class(10_000, 10_000) is ChunkedBoard
+    for name in ("list", "chunked"):
+        assert board_type_of(board_class_named(name, 9, 9)) == name
+    with pytest.raises(ValueError):
+        board_class_named("grid", 9, 9)
@@ -0,0 +1,124 @@
+from random import Random
+
+import pytest
+
+from board import Board
+from board_metrics import measure, region_bounds
+from chunked_board import ChunkedBoard
+from renderer import NullRenderer
+
+
+def flood_fill(board):
+    """
+    Returns the opening sizes and isolated numbers of a board, found by flood-filling every opening.
+    """
+    width, height = board.width, board.height
+    grid = [board.get_row(row, "default_board") for row in range(height)]
+    seen = set()
+    sizes = []
+    bordered = set()
+    for row in range(height):
+        for col in range(width):
+            if grid[row][col] != " " or (row, col) in seen:
+                continue
+            seen.add((row, col))
+            stack = [(row, col)]
+            cells = {(row, col)}
+            border = set()
+            while stack:
+                r, c = stack.pop()
+                for i in range(max(0, r - 1), min(height, r + 2)):
+                    for j in range(max(0, c - 1), min(width, c + 2)):
+                        if grid[i][j] == " " and (i, j) not in seen:
+                            seen.add((i, j))
+                            cells.add((i, j))
+                            stack.append((i, j))
+                        elif grid[i][j] not in " M":
+                            border.add((i, j))
+            sizes.append(len(cells) + len(border))
+            bordered |= border
+    isolated = sum(
+        grid[row][col] not in " M" and (row, col) not in bordered
+        for row in range(height)
+        for col in range(width)
+    )
+    return sizes, isolated
+
+
+@pytest.mark.parametrize("seed", range(40))
+def test_metrics_match_flood_fill(board_class, seed):
+    rng = Random(seed)
+    width, height = rng.randint(1, 30), rng.randint(1, 30)
+    options = {"renderer": NullRenderer(), "seed": seed}
+    if board_class is ChunkedBoard:
+        options["chunk_size"] = 7
+        limit = width * height
+    else:
+        limit = (width - 1) * (height - 1)
+    board = board_class(width, height, rng.randint(0, limit), **options)
+
+    metrics = board.metrics()
+    sizes, isolated = flood_fill(board)
+    assert sorted(metrics.opening_sizes) == sorted(sizes)
+    assert metrics.isolated_numbers == isolated
+    assert metrics.bbbv == len(sizes) + isolated
+    assert metrics.openings == len(sizes)
+
+
+def test_known_board():
+    # Mines on the diagonal of a 4x4 board, no exclusion zone
+    mines = [0, 5, 10, 15]
+    board = Board(
+        4,
+        4,
+        4,
+        excluded=set(),
+        renderer=NullRenderer(),
+        placement=lambda rng, width, height, count, excluded: mines,
+    )
+    metrics = board.metrics()
+    # Two openings: the top right and bottom left corners, each with its three numbers
+    assert metrics.opening_sizes == [4, 4]
+    assert metrics.isolated_numbers == 4
+    assert metrics.bbbv == 6
+    assert metrics.density == 0.25
+
+
+def test_region_density_adds_up():
+    board = Board(30, 16, 99, seed=1, renderer=NullRenderer())
+    metrics = board.metrics()
+    rows, cols = region_bounds(16, 3), region_bounds(30, 3)
+    mines = sum(
+        density * rows.count(i) * cols.count(j)
+        for i, row in enumerate(metrics.region_density)
+        for j, density in enumerate(row)
+    )
+    assert mines == pytest.approx(99)
+
+
+def test_metrics_are_cached_until_the_mines_change():
+    board = Board(
+        9, 9, 30, seed=3, first_click_safe=True, excluded=set(), renderer=NullRenderer()
+    )
+    assert board.is_mine(4, 4)
+    metrics = board.metrics()
+    assert board.metrics() is metrics
+
+    # The first click moves the mine away
+    board.uncover(4, 4)
+    assert board.metrics() is not metrics
+    sizes, isolated = flood_fill(board)
+    assert board.metrics().bbbv == len(sizes) + isolated
+
+    metrics = board.metrics()
+    board.reset(2)
+    assert board.cached_metrics is None
+    assert board.metrics() is not metrics
+
+
+def test_precomputed_metrics():
+    board = Board(9, 9, 10, seed=1, renderer=NullRenderer(), precompute_metrics=True)
+    assert board.cached_metrics is not None
+    board.reset(2)
+    assert board.cached_metrics is not None
+    assert measure(board).bbbv == board.metrics().bbbv
@@ -0,0 +1,83 @@
+import pytest
+
+from board import Board
+from board_pool import BoardPool
+from game import Game
+from renderer import NullRenderer
+from replay import Replay
+
+
+def rows(board, name="player_board"):
+    return [list(board.get_row(row, name)) for row in range(board.height)]
+
+
+@pytest.mark.parametrize("background", [False, True])
+def test_pooled_boards_are_fresh_and_seeded(background):
+    pool = BoardPool(
+        16, 16, 40, seed=1, background=background, renderer=NullRenderer()
+    )
+    try:
+        board = pool.acquire()
+        game = Game((16, 16, 40), 1, board=board)
+        game.play_move(8, 8, False)
+        game.play_move(2, 2, True)
+        pool.release(board)
+
+        for _ in range(4):
+            board = pool.acquire()
+            assert isinstance(board.seed, int)
+            fresh = Board(16, 16, 40, seed=board.seed, renderer=NullRenderer())
+            assert rows(board) == rows(fresh)
+            assert rows(board, "default_board") == rows(fresh, "default_board")
+            assert not board.flagged_indices and not board.opened
+            assert board.hidden_safe_cells == fresh.hidden_safe_cells
+            pool.release(board)
+    finally:
+        pool.close()
+
+
+def test_seeded_pools_deal_the_same_boards():
+    pools = [BoardPool(9, 9, 10, seed=5, renderer=NullRenderer()) for _ in range(2)]
+    try:
+        for _ in range(3):
+            boards = [pool.acquire() for pool in pools]
+            assert boards[0].seed == boards[1].seed
+            assert boards[0].mine_indices == boards[1].mine_indices
+            for pool, board in zip(pools, boards):
+                pool.release(board)
+    finally:
+        for pool in pools:
+            pool.close()
+
+
+def test_pooled_games_replay():
+    pool = BoardPool(9, 9, 10, seed=2, renderer=NullRenderer())
+    try:
+        board = pool.acquire()
+        game = Game((9, 9, 10), 1, board=board)
+        for row in range(1, 10):
+            for col in range(1, 10):
+                if game.playing and not board.is_mine(row - 1, col - 1):
+                    game.play_move(row, col, False)
+        assert board.check_win()
+        assert rows(Replay(game.move_log).run().board) == rows(board)
+    finally:
+        pool.close()
+
+
+def test_pool_refills_after_a_board_is_taken():
+    pool = BoardPool(9, 9, 10, size=2, seed=3, renderer=NullRenderer())
+    try:
+        first = pool.acquire()
+        second = pool.acquire()
+        third = pool.acquire()
+        assert len({id(first), id(second), id(third)}) == 3
+        assert len({first.seed, second.seed, third.seed}) == 3
+        # The background thread fills the queue back up to its size
+        for _ in range(200):
+            if pool.ready.full():
+                break
+            pool.thread.join(timeout=0.01)
+        assert pool.ready.full()
+    finally:
+        pool.close()
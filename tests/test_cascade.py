@@ -0,0 +1,168 @@
+from random import Random
+
+import pytest
+
+from cascade import DfsCascade, RegionCascade
+from renderer import NullRenderer
+
+
+def player_rows(board):
+    return [board.get_row(row) for row in range(board.height)]
+
+
+def play_both(board_class, seed, moves=80, flag_share=0.25):
+    """
+    Plays the same random moves on a board with each engine, checking that they stay identical.
+    """
+    boards = [
+        board_class(
+            30, 16, 30, seed=seed, cascade=cascade, renderer=NullRenderer(), debug=True
+        )
+        for cascade in (DfsCascade(), RegionCascade())
+    ]
+    rng = Random(seed)
+    for _ in range(moves):
+        row, col = rng.randrange(16), rng.randrange(30)
+        action = rng.random()
+        for board in boards:
+            if action < flag_share:
+                if board.is_flagged(row, col):
+                    board.clear_flag(row, col)
+                elif board.get_cell_value(row, col) == "*":
+                    board.place_flag(row, col)
+            elif not board.is_flagged(row, col):
+                board.reveal_cell(row, col)
+        reference, region = boards
+        assert player_rows(region) == player_rows(reference)
+        assert region.hidden_safe_cells == reference.hidden_safe_cells
+        assert region.check_win() == reference.check_win()
+
+
+@pytest.mark.parametrize("seed", range(30))
+def test_region_cascade_matches_dfs(board_class, seed):
+    play_both(board_class, seed)
+
+
+@pytest.mark.parametrize("seed", range(30))
+def test_region_cascade_matches_dfs_with_flags_in_regions(board_class, seed):
+    # Flag empty cells first, so that flags cut regions before they are opened
+    boards = [
+        board_class(30, 16, 30, seed=seed, cascade=cascade, renderer=NullRenderer())
+        for cascade in (DfsCascade(), RegionCascade())
+    ]
+    rng = Random(seed)
+    empty = [
+        (row, col)
+        for row in range(16)
+        for col in range(30)
+        if boards[0].get_cell_value(row, col, "default_board") == " "
+    ]
+    flags = rng.sample(empty, min(6, len(empty)))
+    for board in boards:
+        for row, col in flags:
+            board.place_flag(row, col)
+
+    for row, col in rng.sample(empty, min(10, len(empty))):
+        for board in boards:
+            if not board.is_flagged(row, col):
+                board.reveal_cell(row, col)
+        assert player_rows(boards[1]) == player_rows(boards[0])
+
+    # Removing the flags and opening again reaches the cells the flags cut off
+    for row, col in flags:
+        for board in boards:
+            board.clear_flag(row, col)
+            board.reveal_cell(row, col)
+        assert player_rows(boards[1]) == player_rows(boards[0])
+    for board in boards:
+        board.verify_counters()
+
+
+@pytest.mark.parametrize("seed", range(30))
+def test_region_cascade_matches_dfs_after_removing_several_flags(board_class, seed):
+    # Once every flag is gone, the parts the flags cut off only touch the opened part through revealed cells
+    boards = [
+        board_class(30, 16, 30, seed=seed, cascade=cascade, renderer=NullRenderer())
+        for cascade in (DfsCascade(), RegionCascade())
+    ]
+    rng = Random(seed)
+    empty = [
+        (row, col)
+        for row in range(16)
+        for col in range(30)
+        if boards[0].get_cell_value(row, col, "default_board") == " "
+    ]
+    flags = rng.sample(empty, min(3, len(empty)))
+    clicks = rng.sample(empty, min(3, len(empty)))
+    for board in boards:
+        for row, col in flags:
+            board.place_flag(row, col)
+        for row, col in clicks:
+            if not board.is_flagged(row, col):
+                board.reveal_cell(row, col)
+        for row, col in flags:
+            board.clear_flag(row, col)
+
+    for row, col in flags:
+        for board in boards:
+            board.reveal_cell(row, col)
+        assert player_rows(boards[1]) == player_rows(boards[0])
+        assert boards[1].hidden_safe_cells == boards[0].hidden_safe_cells
+    for board in boards:
+        board.verify_counters()
+
+
+def test_regions_are_labeled_when_clicked(board_class):
+    engine = RegionCascade()
+    board = board_class(30, 16, 30, seed=4, cascade=engine, renderer=NullRenderer())
+    assert engine.empty is None and not engine.regions
+
+    mask = board.empty_mask()
+    assert list(mask) == [
+        value == " "
+        for row in range(16)
+        for value in board.get_row(row, "default_board")
+    ]
+    index = mask.index(1)
+    board.reveal_cell(*divmod(index, 30))
+    assert len(engine.regions) == 1
+    assert all(
+        board.get_cell_value(*divmod(cell, 30)) != "*" for cell in engine.regions[0]
+    )
+
+    board.reset(5)
+    assert engine.empty is None and not engine.regions
+
+
+@pytest.mark.parametrize("seed", range(30))
+def test_region_cascade_matches_dfs_after_hiding_revealed_cells(board_class, seed):
+    # Flagging a revealed cell and removing the flag hides it again
+    boards = [
+        board_class(30, 16, 30, seed=seed, cascade=cascade, renderer=NullRenderer())
+        for cascade in (DfsCascade(), RegionCascade())
+    ]
+    empty = [
+        (row, col)
+        for row in range(16)
+        for col in range(30)
+        if boards[0].get_cell_value(row, col, "default_board") == " "
+    ]
+    for board in boards:
+        board.reveal_cell(*empty[0])
+    opened = [cell for cell in empty if boards[0].get_cell_value(*cell) == " "]
+    hidden = [opened[0]]
+    hidden += [
+        (row, col)
+        for row, col in opened
+        if abs(row - hidden[0][0]) > 2 or abs(col - hidden[0][1]) > 2
+    ][:1]
+
+    for board in boards:
+        for row, col in hidden:
+            board.place_flag(row, col)
+            board.clear_flag(row, col)
+    for row, col in hidden:
+        for board in boards:
+            board.reveal_cell(row, col)
+        assert player_rows(boards[1]) == player_rows(boards[0])
+        assert boards[1].hidden_safe_cells == boards[0].hidden_safe_cells
@@ -0,0 +1,135 @@
+from game import Game
+from input_sources import CHORD
+from renderer import NullRenderer
+
+
+def new_game(seed=3):
+    return Game((9, 9, 10), 1, renderer=NullRenderer(), seed=seed)
+
+
+def numbered_cell(board):
+    """
+    Returns a revealed number with at least one hidden safe neighbor, after opening the board.
+    """
+    for row in range(board.height):
+        for col in range(board.width):
+            if board.get_cell_value(row, col) not in "12345678":
+                continue
+            neighbors = [
+                (r, c)
+                for r in range(max(0, row - 1), min(row + 2, board.height))
+                for c in range(max(0, col - 1), min(col + 2, board.width))
+            ]
+            if any(
+                board.get_cell_value(r, c) == "*" and not board.is_mine(r, c)
+                for r, c in neighbors
+            ):
+                return row, col, neighbors
+    return None
+
+
+def opened_game():
+    for seed in range(100):
+        game = new_game(seed)
+        game.play_move(1, 1, False)
+        found = numbered_cell(game.board)
+        if found is not None:
+            return game, found
+    raise AssertionError("no board with a number to chord")
+
+
+def test_chord_reveals_the_other_neighbors():
+    game, (row, col, neighbors) = opened_game()
+    board = game.board
+    for r, c in neighbors:
+        if board.is_mine(r, c):
+            board.place_flag(r, c)
+    game.play_move(row + 1, col + 1, CHORD)
+
+    assert game.playing
+    for r, c in neighbors:
+        expected = (
+            "F" if board.is_mine(r, c) else board.get_cell_value(r, c, "default_board")
+        )
+        assert board.get_cell_value(r, c) == expected
+    board.verify_counters()
+
+
+def test_chord_with_a_wrong_flag_loses():
+    for seed in range(100):
+        game = new_game(seed)
+        game.play_move(1, 1, False)
+        board = game.board
+        found = numbered_cell(board)
+        if found is None:
+            continue
+        row, col, neighbors = found
+        mines = sum(board.is_mine(r, c) for r, c in neighbors)
+        safe = [
+            (r, c)
+            for r, c in neighbors
+            if board.get_cell_value(r, c) == "*" and not board.is_mine(r, c)
+        ]
+        # Flag safe cells instead of the mines, as many as the number asks for
+        if len(safe) <= mines:
+            continue
+        for r, c in safe[:mines]:
+            board.place_flag(r, c)
+        game.play_move(row + 1, col + 1, CHORD)
+        assert not game.playing
+        return
+    raise AssertionError("no board with a number to chord wrongly")
+
+
+def test_chord_without_enough_flags_does_nothing():
+    game, (row, col, _) = opened_game()
+    before = [game.board.get_row(r) for r in range(game.board.height)]
+    game.play_move(row + 1, col + 1, CHORD)
+    assert [game.board.get_row(r) for r in range(game.board.height)] == before
+    assert game.playing
+
+
+def test_batch_is_all_or_nothing():
+    game = new_game()
+    game.play_batch([(1, 1, False), (10, 1, False)])
+    assert len(game.move_log) == 0
+    assert game.board.get_cell_value(0, 0) == "*"
+
+    game.play_batch([(1, 1, False), (1, 2, False)])
+    assert len(game.move_log) == 1
+    assert game.board.get_cell_value(0, 0) != "*"
+    assert game.board.get_cell_value(0, 1) != "*"
+
+
+def test_batch_flags_before_revealing():
+    game = new_game()
+    mine = game.board.mine_cells[0]
+    game.play_batch([(mine[0] + 1, mine[1] + 1, True)])
+    game.play_batch([(mine[0] + 1, mine[1] + 1, False), (1, 1, False)])
+    # Revealing a flagged cell in a batch leaves the flag in place
+    assert game.playing
+    assert game.board.is_flagged(*mine)
+
+
+def test_single_reveal_of_the_last_safe_cell_wins():
+    games = [new_game(4), new_game(4)]
+    board = games[0].board
+    safe = [
+        (row + 1, col + 1)
+        for row in range(board.height)
+        for col in range(board.width)
+        if not board.is_mine(row, col)
+    ]
+    for game in games:
+        for row, col in safe[:-1]:
+            if game.board.get_cell_value(row - 1, col - 1) == "*":
+                game.play_move(row, col, False)
+        assert game.playing
+
+    row, col = safe[-1]
+    assert games[0].board.get_cell_value(row - 1, col - 1) == "*"
+    games[0].play_move(row, col, False)
+    games[1].play_batch([(row, col, False)])
+    for game in games:
+        assert game.board.check_win()
+        assert not game.playing
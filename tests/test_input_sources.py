@@ -0,0 +1,89 @@
+import pytest
+
+from input_sources import CHORD, InputSource, IteratorInput, StreamInput, parse_move
+from renderer import NullRenderer
+
+
+@pytest.mark.parametrize(
+    "text, move",
+    [
+        ("3 4", (3, 4, False)),
+        ("  3   4  ", (3, 4, False)),
+        ("3 4 f", (3, 4, True)),
+        ("3 4 FLAG", (3, 4, True)),
+        ("10 12 flag", (10, 12, True)),
+        ("0 -1", (0, -1, False)),
+    ],
+)
+def test_parse_move(text, move):
+    assert parse_move(text) == move
+
+
+@pytest.mark.parametrize("text", ["", "3", "a b", "3 4 x", "3 4 5", "3 4 f f"])
+def test_parse_move_rejects(text):
+    with pytest.raises(ValueError):
+        parse_move(text)
+
+
+def test_iterator_input_reads_lines_in_order():
+    source = IteratorInput(["1 2", "3 4 f"])
+    assert source.next_move() == (1, 2, False)
+    assert source.next_move() == (3, 4, True)
+
+
+def test_stream_input_skips_invalid_lines(tmp_path):
+    path = tmp_path / "moves.txt"
+    path.write_text("nonsense\n2 2\n")
+    with open(path) as stream:
+        source = StreamInput(stream)
+        assert source.next_move() == (2, 2, False)
+
+
+@pytest.mark.parametrize(
+    "text, move",
+    [
+        ("3 4 c", (3, 4, CHORD)),
+        ("3 4 chord", (3, 4, CHORD)),
+        ("1 2 3 4", [(1, 2, False), (3, 4, False)]),
+        ("1 2 3 4 5 6 f", [(1, 2, True), (3, 4, True), (5, 6, True)]),
+        ("1 2 3 4 c", [(1, 2, CHORD), (3, 4, CHORD)]),
+    ],
+)
+def test_parse_chords_and_batches(text, move):
+    assert parse_move(text) == move
+
+
+@pytest.mark.parametrize("text", ["1 2 3", "1 2 3 4 x", "1 2 3 x"])
+def test_parse_batch_rejects(text):
+    with pytest.raises(ValueError):
+        parse_move(text)
+
+
+def test_iterator_input_formats_chords_and_batches():
+    source = IteratorInput([(1, 2, CHORD), [(1, 2, True), (3, 4, True)]])
+    assert source.next_move() == (1, 2, CHORD)
+    assert source.next_move() == [(1, 2, True), (3, 4, True)]
+
+
+class RecordingRenderer(NullRenderer):
+    def __init__(self):
+        self.messages = []
+
+    def message(self, text):
+        self.messages.append(text)
+
+
+def test_input_source_is_abstract():
+    with pytest.raises(TypeError):
+        InputSource()
+
+
+def test_messages_go_to_the_renderer(capsys):
+    renderer = RecordingRenderer()
+    source = IteratorInput(["help", "3 x", "q"])
+    assert source.next_move(renderer=renderer) == (None, None, False)
+    assert capsys.readouterr().out == ""
+    instructions, error, goodbye = renderer.messages
+    assert "Instructions" in instructions
+    assert "integers" in error
+    assert goodbye == "Thanks for playing!"
@@ -0,0 +1,67 @@
+from board import Board
+from cascade import DfsCascade, RegionCascade
+from game import Game
+from input_sources import CHORD
+from instrumentation import Instrumentation
+from renderer import NullRenderer
+
+
+def instrumented_game(seed=3):
+    instrumentation = Instrumentation()
+    game = Game((9, 9, 10), 1, renderer=NullRenderer(), seed=seed)
+    instrumentation.attach_game(game)
+    return instrumentation, game
+
+
+def calls(instrumentation, name):
+    timer = instrumentation.timers.get(name)
+    return timer.calls if timer else 0
+
+
+def test_moves_batches_and_chords_are_timed_once_each():
+    instrumentation, game = instrumented_game()
+    game.play_move(1, 1, False)
+    game.play_batch([(9, 9, True), (9, 8, True)])
+    game.play_move(5, 5, CHORD)
+    assert calls(instrumentation, "move") == 3
+
+
+def test_reset_is_timed_as_generate():
+    instrumentation = Instrumentation()
+    board = instrumentation.board_class(Board)(
+        9, 9, 10, seed=1, renderer=NullRenderer()
+    )
+    assert calls(instrumentation, "board_init") == 1
+    board.reset(2)
+    board.reset(3)
+    assert calls(instrumentation, "generate") == 2
+
+
+def test_revealed_cells_are_counted_with_either_cascade():
+    for cascade in (RegionCascade(), DfsCascade()):
+        instrumentation = Instrumentation()
+        board = Board(16, 16, 20, seed=4, cascade=cascade, renderer=NullRenderer())
+        instrumentation.attach_board(board)
+        row, col = next(
+            (r, c)
+            for r in range(16)
+            for c in range(16)
+            if board.get_cell_value(r, c, "default_board") == " "
+        )
+        hidden_safe_cells = board.hidden_safe_cells
+        board.reveal_cell(row, col)
+        revealed = hidden_safe_cells - board.hidden_safe_cells
+        assert revealed > 1
+
+        counters = instrumentation.counters
+        assert counters["cascade_cells_revealed"] == revealed
+        if isinstance(cascade, DfsCascade):
+            assert counters["dfs_cells_revealed"] == revealed
+            assert counters["dfs_stack_pops"] >= revealed
+        else:
+            assert "dfs_cells_revealed" not in counters
+            assert "dfs_stack_pops" not in counters
+
+        # Uncovering an opened cell again runs the cascade but reveals nothing
+        board.uncover(row, col)
+        assert counters["cascade_cells_revealed"] == revealed
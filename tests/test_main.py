@@ -0,0 +1,76 @@
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from input_sources import StreamInput
+from main import main, parse_args
+
+
+def test_diff_redraw_rewrites_changed_cells(capsys, monkeypatch):
+    # A terminal large enough for a Beginner board and its status area
+    monkeypatch.setenv("COLUMNS", "80")
+    monkeypatch.setenv("LINES", "50")
+    main(
+        source=StreamInput("2 2\n"),
+        preset="Beginner",
+        seed=1,
+        quiet=True,
+        diff_redraw=True,
+    )
+    out = capsys.readouterr().out
+    assert out.count("\x1b[2J") == 1
+    assert "\x1b[J" in out.split("\x1b[2J", 1)[1]
+
+
+@pytest.mark.parametrize(
+    "argv, preset",
+    [
+        ([], None),
+        (["--preset", "Expert"], "Expert"),
+        (["--width", "30", "--height", "20", "--mines", "100"], (30, 20, 100)),
+        (["--width", "10", "--height", "10", "--density", "0.2"], (10, 10, 20)),
+        (["--preset", "Beginner", "--mines", "20"], (9, 9, 20)),
+        (["--preset", "Intermediate", "--density", "0.25"], (16, 16, 64)),
+    ],
+)
+def test_parse_args_builds_the_board(argv, preset):
+    assert parse_args(argv).preset == preset
+
+
+@pytest.mark.parametrize(
+    "argv",
+    [
+        ["--mines", "10"],
+        ["--density", "0.2"],
+        ["--width", "30", "--mines", "10"],
+        ["--width", "30", "--height", "20"],
+        ["--preset", "Expert", "--width", "30", "--height", "20", "--mines", "9"],
+        ["--mines", "10", "--density", "0.2", "--preset", "Expert"],
+        ["--preset", "Beginner", "--density", "0"],
+        ["--preset", "Beginner", "--density", "1.5"],
+        ["--width", "10", "--height", "10", "--density", "-0.1"],
+        ["--preset", "Beginner", "--mines", "65"],
+        ["--width", "1", "--height", "10", "--mines", "1"],
+    ],
+)
+def test_parse_args_rejects(argv, capsys):
+    with pytest.raises(SystemExit) as error:
+        parse_args(argv)
+    assert error.value.code == 2
+    assert "error:" in capsys.readouterr().err
+
+
+def test_import_leaves_optional_modules_unloaded():
+    # Modules only some flags or commands need are imported when they are used
+    optional = ["argparse", "base64", "hashlib", "instrumentation", "shutil", "solver"]
+    code = f"import sys, main; print([m for m in {optional!r} if m in sys.modules])"
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=Path(__file__).parent.parent,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    assert result.stdout.strip() == "[]"
@@ -0,0 +1,59 @@
+from itertools import islice
+
+from board import Board
+from no_guess import SeedCache, SeedSearch, opening_cell
+from renderer import NullRenderer
+from solver import Solver
+
+
+def seeds(count, **options):
+    search = SeedSearch(9, 9, 10, **options)
+    try:
+        return list(islice(search, count))
+    finally:
+        search.close()
+
+
+def test_found_seeds_are_solved_without_guessing():
+    for seed in seeds(5, seed=1, processes=1):
+        board = Board(
+            9, 9, 10, seed=seed, first_click_safe=True, renderer=NullRenderer()
+        )
+        assert board.uncover(*opening_cell(9, 9))
+        solver = Solver(board)
+        while not board.check_win():
+            safe, _ = solver.solve()
+            assert safe, f"seed {seed} needs a guess"
+            for row, col in safe:
+                assert board.uncover(row, col)
+
+
+def test_found_seeds_do_not_depend_on_the_processes():
+    expected = seeds(6, seed=2, processes=1)
+    assert seeds(6, seed=2, processes=2) == expected
+    assert seeds(6, seed=2, processes=1, batch_size=1) == expected
+
+
+def test_cache_serves_stored_seeds_once(tmp_path):
+    cache = SeedCache(9, 9, 10, directory=tmp_path)
+    assert cache.take() is None
+    cache.add([11, 12])
+    cache.add([13])
+    assert len(cache) == 3
+    assert [cache.take(), cache.take(), cache.take()] == [11, 12, 13]
+    assert cache.take() is None
+
+
+def test_search_serves_cached_seeds_first_and_keeps_unserved_ones(tmp_path):
+    cache = SeedCache(9, 9, 10, directory=tmp_path)
+    cache.add([42])
+    search = SeedSearch(9, 9, 10, seed=3, processes=1, cache=cache)
+    try:
+        assert next(search) == 42
+        found = next(search)
+        unserved = list(search.found)
+        assert unserved
+    finally:
+        search.close()
+    assert found == seeds(1, seed=3, processes=1)[0]
+    assert cache.load() == unserved
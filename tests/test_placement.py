@@ -0,0 +1,65 @@
+from random import Random
+
+import pytest
+
+from board import Board
+from placement import (
+    first_row_and_column,
+    neighborhood,
+    place_mines,
+    sample_dense,
+    sample_sparse,
+)
+from renderer import NullRenderer
+
+
+@pytest.mark.parametrize("strategy", [place_mines, sample_sparse, sample_dense])
+@pytest.mark.parametrize("mines", [0, 1, 10, 40, 150, 165])
+def test_strategies_avoid_excluded_cells(strategy, mines):
+    if strategy is sample_sparse and mines > 41:
+        pytest.skip("sample_sparse is only used for sparse boards")
+    excluded = first_row_and_column(16, 12)
+    picks = strategy(Random(mines), 16, 12, mines, excluded)
+    assert len(picks) == len(set(picks)) == mines
+    assert all(0 <= index < 16 * 12 for index in picks)
+    assert excluded.isdisjoint(picks)
+
+
+@pytest.mark.parametrize("mines", [10, 150])
+def test_the_same_seed_places_the_same_mines(mines):
+    excluded = first_row_and_column(16, 12)
+    first = place_mines(Random(7), 16, 12, mines, excluded)
+    second = place_mines(Random(7), 16, 12, mines, excluded)
+    other = place_mines(Random(8), 16, 12, mines, excluded)
+    assert first == second
+    assert set(first) != set(other)
+
+
+def test_too_many_mines_raise():
+    with pytest.raises(ValueError):
+        place_mines(Random(0), 4, 4, 10, first_row_and_column(4, 4))
+
+
+def test_boards_from_one_seed_are_identical():
+    boards = [Board(30, 16, 99, seed=42, renderer=NullRenderer()) for _ in range(2)]
+    assert boards[0].mine_indices == boards[1].mine_indices
+    assert boards[0].default_board == boards[1].default_board
+    assert boards[0].mine_indices.isdisjoint(first_row_and_column(30, 16))
+
+
+def test_first_click_safe_clears_the_neighborhood():
+    for seed in range(30):
+        board = Board(
+            9, 9, 30, seed=seed, first_click_safe=True, renderer=NullRenderer()
+        )
+        assert board.uncover(4, 4)
+        assert board.mine_indices.isdisjoint(neighborhood(9, 9, 4, 4))
+        assert len(board.mine_indices) == 30
+        board.verify_counters()
+
+        # The first click moves the mines the same way every time
+        again = Board(
+            9, 9, 30, seed=seed, first_click_safe=True, renderer=NullRenderer()
+        )
+        again.uncover(4, 4)
+        assert again.mine_indices == board.mine_indices
@@ -0,0 +1,101 @@
+from itertools import combinations
+from random import Random
+
+import pytest
+
+from board import Board
+from probability import OVERLAY_CHARS, ProbabilityEngine, overlay_char
+from renderer import NullRenderer
+
+
+def neighbors(board, index):
+    row, col = divmod(index, board.width)
+    return [
+        r * board.width + c
+        for r in range(max(0, row - 1), min(row + 2, board.height))
+        for c in range(max(0, col - 1), min(col + 2, board.width))
+        if (r, c) != (row, col)
+    ]
+
+
+def brute_force(board):
+    """
+    Returns the exact chance of a mine on every hidden cell by trying every layout, flags counting as mines.
+    """
+    values = {
+        index: board.get_cell_value(*divmod(index, board.width))
+        for index in range(board.width * board.height)
+    }
+    hidden = [index for index, value in values.items() if value == "*"]
+    flags = {index for index, value in values.items() if value == "F"}
+    numbers = [
+        (index, 0 if value == " " else int(value))
+        for index, value in values.items()
+        if value not in "*F"
+    ]
+    counts = dict.fromkeys(hidden, 0)
+    total = 0
+    for layout in combinations(hidden, board.mines - len(flags)):
+        mines = flags.union(layout)
+        if all(
+            sum(neighbor in mines for neighbor in neighbors(board, index)) == value
+            for index, value in numbers
+        ):
+            total += 1
+            for index in layout:
+                counts[index] += 1
+    if not total:
+        return None
+    return {index: count / total for index, count in counts.items()}
+
+
+@pytest.mark.parametrize("seed", range(60))
+def test_probabilities_are_exact(seed):
+    rng = Random(seed)
+    board = Board(
+        5, 4, rng.randint(3, 5), seed=seed, renderer=NullRenderer(), excluded=set()
+    )
+    engine = ProbabilityEngine(board)
+    for _ in range(6):
+        hidden = [
+            (row, col)
+            for row in range(board.height)
+            for col in range(board.width)
+            if board.get_cell_value(row, col) == "*"
+        ]
+        if not hidden:
+            break
+        row, col = rng.choice(hidden)
+        if board.is_mine(row, col):
+            if rng.random() < 0.5:
+                board.flag_mine(row, col)
+            continue
+        board.uncover(row, col)
+
+        exact = brute_force(board)
+        if exact is None:
+            continue
+        # The engine follows the board move by move; a fresh one must agree with it
+        followed = engine.overlay()
+        fresh = ProbabilityEngine(board).overlay()
+        for index, probability in exact.items():
+            assert followed[index] == pytest.approx(probability, abs=1e-9)
+            assert fresh[index] == pytest.approx(probability, abs=1e-9)
+
+
+def test_safest_is_never_a_proven_mine():
+    for seed in range(20):
+        board = Board(16, 16, 40, seed=seed, renderer=NullRenderer())
+        engine = ProbabilityEngine(board)
+        board.uncover(0, 0)
+        row, col, probability = engine.safest()
+        assert 0 <= probability < 1
+        assert board.get_cell_value(row, col) == "*"
+        if probability == 0:
+            assert not board.is_mine(row, col)
+
+
+def test_overlay_chars():
+    assert overlay_char(0.0) == OVERLAY_CHARS[0]
+    assert overlay_char(1.0) == OVERLAY_CHARS[-1]
+    assert overlay_char(0.55) == OVERLAY_CHARS[5]
@@ -0,0 +1,75 @@
+import io
+
+import pytest
+
+from board import Board
+from renderer import DiffRenderer, NullRenderer, Renderer, TerminalRenderer
+
+
+def test_renderer_is_abstract():
+    with pytest.raises(TypeError):
+        Renderer()
+
+
+def test_renderer_needs_draw_and_message():
+    class MessageOnly(Renderer):
+        def message(self, text):
+            pass
+
+    with pytest.raises(TypeError):
+        MessageOnly()
+
+
+def test_null_renderer_shows_nothing():
+    renderer = NullRenderer()
+    board = Board(9, 9, 10, seed=1, renderer=renderer)
+    renderer.draw(board)
+    renderer.message("hello")
+    renderer.flush()
+
+
+def test_terminal_renderer_writes_frames_and_messages():
+    stream = io.StringIO()
+    renderer = TerminalRenderer(stream)
+    board = Board(9, 9, 10, seed=1, renderer=renderer)
+    renderer.draw(board)
+    renderer.message("hello")
+    lines = stream.getvalue().splitlines()
+    assert len(lines) == 2 + 2 * 9 + 1
+    assert lines[-1] == "hello"
+
+
+def test_fitting_size_holds_an_expert_board():
+    renderer = DiffRenderer(io.StringIO())
+    columns, lines = renderer.fitting_size(30, 16)
+    header = renderer.layout(30, 16)[0]
+    assert columns == len(header)
+    assert lines == 3 + 2 * 16 + renderer.status_lines
+
+
+def test_diff_renderer_writes_only_the_changed_cells():
+    stream = io.StringIO()
+    renderer = DiffRenderer(stream)
+    renderer.terminal_size = renderer.fitting_size(9, 9)
+    board = Board(9, 9, 10, seed=1, renderer=renderer)
+    renderer.draw(board)
+    assert stream.getvalue().startswith("\x1b[2J\x1b[H")
+
+    row, col = next(
+        (r, c)
+        for r in range(9)
+        for c in range(9)
+        if board.get_cell_value(r, c, "default_board") in "12345678"
+    )
+    stream.seek(0)
+    stream.truncate()
+    board.uncover(row, col)
+    renderer.message("Safe move.")
+    renderer.draw(board)
+
+    line, column = renderer.cell_position(board, row * 9 + col)
+    value = board.get_cell_value(row, col)
+    status = renderer.status_position(board)
+    assert stream.getvalue() == (
+        f"\x1b[{line};{column}H{value}\x1b[{status};1H\x1b[JSafe move.\n"
+    )
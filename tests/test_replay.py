@@ -0,0 +1,93 @@
+from random import Random
+
+import pytest
+
+from board import Board
+from chunked_board import ChunkedBoard
+from game import Game
+from move_log import read_move_log
+from renderer import NullRenderer
+from replay import Replay
+
+
+def rows(board):
+    return [board.get_row(row) for row in range(board.height)]
+
+
+def random_game(seed, board_class=Board, moves=60, log_path=None, **options):
+    game = Game(
+        (16, 16, 40),
+        1,
+        board_class=board_class,
+        renderer=NullRenderer(),
+        log_path=log_path,
+        seed=seed,
+        **options,
+    )
+    rng = Random(seed)
+    for _ in range(moves):
+        if not game.playing:
+            break
+        row, col = rng.randint(1, 16), rng.randint(1, 16)
+        if rng.random() < 0.2:
+            game.play_move(row, col, True)
+        elif rng.random() < 0.1:
+            game.play_batch(
+                [(row, col, False), (rng.randint(1, 16), rng.randint(1, 16), False)]
+            )
+        elif not game.board.is_flagged(row - 1, col - 1):
+            game.play_move(row, col, False)
+    game.move_log.close()
+    return game
+
+
+@pytest.mark.parametrize("seed", range(10))
+@pytest.mark.parametrize("first_click_safe", [False, True])
+def test_replay_rebuilds_the_game(seed, first_click_safe):
+    game = random_game(seed, first_click_safe=first_click_safe)
+    replay = Replay(game.move_log, checkpoint_interval=7)
+    for _ in range(2):
+        replayed = replay.run()
+        assert rows(replayed.board) == rows(game.board)
+        assert replayed.playing == game.playing
+
+
+def test_seeking_matches_playing_from_the_start():
+    game = random_game(3, moves=80)
+    replay = Replay(game.move_log, checkpoint_interval=5)
+    replay.run()
+    fresh = Replay(game.move_log, checkpoint_interval=10**9)
+    for move in (0, 4, 5, 12, len(game.move_log)):
+        assert rows(replay.game_at(move).board) == rows(fresh.game_at(move).board)
+
+
+def test_lost_game_stays_lost():
+    for seed in range(100):
+        game = random_game(seed)
+        if not game.playing and not game.board.check_win():
+            break
+    assert not game.playing and not game.board.check_win()
+    replay = Replay(game.move_log, checkpoint_interval=len(game.move_log))
+    assert replay.run().playing is False
+    assert replay.run().playing is False
+
+
+def test_log_file_round_trip(tmp_path):
+    path = tmp_path / "moves.log"
+    game = random_game(4, ChunkedBoard, log_path=path, chunk_size=8)
+    log = read_move_log(path)
+    assert log.moves == game.move_log.moves
+    replay = Replay(log)
+    assert replay.board_class is ChunkedBoard
+    assert rows(replay.run().board) == rows(game.board)
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_checkpoints_of_a_board_of_several_chunks(seed):
+    game = random_game(seed, ChunkedBoard, chunk_size=8)
+    replay = Replay(game.move_log, checkpoint_interval=3)
+    for _ in range(2):
+        replayed = replay.run()
+        assert rows(replayed.board) == rows(game.board)
+        assert replayed.playing == game.playing
+    assert replay.checkpoints
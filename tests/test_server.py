@@ -0,0 +1,69 @@
+import asyncio
+
+from server import MAX_CUSTOM_CELLS, GameServer
+
+
+def find_cell(board, wanted):
+    """
+    Returns the first hidden cell for which wanted(row, col) is true.
+    """
+    for row in range(board.height):
+        for col in range(board.width):
+            if board.get_cell_value(row, col) == "*" and wanted(row, col):
+                return row, col
+    raise AssertionError("no such cell on the board")
+
+
+async def play_session():
+    server = GameServer(port=0, idle_timeout=5.0)
+    await server.start()
+    reader, writer = await asyncio.open_connection(server.host, server.port)
+
+    async def command(text, until):
+        writer.write(text.encode() + b"\n")
+        return await asyncio.wait_for(reader.readuntil(until), 5.0)
+
+    try:
+        first = await asyncio.wait_for(
+            reader.readuntil(b"Mines Remaining: 10\n\n\n"), 5.0
+        )
+        assert first.startswith(b"\x1b[2J\x1b[H")
+
+        (session,) = server.sessions.values()
+        board = session.game.board
+        renderer = session.renderer
+
+        row, col = find_cell(
+            board,
+            lambda r, c: board.get_cell_value(r, c, "default_board") in "12345678",
+        )
+        diff = await command(f"{row + 1} {col + 1}", b"Mines Remaining: 10\n\n\n")
+        line, column = renderer.cell_position(board, row * board.width + col)
+        value = board.get_cell_value(row, col)
+        assert b"\x1b[2J" not in diff
+        assert diff.startswith(f"\x1b[{line};{column}H{value}".encode())
+        # The cell, then the cursor move to the status area and its clearing
+        assert diff.count(b"\x1b[") == 3
+
+        row, col = find_cell(board, board.is_mine)
+        diff = await command(f"{row + 1} {col + 1} f", b"Mines Remaining: 9\n\n\n")
+        line, column = renderer.cell_position(board, row * board.width + col)
+        assert diff.startswith(f"\x1b[{line};{column}HF".encode())
+        assert b"Cell flagged." in diff
+
+        rejected = await command(
+            "new c 200 200 10", f"at most {MAX_CUSTOM_CELLS} cells.\n".encode()
+        )
+        assert b"Custom boards hold" in rejected
+        assert session.game.board is board
+
+        await command("quit", b"Thanks for playing!\n")
+        assert await asyncio.wait_for(reader.read(), 5.0) == b""
+    finally:
+        writer.close()
+        await server.close()
+    assert not server.sessions
+
+
+def test_server_plays_over_localhost():
+    asyncio.run(play_session())
@@ -0,0 +1,34 @@
+import pytest
+
+from simulation import play_headless, random_moves, run_batch, solver_moves
+
+
+def expected_counts(games, seed, move_source):
+    results = [play_headless(9, 9, 10, seed + i, move_source) for i in range(games)]
+    wins = sum(result["won"] for result in results)
+    losses = sum(result["lost"] for result in results)
+    return wins, losses
+
+
+@pytest.mark.parametrize("move_source", [random_moves, solver_moves])
+def test_batch_counts_every_win_and_loss(move_source):
+    stats = run_batch(30, "Beginner", seed=100, move_source=move_source, processes=1)
+    assert stats["games"] == 30
+    assert (stats["wins"], stats["losses"]) == expected_counts(30, 100, move_source)
+    assert stats["wins"] + stats["losses"] == 30
+    assert stats["win_rate"] == stats["wins"] / 30
+
+
+def test_batch_does_not_depend_on_the_processes():
+    single = run_batch(40, "Beginner", seed=7, processes=1)
+    pooled = run_batch(40, "Beginner", seed=7, processes=2, chunksize=8)
+    for key in ("games", "wins", "losses", "mean_moves", "mean_cells_cascaded"):
+        assert pooled[key] == single[key]
+
+
+def test_seeded_games_are_deterministic():
+    first = play_headless(16, 16, 40, seed=3, move_source=solver_moves)
+    second = play_headless(16, 16, 40, seed=3, move_source=solver_moves)
+    first.pop("seconds")
+    second.pop("seconds")
+    assert first == second
@@ -0,0 +1,179 @@
+from random import Random
+
+import pytest
+
+from board import Board
+from chunked_board import ChunkedBoard
+from game import Game
+from renderer import NullRenderer
+from move_log import read_move_log
+from replay import Replay
+from snapshot import Snapshot, load, load_game, open_snapshot, pack_board, save
+
+
+def rows(board, name="player_board"):
+    return [board.get_row(row, name) for row in range(board.height)]
+
+
+def played_board(seed, board_class=Board, **options):
+    board = board_class(30, 16, 99, seed=seed, renderer=NullRenderer(), **options)
+    rng = Random(seed)
+    for _ in range(40):
+        row, col = rng.randrange(16), rng.randrange(30)
+        if board.is_mine(row, col):
+            if rng.random() < 0.5:
+                board.place_flag(row, col)
+        elif not board.is_flagged(row, col):
+            board.uncover(row, col)
+    return board
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_pack_round_trip(seed):
+    board = played_board(seed)
+    snapshot = Snapshot(pack_board(board, games_played=3))
+    assert (snapshot.width, snapshot.height, snapshot.mines) == (30, 16, 99)
+    assert snapshot.games_played == 3
+    assert snapshot.seed == seed
+    for row in range(board.height):
+        for col in range(board.width):
+            for name in ("player_board", "default_board"):
+                assert snapshot.get_cell_value(row, col, name) == board.get_cell_value(
+                    row, col, name
+                )
+
+
+@pytest.mark.parametrize("board_class", [Board, ChunkedBoard])
+def test_load_restores_the_board(tmp_path, board_class):
+    board = played_board(5, board_class)
+    path = tmp_path / "game.mswp"
+    save(board, path)
+
+    loaded = load(path, board_class, renderer=NullRenderer())
+    assert rows(loaded) == rows(board)
+    assert rows(loaded, "default_board") == rows(board, "default_board")
+    assert list(loaded.flagged_indices) == list(board.flagged_indices)
+    loaded.verify_counters()
+    assert loaded.check_win() == board.check_win()
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_load_restores_a_board_of_several_chunks(tmp_path, seed):
+    board = played_board(seed, ChunkedBoard, chunk_size=8, first_click_safe=True)
+    path = tmp_path / "game.mswp"
+    save(board, path)
+
+    with open_snapshot(path) as snapshot:
+        assert snapshot.chunk_size == 8
+    loaded = load(path, ChunkedBoard, renderer=NullRenderer())
+    assert loaded.chunk_size == 8
+    assert loaded.mine_cells == board.mine_cells
+    assert rows(loaded) == rows(board)
+    assert rows(loaded, "default_board") == rows(board, "default_board")
+    loaded.verify_counters()
+
+
+def test_loaded_board_cascades_like_the_saved_one(tmp_path):
+    board = Board(30, 16, 30, seed=3, renderer=NullRenderer())
+    board.place_flag(6, 11)
+    board.place_flag(15, 26)
+    board.reveal_cell(3, 10)
+    board.clear_flag(6, 11)
+    board.clear_flag(15, 26)
+    path = tmp_path / "game.mswp"
+    save(board, path)
+
+    loaded = load(path, renderer=NullRenderer())
+    for restored in (board, loaded):
+        restored.reveal_cell(6, 11)
+    assert rows(loaded) == rows(board)
+    assert loaded.hidden_safe_cells == board.hidden_safe_cells
+
+
+@pytest.mark.parametrize("board_class", [Board, ChunkedBoard])
+def test_unopened_first_click_safe_board_stays_safe(tmp_path, board_class):
+    board = board_class(
+        9, 9, 30, seed=1, first_click_safe=True, renderer=NullRenderer()
+    )
+    path = tmp_path / "game.mswp"
+    save(board, path)
+
+    loaded = load(path, board_class, renderer=NullRenderer())
+    assert loaded.mine_cells == board.mine_cells
+    assert loaded.uncover(4, 4)
+    assert not any(
+        loaded.is_mine(row, col) for row in range(3, 6) for col in range(3, 6)
+    )
+    board.uncover(4, 4)
+    assert loaded.mine_cells == board.mine_cells
+    assert rows(loaded) == rows(board)
+
+
+def test_load_game_without_seed_logs_no_seed(tmp_path):
+    board = played_board("not an integer seed")
+    path = tmp_path / "game.mswp"
+    save(board, path, games_played=2)
+
+    game = load_game(path, renderer=NullRenderer())
+    assert game.games_played == 2
+    assert game.board.mine_indices == board.mine_indices
+    assert game.move_log.header["seed"] is None
+
+
+def test_open_snapshot_closes(tmp_path):
+    path = tmp_path / "game.mswp"
+    save(played_board(1), path)
+    with open_snapshot(path) as snapshot:
+        assert snapshot.width == 30
+    assert snapshot.data.closed
+
+
+def test_bad_data_is_rejected():
+    with pytest.raises(ValueError):
+        Snapshot(b"MSWP")
+    with pytest.raises(ValueError):
+        Snapshot(b"XXXX" + bytes(64))
+    data = pack_board(played_board(1))
+    with pytest.raises(ValueError):
+        Snapshot(data[:-1])
+
+
+def test_game_snapshot_keeps_playing(tmp_path):
+    game = Game((9, 9, 10), 1, renderer=NullRenderer(), seed=7)
+    game.play_move(5, 5, False)
+    path = tmp_path / "game.mswp"
+    save(game.board, path, game.games_played)
+
+    restored = load_game(path, renderer=NullRenderer())
+    assert rows(restored.board) == rows(game.board)
+    for row in range(1, 10):
+        for col in range(1, 10):
+            if not game.board.is_mine(row - 1, col - 1):
+                game.play_move(row, col, False)
+                restored.play_move(row, col, False)
+    assert rows(restored.board) == rows(game.board)
+    assert restored.board.check_win()
+
+
+@pytest.mark.parametrize("opened", [False, True])
+def test_loaded_game_replays(tmp_path, opened):
+    game = Game((9, 9, 10), 1, renderer=NullRenderer(), seed=7, first_click_safe=True)
+    if opened:
+        game.play_move(5, 5, False)
+    path = tmp_path / "game.mswp"
+    save(game.board, path, game.games_played)
+
+    log_path = tmp_path / "game.log"
+    restored = load_game(path, renderer=NullRenderer(), log_path=log_path)
+    rng = Random(7)
+    for _ in range(20):
+        row, col = rng.randint(1, 9), rng.randint(1, 9)
+        if restored.playing and not restored.board.is_flagged(row - 1, col - 1):
+            restored.play_move(row, col, rng.random() < 0.2)
+    restored.move_log.close()
+    assert len(restored.move_log) > 0
+
+    replayed = Replay(read_move_log(log_path)).run()
+    assert rows(replayed.board) == rows(restored.board)
+    assert replayed.board.mine_cells == restored.board.mine_cells
+    assert replayed.playing == restored.playing
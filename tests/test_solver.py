@@ -0,0 +1,63 @@
+from random import Random
+
+import pytest
+
+from board import Board
+from renderer import NullRenderer
+from solver import Solver
+
+
+@pytest.mark.parametrize("seed", range(30))
+def test_deductions_are_sound(seed):
+    board = Board(30, 16, 99, seed=seed, renderer=NullRenderer(), excluded=set())
+    solver = Solver(board)
+    rng = Random(seed)
+    for _ in range(200):
+        safe, mines = solver.solve()
+        for row, col in safe:
+            assert not board.is_mine(row, col)
+        for row, col in mines:
+            assert board.is_mine(row, col)
+        for probability in solver.probabilities.values():
+            assert 0 < probability < 1
+
+        if safe:
+            board.uncover(*safe[0])
+            continue
+        hidden = [
+            (row, col)
+            for row in range(board.height)
+            for col in range(board.width)
+            if board.get_cell_value(row, col) == "*" and not board.is_mine(row, col)
+        ]
+        if not hidden:
+            break
+        board.uncover(*rng.choice(hidden))
+
+
+def test_wrong_flags_do_not_mislead_the_solver():
+    board = Board(9, 9, 10, seed=2, renderer=NullRenderer())
+    board.uncover(0, 0)
+    for row in range(board.height):
+        for col in range(board.width):
+            if board.get_cell_value(row, col) == "*" and not board.is_mine(row, col):
+                board.place_flag(row, col)
+                break
+    safe, mines = Solver(board).solve()
+    assert not any(board.is_mine(row, col) for row, col in safe)
+    assert all(board.is_mine(row, col) for row, col in mines)
+
+
+def test_hint_points_at_a_cell_to_play():
+    board = Board(16, 16, 40, seed=5, renderer=NullRenderer())
+    solver = Solver(board)
+    row, col, flag, probability = solver.hint()
+    assert board.get_cell_value(row, col) == "*"
+    assert not flag and 0 <= probability < 1
+    board.uncover(1, 1)
+    row, col, flag, probability = solver.hint()
+    assert 0 <= probability <= 1
+    if probability == 0:
+        assert not board.is_mine(row, col)
+    if flag:
+        assert board.is_mine(row, col)
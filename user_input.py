@@ -1,9 +1,8 @@
-import os
-import time
-from messages import print_instructions
+from board_config import parse_options
+from input_sources import InteractiveInput
 
 
-def get_user_input():
+def get_user_input(on_hint=None):
     """
     Prompts the user for input and processes it.
 
@@ -13,94 +12,94 @@ def get_user_input():
 
     The function also handles special commands:
     - 'help' or 'h': Prints the game instructions.
+    - 'hint': Calls on_hint, if given, to show a suggested move.
     - 'quit' or 'q': Prompts the user for quit confirmation and quits the game if confirmed.
 
     In case of a KeyboardInterrupt, the function handles it gracefully by exiting the game.
+    The prompts and parsing are those of InteractiveInput, which Game.play_game uses by default.
+
+    Args:
+        on_hint (callable, optional): Called with no arguments when the user asks for a hint. Defaults to None.
 
     Returns:
         tuple: A tuple containing the row and column as integers, and a boolean indicating whether a flag was set.
         If the user chooses to quit the game, the function returns (None, None, False).
     """
-    while True:
-        try:
-            current_input = input(
-                "\nEnter the row and column to reveal (and optional flag): "
-            )
-            print()
-            if current_input.lower() in ["help", "h"]:
-                print_instructions()
-                continue
-            elif current_input.lower() in ["quit", "q"]:
-                quit_confirmation = input(
-                    "Are you sure you want to quit? [y]es or [n]o: "
-                )
-                if quit_confirmation.lower() in ["y", "yes"]:
-                    print("Thanks for playing!")
-                    time.sleep(2)
-                    os.system("cls")
-                    return None, None, False
-
-        except KeyboardInterrupt:
-            print("\nGame interrupted by user. Exiting the game...")
-            time.sleep(2)
-            os.system("cls")
-            exit()
-
-        parts = current_input.split()
-
-        # Check if the input has 2 or 3 parts
-        if len(parts) < 2 or len(parts) > 3:
-            print("Invalid input. Please enter 'row col flag (optional)'.")
-            continue
-
-        # Check if the first two parts are integers
-        try:
-            row, col = map(int, parts[:2])
-        except ValueError:
-            print("Invalid input. 'row' and 'col' should be integers.")
-            continue
-
-        # Check if the third part (if it exists) is 'flag'
-        flag = False
-        if len(parts) == 3:
-            if parts[2].lower() in ["f", "flag"]:
-                flag = True
-            else:
-                print("Invalid input. The third part should be 'f' for 'flag'.")
-                continue
+    return InteractiveInput().next_move(on_hint)
 
-        # If we've reached this point, the input is valid
-        return row, col, flag
 
+game_modes = {
+    "b": "Beginner",
+    "i": "Intermediate",
+    "e": "Expert",
+    "c": "Custom",
+    "q": "Quit",
+}
 
-game_modes = {"b": "Beginner", "i": "Intermediate", "e": "Expert", "q": "Quit"}
+custom_prompt = (
+    "Enter the width, height and number of mines (or a density such as 0.15): "
+)
 
 
-def start_game():
+def start_game(source=None):
     """
     This function prompts the user to select a game mode and returns the selected mode.
 
+    Args:
+        source (InputSource, optional): Where to read the selection from. Defaults to InteractiveInput.
+
     Returns:
-        str: The selected game mode.
+        str or tuple: The selected game mode, or the (width, height, mines) of a custom board.
     """
     start_string = """
     Select a game mode: \n
     - [B]eginner\n  
     - [I]ntermediate\n  
     - [E]xpert\n  
+    - [C]ustom\n  
     - [Q]uit\n\n
     """
-    game_selection = input(start_string).lower()
+    if source is None:
+        source = InteractiveInput()
+    game_selection = (source.read_line(start_string) or "q").lower()
 
     if game_selection in game_modes:
         if game_selection == "q":
             print("Quitting game.\n")
             exit()
+        elif game_selection == "c":
+            return ask_custom_options(source)
         else:
             print(f"{game_modes[game_selection]} mode selected\n")
             game_selection = game_modes[game_selection]
     else:
-        input("Invalid selection. Press any key to exit.\n")
+        source.read_line("Invalid selection. Press any key to exit.\n")
         return
 
     return game_selection
+
+
+def ask_custom_options(source):
+    """
+    Prompts the user for the size and the number of mines of a custom board until they are valid.
+
+    Args:
+        source (InputSource): Where to read the answer from.
+
+    Returns:
+        tuple: The (width, height, mines) of the board.
+    """
+    while True:
+        text = source.read_line(custom_prompt)
+        if text is None:
+            print("Quitting game.\n")
+            exit()
+        try:
+            options = parse_options(text)
+        except ValueError as error:
+            print(error)
+            continue
+        print(
+            f"Custom mode selected: {options[0]}x{options[1]} with {options[2]} mines\n"
+        )
+        return options